@@ -53,6 +53,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'data_cleaning_app.metrics.request_metrics_middleware', # Request latency histograms, exposed under data_cleanser/metrics/
 ]
 
 ROOT_URLCONF = 'backend.urls'
@@ -151,4 +152,74 @@ CACHES = {
         "BACKEND": "django.core.cache.backends.redis.RedisCache",
         "LOCATION": "redis://127.0.0.1:6379",
     }
-}
\ No newline at end of file
+}
+
+REST_FRAMEWORK = {
+    # Renders with orjson when it is installed, falling back to the DRF json renderer
+    'DEFAULT_RENDERER_CLASSES': [
+        'data_cleaning_app.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+}
+
+# Redis connection and compression settings for the cached (original and cleaned) datasets.
+# COMPRESSION is one of 'none', 'zstd' or 'lz4' (requires the zstandard or lz4 package, falls back to 'none' otherwise)
+DATASET_CACHE = {
+    "HOST": "127.0.0.1",
+    "PORT": 6379,
+    "DB": 0,
+    "MAX_CONNECTIONS": 20,
+    "SOCKET_TIMEOUT": None,
+    "COMPRESSION": "zstd",
+    "COMPRESSION_THRESHOLD": 64 * 1024, # bytes
+    "COMPRESSION_LEVEL": 3,
+    "MAX_BYTES": 2 * 1024 ** 3, # Total bytes budget of the cached datasets, least recently used datasets are evicted beyond it
+    "TTL": 6 * 60 * 60, # seconds, refreshed whenever a dataset is accessed
+    "LOCAL_MAX_BYTES": 512 * 1024 ** 2, # Bytes budget of the deserialized dataframes kept in memory by each worker process
+    "CHUNK_ROWS": 64 * 1024, # Rows per stored column chunk, the unit in which cached frames are read
+    "HISTORY_LENGTH": 10, # Updates of the data types of columns of a dataset that can be undone, the columns they replaced are kept in the cache
+    "PROCESSING_TIMEOUT": 30 * 60, # seconds, datasets still processing after it are failed and processed again when uploaded
+}
+
+# Preview mode of uploads (`?preview=true`): types are inferred on the leading rows plus a sample of the
+# other rows, the leading rows are converted and returned right away and the full dataset is cleaned in background
+DATASET_PREVIEW = {
+    "ROWS": 1000, # Leading rows converted for the preview, smaller uploads are cleaned in full right away
+    "SAMPLE_ROWS": 1000, # Rows sampled from the rest of the data for the preview inference
+    "MAX_WORKERS": 2, # Threads cleaning full datasets in background
+}
+
+# Readers parsing uploaded files (data_cleanser.readers)
+DATASET_READERS = {
+    "CSV_ENGINE": None, # 'pyarrow' (multi-threaded) or 'c', pyarrow if installed by default
+    "HINT_SAMPLE_ROWS": 1000, # Leading rows of CSV files the type hints are inferred from
+    "EXCEL_ENGINE": "calamine", # 'calamine' (default pandas engines when python-calamine is not installed) or None
+    "SHEET_WORKERS": 2, # Worker processes reading the sheets of workbooks uploaded with `?sheets=all`
+    "START_METHOD": "spawn", # Start method of the worker processes, 'spawn' is safe in threaded servers
+}
+
+# Data types updates of several columns (UpdateColumnsDataTypesAPIView), the columns are converted concurrently in a pool of worker processes
+DATASET_UPDATES = {
+    "PROCESS_WORKERS": 2,
+    "MIN_PARALLEL_COLUMNS": 2, # Updates of fewer columns are converted in the request thread, sparing the transfer of the columns
+    "START_METHOD": "spawn", # Start method of the worker processes, 'spawn' is safe in threaded servers
+}
+
+# Uploads of several files in a single request (upload-files/)
+DATASET_BATCH_UPLOADS = {
+    "MAX_FILES": 100,
+    "PROCESS_WORKERS": 2, # Worker processes reading and cleaning the files, at most as many files are held in memory at once
+    "START_METHOD": "spawn", # Start method of the worker processes, 'spawn' is safe in threaded servers
+}
+
+# Per-stage timings and fallback counters of uploads and data type updates (see data_cleanser.instrumentation)
+DATASET_INSTRUMENTATION = {
+    "LOG": True, # Log the instrumentation of each request
+    "TRACE_MEMORY": False, # Trace the memory peak of all requests with tracemalloc (slower), else only with `?instrument=memory`
+}
+
+# Async variants of the views (data_cleaning_app.async_views), inference and conversion run in a bounded pool of worker processes
+ASYNC_VIEWS = {
+    "PROCESS_WORKERS": 2,
+    "START_METHOD": "spawn", # Start method of the worker processes, 'spawn' is safe in threaded servers
+}
@@ -0,0 +1,52 @@
+import argparse
+import json
+
+from .generator import GENERATED_TYPES
+from .suite import (DEFAULT_CARDINALITIES, DEFAULT_DIRTY_RATIOS, DEFAULT_FORMATTED_RATIOS, DEFAULT_SIZES, DATASETS_DIR, compare_results, get_environment,
+                    run_column_benchmarks, run_dataset_benchmarks)
+
+
+def parse_args(args=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description='Benchmark the detectors of Inference and the conversions of Convertor.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help='Rows of the synthetic columns, e.g. 10000 100000 1000000 10000000')
+    parser.add_argument('--cardinalities', type=int, nargs='+', default=DEFAULT_CARDINALITIES, help='Distinct values of the synthetic columns')
+    parser.add_argument('--dirty-ratios', type=float, nargs='+', default=DEFAULT_DIRTY_RATIOS, help='Fractions of invalid values in the synthetic columns')
+    parser.add_argument('--formatted-ratios', type=float, nargs='+', default=DEFAULT_FORMATTED_RATIOS, help='Fractions of formatted values (e.g. currency, percentages) in the synthetic columns')
+    parser.add_argument('--dtypes', nargs='+', choices=GENERATED_TYPES, default=GENERATED_TYPES, help='Data types of the synthetic columns, all types by default')
+    parser.add_argument('--typed', action='store_true', help='Benchmark typed columns (as read from typed formats) rather than text')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed calls of each benchmark, the fastest one is reported')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--no-memory', action='store_true', help='Skip measuring the peak of memory, which runs each benchmark once more under tracemalloc')
+    parser.add_argument('--datasets-dir', default=DATASETS_DIR, help='Directory of the CSV files benchmarked as a whole')
+    parser.add_argument('--skip-columns', action='store_true', help='Skip the synthetic column benchmarks')
+    parser.add_argument('--skip-datasets', action='store_true', help='Skip the dataset benchmarks')
+    parser.add_argument('--output', help='JSON file the results are saved to')
+    parser.add_argument('--compare', help='JSON file of a previous run to compare the results with')
+    return parser.parse_args(args)
+
+
+def main(args=None):
+    args = parse_args(args)
+
+    results = []
+    if not args.skip_columns:
+        results += run_column_benchmarks(args.sizes, args.cardinalities, args.dirty_ratios, args.formatted_ratios, args.dtypes, args.typed, args.repeat, args.seed, not args.no_memory, log=print)
+    if not args.skip_datasets:
+        results += run_dataset_benchmarks(args.datasets_dir, args.repeat, not args.no_memory, log=print)
+
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            json.dump({"environment": get_environment(), "config": vars(args), "results": results}, output_file, indent=2)
+        print(f'Results saved to {args.output}')
+
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            baseline = json.load(baseline_file)
+        print(f'Compared with {args.compare} ({baseline["environment"]["timestamp"]}), speedup > 1 is faster:')
+        for key, baseline_seconds, seconds, speedup in compare_results(baseline["results"], results):
+            description = ' '.join(f'{value}' for value in key if value is not None)
+            print(f'{description:<110} {baseline_seconds:>10.4f}s -> {seconds:>10.4f}s  x{speedup:.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+import functools
+import os
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+
+from .suite import _quiet
+
+# Performance tests are slow (seconds to minutes each), they only run when this environment variable is set to 1
+PERFORMANCE_TESTS_ENV = 'DATA_CLEANSER_PERFORMANCE_TESTS'
+# Multiplier of all time budgets, e.g. 1.5 on noisy CI machines
+TOLERANCE_ENV = 'DATA_CLEANSER_PERFORMANCE_TOLERANCE'
+
+# Seconds of the calibration workload on the machine the time budgets were set on
+REFERENCE_CALIBRATION_SECONDS = 0.27
+
+
+def is_performance_testing_enabled():
+    return os.environ.get(PERFORMANCE_TESTS_ENV, '') == '1'
+
+
+def run_calibration_workload():
+    # Per element parsing of strings and vectorized numpy work, the two kinds of work inference and conversion do
+    values = np.random.default_rng(0).uniform(0, 1e6, 200_000)
+    texts = pd.Series([f'{value:,.2f}' for value in values])
+    parsed = pd.to_numeric(texts.str.replace(',', '', regex=False))
+    np.sort(np.concatenate([parsed.to_numpy()] * 5))
+
+
+@functools.lru_cache(maxsize=None)
+def get_machine_factor(repeat=5):
+    """
+    Time the calibration workload to scale the time budgets to the machine the tests run on.
+
+    Returns:
+    - float: Ratio of the seconds of the calibration workload here to the seconds on the reference machine,
+      > 1 on slower machines.
+    """
+
+    run_calibration_workload()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run_calibration_workload()
+        timings.append(time.perf_counter() - start)
+    return min(timings) / REFERENCE_CALIBRATION_SECONDS
+
+
+def get_tolerance():
+    return float(os.environ.get(TOLERANCE_ENV, '1'))
+
+
+def check_budget(name, function, seconds=None, peak_memory_bytes=None, repeat=1):
+    """
+    Run an operation and check it stays within its budgets.
+
+    Time budgets are set in seconds on the reference machine and scaled by the machine factor (see get_machine_factor)
+    and the tolerance. Memory budgets are not scaled, the peak of memory is measured by an additional call under
+    tracemalloc (several times slower), keep them for small inputs.
+
+    Args:
+    - name (str): Name of the operation, for the error message.
+    - function (callable): Operation, called without arguments.
+    - seconds (float): Time budget on the reference machine, the fastest of the timed calls is compared with it.
+    - peak_memory_bytes (int): Budget of the peak of memory allocated by a call.
+    - repeat (int): Number of timed calls.
+
+    Returns:
+    - dict: Seconds of the fastest call (`seconds`), scaled time budget (`seconds_budget`) and peak of memory (`peak_memory_bytes`).
+
+    Raises:
+    - AssertionError: If a budget is exceeded.
+    """
+
+    result = {"seconds": None, "seconds_budget": None, "peak_memory_bytes": None}
+    with _quiet():
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            function()
+            timings.append(time.perf_counter() - start)
+        result["seconds"] = min(timings)
+
+        if peak_memory_bytes is not None:
+            tracemalloc.start()
+            try:
+                baseline_bytes = tracemalloc.get_traced_memory()[0]
+                function()
+                result["peak_memory_bytes"] = tracemalloc.get_traced_memory()[1] - baseline_bytes
+            finally:
+                tracemalloc.stop()
+
+    if seconds is not None:
+        result["seconds_budget"] = seconds * get_machine_factor() * get_tolerance()
+        if result["seconds"] > result["seconds_budget"]:
+            raise AssertionError(f'{name} took {result["seconds"]:.3f}s, over its budget of {result["seconds_budget"]:.3f}s '
+                                 f'({seconds}s on the reference machine x machine factor {get_machine_factor():.2f} x tolerance {get_tolerance()})')
+    if peak_memory_bytes is not None and result["peak_memory_bytes"] > peak_memory_bytes:
+        raise AssertionError(f'{name} allocated a peak of {result["peak_memory_bytes"] / 2**20:.1f} MiB, over its budget of {peak_memory_bytes / 2**20:.1f} MiB')
+    return result
@@ -0,0 +1,259 @@
+import argparse
+import os
+import sys
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from data_cleanser.data_types import DataTypes
+
+# Types columns can be generated for, one per distinct DataTypes value
+GENERATED_TYPES = (
+    DataTypes.INT8, DataTypes.INT16, DataTypes.INT32, DataTypes.INT64, DataTypes.FLOAT32, DataTypes.FLOAT64,
+    DataTypes.BOOLEAN, DataTypes.DATETIME64, DataTypes.TIMEDELTA64, DataTypes.CATEGORY, DataTypes.COMPLEX, DataTypes.OBJECT,
+)
+
+# Invalid values mixed into dirty columns, as found in real uploads
+DIRTY_VALUES = np.array(['n/a', '-', 'unknown', '#REF!', '?', 'abc'], dtype=object)
+
+# Ranges of the generated integers, above the range of the next smaller type so that each column is inferred as its type
+INTEGER_RANGES = {
+    DataTypes.INT8: (np.iinfo(np.int8).min, np.iinfo(np.int8).max),
+    DataTypes.INT16: (np.iinfo(np.int8).max + 1, np.iinfo(np.int16).max),
+    DataTypes.INT32: (np.iinfo(np.int16).max + 1, np.iinfo(np.int32).max),
+    DataTypes.INT64: (np.iinfo(np.int32).max + 1, 10 ** 15), # Below 2^53, so that values read as floats stay exact
+}
+
+
+class OutputFormats:
+    """
+    Constants representing the file formats generated dataframes can be written to, the formats uploads are read from.
+    """
+    CSV = 'csv'
+    TSV = 'tsv'
+    JSONL = 'jsonl'
+    PARQUET = 'parquet'
+    FEATHER = 'feather'
+    EXCEL = 'xlsx'
+
+
+def _distinct_integers(rng, cardinality, low, high):
+    if high - low + 1 <= 4 * cardinality:
+        return rng.permutation(np.arange(low, high + 1))[:cardinality]
+    return np.unique(rng.integers(low, high, size=cardinality, endpoint=True)) # Duplicates are rare, the cardinality is approximate
+
+
+def _choose_formats(rng, formats, count):
+    # Format of each distinct value, formats being functions of a value returning its text
+    return [formats[position] for position in rng.integers(0, len(formats), size=count)]
+
+
+def _integer_values(dtype):
+    def create(rng, cardinality):
+        values = _distinct_integers(rng, cardinality, *INTEGER_RANGES[dtype])
+        formats = [lambda value: f'{value:,}', lambda value: f'${value:,}'] if values.min() >= 1000 else [lambda value: f' {value} ', lambda value: f'{value:+d}']
+        formatted = [value_format(value) for value_format, value in zip(_choose_formats(rng, formats, len(values)), values)]
+        return values, values.astype(str).astype(object), np.array(formatted, dtype=object)
+    return create
+
+
+def _float_values(dtype):
+    def create(rng, cardinality):
+        if dtype == DataTypes.FLOAT64:
+            # Beyond the float32 range, so that the column is inferred as float64
+            values = rng.uniform(1.0, 9.0, size=cardinality) * 1e39
+            formats = [lambda value: f'{value / 1e39:.3f} x 10^39', lambda value: f'{value:.4e}']
+        else:
+            values = np.round(rng.uniform(1.0, 1e6, size=cardinality), 2)
+            formats = [lambda value: f'${value:,.2f}', lambda value: f'{value:,.2f}', lambda value: f'{value / 1e4:.4f}%', lambda value: f'{value / 1e3:.3f} x 10^3']
+        formatted = [value_format(value) for value_format, value in zip(_choose_formats(rng, formats, len(values)), values)]
+        return values, np.array([repr(value) for value in values], dtype=object), np.array(formatted, dtype=object)
+    return create
+
+
+def _boolean_values(rng, cardinality):
+    values = np.array([True, False])
+    formats = [lambda value: str(value).lower(), lambda value: str(value).upper(), lambda value: str(int(value)), lambda value: str(value)[0]]
+    formatted = [value_format(value) for value_format, value in zip(_choose_formats(rng, formats, 2), values)]
+    return values, values.astype(str).astype(object), np.array(formatted, dtype=object)
+
+
+def _datetime_values(rng, cardinality):
+    values = pd.Timestamp('1995-01-01') + pd.to_timedelta(rng.integers(0, 30 * 365 * 24 * 3600, size=cardinality), unit='s')
+    formats = [lambda value: value.strftime('%d/%m/%Y %H:%M'), lambda value: value.strftime('%b %d, %Y'), lambda value: value.strftime('%Y/%m/%d')]
+    formatted = [value_format(value) for value_format, value in zip(_choose_formats(rng, formats, len(values)), values)]
+    return values.to_numpy(), values.strftime('%Y-%m-%d %H:%M:%S').to_numpy(dtype=object), np.array(formatted, dtype=object)
+
+
+def _timedelta_values(rng, cardinality):
+    values = pd.to_timedelta(rng.integers(0, 400 * 86400, size=cardinality), unit='s') + pd.to_timedelta(rng.integers(0, 1000, size=cardinality), unit='ms')
+
+    def clock(value):
+        return value.components
+
+    # Formats pandas can't parse, converted by the fallback parser of the convertor
+    formats = [
+        lambda value: '{0}:{1:02d}:{2:02d}:{3:02d}'.format(*clock(value)[:4]),
+        lambda value: '{0}:{1:02d}:{2:02d}:{3:02d}.{4:03d}'.format(*clock(value)[:5]),
+        lambda value: '{0}:{1:02d}:{2:02d}:{3:02d},{4:03d}'.format(*clock(value)[:5]),
+        lambda value: '{1}:{2:02d}'.format(*clock(value)),
+    ]
+    formatted = [value_format(value) for value_format, value in zip(_choose_formats(rng, formats, len(values)), values)]
+    text = ['{0} days {1:02d}:{2:02d}:{3:02d}'.format(*clock(value)[:4]) for value in values]
+    return values.to_numpy(), np.array(text, dtype=object), np.array(formatted, dtype=object)
+
+
+def _category_values(rng, cardinality):
+    values = np.array([f'category_{position}' for position in range(cardinality)], dtype=object)
+    formatted = np.array([f' {value.upper()} ' for value in values], dtype=object)
+    return values, values, formatted
+
+
+def _complex_values(rng, cardinality):
+    parts = np.round(rng.uniform(-100, 100, size=(cardinality, 2)), 2)
+    values = parts[:, 0] + 1j * np.abs(parts[:, 1])
+    formats = [lambda value: f'({value.real} + {value.imag}j)', lambda value: f'({value.real}, {value.imag})', lambda value: f'{value.real} + {value.imag}j']
+    formatted = [value_format(value) for value_format, value in zip(_choose_formats(rng, formats, len(values)), values)]
+    return values, np.array([f'{value.real}+{value.imag}j' for value in values], dtype=object), np.array(formatted, dtype=object)
+
+
+def _object_values(rng, cardinality):
+    words = np.array(['alpha', 'beta', 'gamma', 'delta', 'epsilon'], dtype=object)
+    values = np.array([f'free text {position} {" ".join(rng.choice(words, size=3))}' for position in range(cardinality)], dtype=object)
+    return values, values, values
+
+
+# Types mapped to the functions creating the distinct values of their columns, as typed values, text and formatted text
+VALUE_CREATORS = {
+    DataTypes.INT8: _integer_values(DataTypes.INT8),
+    DataTypes.INT16: _integer_values(DataTypes.INT16),
+    DataTypes.INT32: _integer_values(DataTypes.INT32),
+    DataTypes.INT64: _integer_values(DataTypes.INT64),
+    DataTypes.FLOAT32: _float_values(DataTypes.FLOAT32),
+    DataTypes.FLOAT64: _float_values(DataTypes.FLOAT64),
+    DataTypes.BOOLEAN: _boolean_values,
+    DataTypes.DATETIME64: _datetime_values,
+    DataTypes.TIMEDELTA64: _timedelta_values,
+    DataTypes.CATEGORY: _category_values,
+    DataTypes.COMPLEX: _complex_values,
+    DataTypes.OBJECT: _object_values,
+}
+
+
+def generate_column(dtype, rows, cardinality=1000, na_rate=0.0, formatted_ratio=0.0, dirty_ratio=0.0, typed=False, seed=0, name=None):
+    """
+    Generate a column of a data type, drawing its values from a pool of distinct values.
+
+    Args:
+    - dtype (str): One of the GENERATED_TYPES.
+    - rows (int): Number of rows.
+    - cardinality (int): Number of distinct values, capped by the values the type can hold (e.g. 2 for booleans).
+    - na_rate (float): Fraction of missing values.
+    - formatted_ratio (float): Fraction of the values written in other formats the type is inferred and converted from,
+      e.g. currency, percentages and 'x 10^n' for numbers, 'D:HH:MM:SS' for timedeltas and '(a, b)' for complex numbers.
+    - dirty_ratio (float): Fraction of invalid values. Typed columns hold missing values instead.
+    - typed (bool): If True, the values are of the type (as read from typed file formats), else they are text (as read from CSV files).
+      Formatted values only apply to text columns.
+    - seed (int): Seed of the random generator, identical arguments generate identical columns.
+    - name (str): Name of the column, the data type if None.
+
+    Returns:
+    - pd.Series: The generated column.
+
+    Raises:
+    - KeyError: If the data type is not one of the GENERATED_TYPES.
+    """
+
+    rng = np.random.default_rng(seed)
+    typed_values, text_values, formatted_values = VALUE_CREATORS[dtype](rng, max(1, min(cardinality, rows)))
+    positions = rng.integers(0, len(typed_values), size=rows)
+
+    missing_rows = rng.random(rows) < na_rate
+    dirty_rows = ~missing_rows & (rng.random(rows) < dirty_ratio)
+    if typed:
+        values = pd.Series(typed_values[positions], name=name or dtype)
+        if dtype == DataTypes.CATEGORY:
+            values = values.astype(DataTypes.CATEGORY)
+        return values.mask(missing_rows | dirty_rows)
+
+    values = text_values[positions]
+    formatted_rows = rng.random(rows) < formatted_ratio
+    values[formatted_rows] = formatted_values[positions[formatted_rows]]
+    values[dirty_rows] = DIRTY_VALUES[rng.integers(0, len(DIRTY_VALUES), size=int(dirty_rows.sum()))]
+    values[missing_rows] = None
+    return pd.Series(values, name=name or dtype, dtype=object)
+
+
+def generate_dataframe(rows, columns=GENERATED_TYPES, cardinality=1000, na_rate=0.0, formatted_ratio=0.0, dirty_ratio=0.0, typed=False, seed=0):
+    """
+    Generate a dataframe of N rows x M columns (see generate_column).
+
+    Args:
+    - rows (int): Number of rows.
+    - columns (int or list): Data types of the columns, or a number of columns cycling through the GENERATED_TYPES.
+    - seed (int): Seed of the random generator, each column is generated with its own seed derived from it.
+
+    Returns:
+    - pd.DataFrame: The generated dataframe, columns named after their data type and position.
+    """
+
+    dtypes = [GENERATED_TYPES[position % len(GENERATED_TYPES)] for position in range(columns)] if isinstance(columns, int) else list(columns)
+    column_seeds = np.random.SeedSequence(seed).generate_state(len(dtypes))
+    return pd.DataFrame({
+        f'{dtype}_{position}': generate_column(dtype, rows, cardinality, na_rate, formatted_ratio, dirty_ratio, typed, int(column_seed), f'{dtype}_{position}')
+        for position, (dtype, column_seed) in enumerate(zip(dtypes, column_seeds))
+    })
+
+
+def write_dataframe(df, path, file_format=None):
+    """
+    Write a generated dataframe to a file.
+
+    Args:
+    - df (pd.DataFrame): The dataframe.
+    - path (str): Path of the file.
+    - file_format (str): One of the OutputFormats, taken from the extension of the path if None.
+
+    Raises:
+    - ValueError: If the format is not supported.
+    """
+
+    file_format = file_format or os.path.splitext(path)[1].lstrip('.').lower()
+    if file_format == OutputFormats.CSV:
+        df.to_csv(path, index=False)
+    elif file_format == OutputFormats.TSV:
+        df.to_csv(path, sep='\t', index=False)
+    elif file_format == OutputFormats.JSONL:
+        df.to_json(path, orient='records', lines=True, date_format='iso', default_handler=str)
+    elif file_format in (OutputFormats.PARQUET, OutputFormats.FEATHER):
+        # Complex numbers have no arrow type, they are written as text
+        df = df.apply(lambda column: column.astype(str).mask(column.isna()) if pd.api.types.is_complex_dtype(column.dtype) else column)
+        df.to_parquet(path, index=False) if file_format == OutputFormats.PARQUET else df.to_feather(path)
+    elif file_format == OutputFormats.EXCEL:
+        df.to_excel(path, index=False)
+    else:
+        raise ValueError(f'Unsupported output format "{file_format}"')
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.generator', description='Generate a seeded synthetic dataset with dirty values.')
+    parser.add_argument('output', help='Path of the generated file, its extension sets the format (csv, tsv, jsonl, parquet, feather, xlsx)')
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--columns', type=int, default=len(GENERATED_TYPES), help='Number of columns, cycling through the data types')
+    parser.add_argument('--dtypes', nargs='+', choices=GENERATED_TYPES, help='Data types of the columns, instead of --columns')
+    parser.add_argument('--cardinality', type=int, default=1000)
+    parser.add_argument('--na-rate', type=float, default=0.0)
+    parser.add_argument('--formatted-ratio', type=float, default=0.0)
+    parser.add_argument('--dirty-ratio', type=float, default=0.0)
+    parser.add_argument('--typed', action='store_true', help='Write typed values rather than text (for typed formats)')
+    parser.add_argument('--format', choices=[value for name, value in vars(OutputFormats).items() if name.isupper()], help='Format of the file, instead of its extension')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(args)
+
+    df = generate_dataframe(args.rows, args.dtypes or args.columns, args.cardinality, args.na_rate, args.formatted_ratio, args.dirty_ratio, args.typed, args.seed)
+    write_dataframe(df, args.output, args.format)
+    print(f'Generated {len(df)} rows x {len(df.columns)} columns in {args.output}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,350 @@
+import argparse
+import itertools
+import json
+import os
+import random
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from .generator import generate_dataframe
+from .suite import get_environment
+
+DEFAULT_SIZES = (1_000, 100_000)
+DEFAULT_CONCURRENCIES = (1, 4, 16)
+DEFAULT_REQUESTS = 32
+DEFAULT_COLUMNS = 12
+DEFAULT_PAGE_SIZE = 100
+API_PREFIX = '/data_cleanser/'
+
+
+class Scenarios:
+    """
+    Constants representing the requests driven by the load test, run in this order for each size and concurrency
+    (pages and updates are requested on the datasets uploaded by the upload scenario).
+    """
+    UPLOAD = 'upload'
+    PAGE = 'page'
+    UPDATE = 'update'
+
+
+class RedisBackends:
+    """
+    Constants representing the redis the in-process server caches datasets in.
+    """
+    FAKE = 'fake' # fakeredis, in memory
+    LOCAL = 'local' # redis-server configured in settings.DATASET_CACHE
+
+
+SCENARIOS = (Scenarios.UPLOAD, Scenarios.PAGE, Scenarios.UPDATE)
+
+
+def start_server(redis_backend=RedisBackends.FAKE):
+    """
+    Serve the Django application from a thread of this process, on a free local port.
+
+    The server shares the interpreter (and the GIL) with the load generating threads, which mostly wait on sockets.
+    Run the load test against a separately started server (`--url`) to measure a deployment.
+
+    Args:
+    - redis_backend (str): One of the RedisBackends.
+
+    Returns:
+    - tuple: Base url of the server and the server, stopped with `shutdown()`.
+
+    Raises:
+    - ImportError: If fakeredis is requested and not installed.
+    """
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
+    import django
+    django.setup()
+    from django.conf import settings
+    from django.core.servers.basehttp import ThreadedWSGIServer, WSGIRequestHandler
+    from django.core.wsgi import get_wsgi_application
+    from data_cleaning_app import views
+
+    # The timings of each request would be logged between the results
+    settings.DATASET_INSTRUMENTATION = {**settings.DATASET_INSTRUMENTATION, "LOG": False}
+    if redis_backend == RedisBackends.FAKE:
+        import fakeredis
+        views.cache.redis = fakeredis.FakeRedis()
+
+    class QuietRequestHandler(WSGIRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadedWSGIServer(('127.0.0.1', 0), QuietRequestHandler, allow_reuse_address=False)
+    server.set_app(get_wsgi_application())
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f'http://127.0.0.1:{server.server_address[1]}', server
+
+
+def encode_multipart(fields, files):
+    """
+    Encode a multipart/form-data request body.
+
+    Args:
+    - fields (dict): Names and values of the text fields.
+    - files (dict): Names of the file fields and tuples of the file name and content (bytes).
+
+    Returns:
+    - tuple: The body (bytes) and its content type.
+    """
+
+    boundary = uuid.uuid4().hex
+    parts = []
+    for name, value in fields.items():
+        parts.append(f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode())
+    for name, (file_name, content) in files.items():
+        parts.append(f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"; filename="{file_name}"\r\n'
+                     f'Content-Type: application/octet-stream\r\n\r\n'.encode() + content + b'\r\n')
+    parts.append(f'--{boundary}--\r\n'.encode())
+    return b''.join(parts), f'multipart/form-data; boundary={boundary}'
+
+
+def send_request(url, body=None, content_type=None, timeout=300):
+    """
+    Send a request and time it until its response is fully read.
+
+    Returns:
+    - tuple: Seconds of the request, status code (None if the connection failed) and the decoded JSON response (None if not JSON).
+    """
+
+    request = urllib.request.Request(url, data=body, headers={"Content-Type": content_type} if content_type else {})
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            status_code, content = response.status, response.read()
+    except urllib.error.HTTPError as e:
+        status_code, content = e.code, e.read()
+    except (urllib.error.URLError, OSError):
+        return time.perf_counter() - start, None, None
+    seconds = time.perf_counter() - start
+
+    try:
+        return seconds, status_code, json.loads(content)
+    except ValueError:
+        return seconds, status_code, None
+
+
+def summarize(latencies, statuses, wall_seconds):
+    """
+    Returns:
+    - dict: Number of requests and errors (failed connections and status codes >= 400), status code counts,
+      throughput and latency percentiles (in seconds) of the requests of a scenario.
+    """
+
+    errors = sum(1 for status_code in statuses if status_code is None or status_code >= 400)
+    status_counts = {}
+    for status_code in statuses:
+        status_counts[str(status_code)] = status_counts.get(str(status_code), 0) + 1
+
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99]) if latencies else (None, None, None)
+    return {
+        "requests": len(statuses),
+        "errors": errors,
+        "statuses": status_counts,
+        "seconds": wall_seconds,
+        "requests_per_second": len(statuses) / wall_seconds if wall_seconds > 0 else None,
+        "p50_seconds": float(p50) if p50 is not None else None,
+        "p95_seconds": float(p95) if p95 is not None else None,
+        "p99_seconds": float(p99) if p99 is not None else None,
+        "mean_seconds": float(np.mean(latencies)) if latencies else None,
+        "max_seconds": float(np.max(latencies)) if latencies else None,
+    }
+
+
+def run_concurrently(send, arguments, concurrency):
+    """
+    Send requests from a number of threads.
+
+    Args:
+    - send (callable): Sends a request for an argument and returns the result of send_request.
+    - arguments (list): Arguments of the requests.
+    - concurrency (int): Number of requests in flight at once.
+
+    Returns:
+    - tuple: Results of the requests in the order of the arguments and the seconds all requests took.
+    """
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='loadtest') as executor:
+        results = list(executor.map(send, arguments))
+    return results, time.perf_counter() - start
+
+
+def run_load_test(base_url, sizes=DEFAULT_SIZES, concurrencies=DEFAULT_CONCURRENCIES, requests=DEFAULT_REQUESTS, columns=DEFAULT_COLUMNS,
+                  cardinality=1000, na_rate=0.0, formatted_ratio=0.0, dirty_ratio=0.0, page_size=DEFAULT_PAGE_SIZE, update_dtype='float64',
+                  scenarios=SCENARIOS, seed=0, log=None):
+    """
+    Drive the upload, paginated data and data types update endpoints with concurrent requests.
+
+    Each upload sends a generated CSV dataset (see generator.generate_dataframe) under a distinct header, as
+    identical uploads are served from the cache. Pages and updates are requested on the uploaded datasets.
+
+    Args:
+    - base_url (str): Url of the server, e.g. http://127.0.0.1:8000.
+    - sizes (iterable): Numbers of rows of the uploaded datasets.
+    - concurrencies (iterable): Numbers of requests in flight at once.
+    - requests (int): Number of requests of each scenario for each size and concurrency.
+    - columns (int): Number of columns of the uploaded datasets, cycling through the generated data types.
+    - cardinality, na_rate, formatted_ratio, dirty_ratio: Parameters of the generated datasets (see generator.generate_column).
+    - page_size (int): Rows of the requested pages.
+    - update_dtype (str): Data type the first column of the datasets is converted to by the updates.
+    - scenarios (iterable): Scenarios to run, pages and updates require uploads.
+    - seed (int): Seed of the generated datasets and of the requested pages.
+    - log (callable): Called with a line describing each result, if given.
+
+    Returns:
+    - list: Results of the scenarios, dicts with the scenario, the size, the concurrency and the measures (see summarize).
+    """
+
+    api_url = base_url.rstrip('/') + API_PREFIX
+    rng = random.Random(seed)
+    upload_ids = itertools.count()
+    results = []
+    for rows in sizes:
+        df = generate_dataframe(rows, columns, cardinality, na_rate, formatted_ratio, dirty_ratio, seed=seed)
+        header, body = df.to_csv(index=False).encode().split(b'\n', 1)
+        first_column = df.columns[0]
+
+        for concurrency in concurrencies:
+            def upload(upload_id):
+                # Renaming the last column makes each upload a new dataset, with the same cleaning work
+                content = header + f'_{upload_id}'.encode() + b'\n' + body
+                multipart_body, content_type = encode_multipart({"uploaded_on": datetime.now(timezone.utc).isoformat()}, {"file": (f'loadtest_{upload_id}.csv', content)})
+                return send_request(f'{api_url}upload-file/?page_size={page_size}', multipart_body, content_type)
+
+            def get_page(keys):
+                return send_request(f'{api_url}data/{keys[1]}/?page={rng.randint(1, max(1, -(-rows // page_size)))}&page_size={page_size}')
+
+            def update(keys):
+                update_request = {
+                    "dtypes": [{"col_name": first_column, "dtype": update_dtype, "missing_values": 'ignore', "default": None}],
+                    "invalid_values": 'coerce',
+                    "original_data_key": keys[0],
+                    "cleaned_data_key": keys[1],
+                }
+                return send_request(f'{api_url}update-columns-dtypes/?page_size={page_size}', json.dumps(update_request).encode(), 'application/json')
+
+            dataset_keys = []
+            for scenario in scenarios:
+                if scenario == Scenarios.UPLOAD:
+                    responses, wall_seconds = run_concurrently(upload, [next(upload_ids) for _ in range(requests)], concurrency)
+                    dataset_keys = [(response["original_data_key"], response["cleaned_data_key"]) for _, status_code, response in responses
+                                    if status_code == 200 and response is not None]
+                elif not dataset_keys:
+                    continue # Nothing uploaded to request
+                else:
+                    send = get_page if scenario == Scenarios.PAGE else update
+                    responses, wall_seconds = run_concurrently(send, [dataset_keys[position % len(dataset_keys)] for position in range(requests)], concurrency)
+
+                result = {"scenario": scenario, "rows": rows, "columns": columns, "concurrency": concurrency,
+                          **summarize([seconds for seconds, _, _ in responses], [status_code for _, status_code, _ in responses], wall_seconds)}
+                if scenario == Scenarios.UPLOAD:
+                    result["rows_per_second"] = rows * (result["requests"] - result["errors"]) / wall_seconds if wall_seconds > 0 else None
+                results.append(result)
+                if log is not None:
+                    log(format_result(result))
+    return results
+
+
+def get_result_key(result):
+    """
+    Returns:
+    - tuple: Identity of a load test result, matching the same scenario in other reports.
+    """
+
+    return tuple(result[field] for field in ('scenario', 'rows', 'columns', 'concurrency'))
+
+
+def format_result(result):
+    subject = f'{result["scenario"]} rows={result["rows"]} columns={result["columns"]} concurrency={result["concurrency"]}'
+    if result["p50_seconds"] is None:
+        return f'{subject:<50} no requests'
+    return (f'{subject:<50} {result["requests_per_second"]:>9.2f} req/s  p50 {result["p50_seconds"]:>8.4f}s  p95 {result["p95_seconds"]:>8.4f}s  '
+            f'p99 {result["p99_seconds"]:>8.4f}s  errors {result["errors"]}/{result["requests"]}')
+
+
+def compare_results(baseline_results, results):
+    """
+    Compare the results of two load tests.
+
+    Returns:
+    - list: Tuples of the result key, the ratio of the throughputs (compared / baseline) and of the p95 latencies
+      (baseline / compared) of the scenarios run in both reports, ratios > 1 are improvements.
+    """
+
+    baseline_by_key = {get_result_key(result): result for result in baseline_results}
+    comparisons = []
+    for result in results:
+        baseline = baseline_by_key.get(get_result_key(result))
+        if baseline is None or not baseline["requests_per_second"] or not result["p95_seconds"] or baseline["p95_seconds"] is None:
+            continue
+        comparisons.append((get_result_key(result), result["requests_per_second"] / baseline["requests_per_second"], baseline["p95_seconds"] / result["p95_seconds"]))
+    return comparisons
+
+
+def parse_args(args=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.loadtest', description='Load test the upload, paginated data and data types update endpoints.')
+    parser.add_argument('--url', help='Url of a running server, e.g. http://127.0.0.1:8000. By default the application is served from this process')
+    parser.add_argument('--redis', choices=[RedisBackends.FAKE, RedisBackends.LOCAL], default=RedisBackends.FAKE,
+                        help='Redis of the in-process server, fakeredis or the redis-server configured in the settings')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help='Rows of the uploaded datasets')
+    parser.add_argument('--concurrencies', type=int, nargs='+', default=DEFAULT_CONCURRENCIES, help='Requests in flight at once')
+    parser.add_argument('--requests', type=int, default=DEFAULT_REQUESTS, help='Requests of each scenario for each size and concurrency')
+    parser.add_argument('--columns', type=int, default=DEFAULT_COLUMNS, help='Columns of the uploaded datasets')
+    parser.add_argument('--cardinality', type=int, default=1000)
+    parser.add_argument('--na-rate', type=float, default=0.0)
+    parser.add_argument('--formatted-ratio', type=float, default=0.0)
+    parser.add_argument('--dirty-ratio', type=float, default=0.0)
+    parser.add_argument('--page-size', type=int, default=DEFAULT_PAGE_SIZE)
+    parser.add_argument('--update-dtype', default='float64', help='Data type the first column is converted to by the updates')
+    parser.add_argument('--scenarios', nargs='+', choices=SCENARIOS, default=SCENARIOS)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='JSON file the report is saved to')
+    parser.add_argument('--compare', help='JSON report of a previous run to compare the results with')
+    return parser.parse_args(args)
+
+
+def main(args=None):
+    args = parse_args(args)
+
+    server = None
+    base_url = args.url
+    if base_url is None:
+        base_url, server = start_server(args.redis)
+    target = base_url if server is None else f'in-process server ({args.redis} redis)'
+    print(f'Load testing {target}')
+
+    try:
+        results = run_load_test(base_url, args.sizes, args.concurrencies, args.requests, args.columns, args.cardinality, args.na_rate,
+                                args.formatted_ratio, args.dirty_ratio, args.page_size, args.update_dtype, args.scenarios, seed=args.seed, log=print)
+    finally:
+        if server is not None:
+            server.shutdown()
+
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            json.dump({"environment": {**get_environment(), "target": target}, "config": vars(args), "results": results}, output_file, indent=2)
+        print(f'Report saved to {args.output}')
+
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            baseline = json.load(baseline_file)
+        print(f'Compared with {args.compare} ({baseline["environment"]["target"]}, {baseline["environment"]["timestamp"]}), ratios > 1 are improvements:')
+        for key, throughput_ratio, p95_ratio in compare_results(baseline["results"], results):
+            description = ' '.join(f'{value}' for value in key)
+            print(f'{description:<40} throughput x{throughput_ratio:.2f}  p95 latency x{p95_ratio:.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,232 @@
+import contextlib
+import glob
+import itertools
+import os
+import platform
+import sys
+import time
+import tracemalloc
+import warnings
+from datetime import datetime, timezone
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from data_cleanser.inference import Inference
+from data_cleanser.conversion import Convertor
+from data_cleanser.data_types import DataTypes, get_numeric_types
+from .generator import GENERATED_TYPES, generate_column
+
+DEFAULT_SIZES = (10_000, 100_000, 1_000_000)
+DEFAULT_CARDINALITIES = (10, 10_000)
+DEFAULT_DIRTY_RATIOS = (0.0, 0.1)
+DEFAULT_FORMATTED_RATIOS = (0.0,)
+DATASETS_DIR = os.path.join(os.path.dirname(__file__), '..', '..', 'Datasets')
+
+# Detectors of Inference, the ones parsing strings are only run on columns of strings (typed columns skip them)
+TYPED_DETECTORS = ('infer_typed_data_type', 'infer_numeric_type', 'infer_data_type')
+STRING_DETECTORS = ('infer_numeric_type', 'infer_formatted_numeric_type', 'is_timedelta_type', 'is_datetime_type',
+                    'is_boolean_type', 'is_categorical_type', 'is_complex_type', 'infer_data_type')
+
+# Conversions of Convertor run on the columns of each type, with the arguments of the cleaning pipeline
+CONVERSIONS = {
+    DataTypes.DATETIME64: ('convert_column_to_datetime', {"errors": 'coerce'}),
+    DataTypes.TIMEDELTA64: ('convert_column_to_timedelta', {"errors": 'coerce'}),
+    DataTypes.BOOLEAN: ('convert_column_to_boolean', {"errors": 'coerce'}),
+    DataTypes.CATEGORY: ('convert_column_to_category', {}),
+    DataTypes.COMPLEX: ('convert_column_to_complex', {"errors": 'coerce'}),
+}
+
+
+def get_conversion(dtype, formatted_ratio):
+    """
+    Returns:
+    - tuple: Name and arguments of the Convertor method converting columns of a type, None for object columns.
+      Formatted numeric strings are converted with errors='raise', the only mode taking the formatted numeric path.
+    """
+
+    if dtype in get_numeric_types():
+        return 'convert_column_to_numeric', {"numeric_type": dtype, "errors": 'raise' if formatted_ratio > 0 else 'coerce'}
+    return CONVERSIONS.get(dtype)
+
+
+@contextlib.contextmanager
+def _quiet():
+    # Conversions print and pandas warns about per element parsing, which would dominate the timings of small columns
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull), warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        yield
+
+
+def measure(function, rows, repeat=3, trace_memory=True):
+    """
+    Time a function and measure the peak of memory it allocates.
+
+    Args:
+    - function (callable): Function to measure, called without arguments.
+    - rows (int): Number of rows processed by a call, to report the throughput.
+    - repeat (int): Number of timed calls after an untimed warm-up call, the fastest one is reported.
+    - trace_memory (bool): If False, the additional call tracing memory (several times slower) is skipped.
+
+    Returns:
+    - dict: Seconds of the fastest call (`seconds`), rows per second (`rows_per_second`), peak of the memory allocated
+      by an additional traced call (`peak_memory_bytes`) and the error raised by the function (`error`), if any.
+    """
+
+    result = {"seconds": None, "rows_per_second": None, "peak_memory_bytes": None, "error": None}
+    try:
+        with _quiet():
+            function()
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                function()
+                timings.append(time.perf_counter() - start)
+
+            # Traced separately, tracing slows allocations down
+            if trace_memory:
+                tracemalloc.start()
+                try:
+                    baseline_bytes = tracemalloc.get_traced_memory()[0]
+                    function()
+                    result["peak_memory_bytes"] = tracemalloc.get_traced_memory()[1] - baseline_bytes
+                finally:
+                    tracemalloc.stop()
+    except Exception as e:
+        result["error"] = f'{type(e).__name__}: {str(e)}'
+        return result
+
+    result["seconds"] = min(timings)
+    result["rows_per_second"] = rows / result["seconds"] if result["seconds"] > 0 else None
+    return result
+
+
+def get_environment():
+    """
+    Returns:
+    - dict: Versions and machine the benchmarks ran on, to tell whether two runs are comparable.
+    """
+
+    return {
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+    }
+
+
+def run_column_benchmarks(sizes=DEFAULT_SIZES, cardinalities=DEFAULT_CARDINALITIES, dirty_ratios=DEFAULT_DIRTY_RATIOS, formatted_ratios=DEFAULT_FORMATTED_RATIOS,
+                          dtypes=GENERATED_TYPES, typed=False, repeat=3, seed=0, trace_memory=True, inference_threshold_perc=Inference.INFERENCE_THRESHOLD_PERCENTAGE, log=None):
+    """
+    Time the detectors of Inference and the conversions of Convertor on synthetic columns (see generator.generate_column).
+
+    Args:
+    - sizes (iterable): Numbers of rows of the columns.
+    - cardinalities (iterable): Numbers of distinct values of the columns.
+    - dirty_ratios (iterable): Fractions of invalid values in the columns.
+    - formatted_ratios (iterable): Fractions of values in other formats (e.g. currency, percentages) in the columns.
+    - dtypes (iterable): Data types of the columns.
+    - typed (bool): If True, the columns hold typed values (as read from typed formats) rather than text.
+    - repeat (int): Number of timed calls of each benchmark.
+    - seed (int): Seed the columns are created with.
+    - trace_memory (bool): If False, the peak of memory is not measured (see measure).
+    - inference_threshold_perc (float): Inference threshold of the detectors.
+    - log (callable): Called with a line describing each result, if given.
+
+    Returns:
+    - list: Results of the benchmarks, dicts with the benchmark, the column parameters and the measures (see measure).
+    """
+
+    inference_engine = Inference(inference_threshold_perc)
+    conversion_engine = Convertor()
+    results = []
+    for rows, cardinality, dirty_ratio, formatted_ratio, dtype in itertools.product(sizes, cardinalities, dirty_ratios, formatted_ratios, dtypes):
+        column = generate_column(dtype, rows, cardinality, formatted_ratio=formatted_ratio, dirty_ratio=dirty_ratio, typed=typed, seed=seed)
+        df = column.to_frame()
+
+        benchmarks = [(f'inference.{detector}', lambda detector=detector: getattr(inference_engine, detector)(column))
+                      for detector in (TYPED_DETECTORS if typed else STRING_DETECTORS)]
+        conversion = get_conversion(dtype, formatted_ratio)
+        if conversion is not None:
+            method, kwargs = conversion
+            benchmarks.append((f'conversion.{method}', lambda method=method, kwargs=kwargs: getattr(conversion_engine, method)(df, column.name, **kwargs)))
+
+        for benchmark, function in benchmarks:
+            result = {"benchmark": benchmark, "dtype": dtype, "typed": typed, "rows": rows, "cardinality": cardinality, "dirty_ratio": dirty_ratio,
+                      "formatted_ratio": formatted_ratio, **measure(function, rows, repeat, trace_memory)}
+            results.append(result)
+            if log is not None:
+                log(format_result(result))
+    return results
+
+
+def run_dataset_benchmarks(datasets_dir=DATASETS_DIR, repeat=3, trace_memory=True, inference_threshold_perc=Inference.INFERENCE_THRESHOLD_PERCENTAGE, log=None):
+    """
+    Time reading, inferring the types of and converting the CSV files of a directory (the real files in Datasets/ by default).
+
+    Returns:
+    - list: Results of the benchmarks, with the file name under `dataset` (see run_column_benchmarks).
+    """
+
+    inference_engine = Inference(inference_threshold_perc)
+    conversion_engine = Convertor()
+    results = []
+    for path in sorted(glob.glob(os.path.join(datasets_dir, '*.csv'))):
+        df = pd.read_csv(path)
+        with _quiet():
+            inferred_data_types = inference_engine.infer_data_types(df)
+        benchmarks = [
+            ('dataset.read_csv', lambda: pd.read_csv(path)),
+            ('dataset.infer_data_types', lambda: inference_engine.infer_data_types(df)),
+            ('dataset.convert_data_types', lambda: conversion_engine.convert_data_types(df, inferred_data_types)),
+        ]
+        for benchmark, function in benchmarks:
+            result = {"benchmark": benchmark, "dataset": os.path.basename(path), "rows": len(df), "columns": len(df.columns),
+                      **measure(function, len(df), repeat, trace_memory)}
+            results.append(result)
+            if log is not None:
+                log(format_result(result))
+    return results
+
+
+def get_result_key(result):
+    """
+    Returns:
+    - tuple: Identity of a benchmark result, matching the same benchmark in other runs.
+    """
+
+    return tuple(result.get(field) for field in ('benchmark', 'dtype', 'typed', 'dataset', 'rows', 'cardinality', 'dirty_ratio', 'formatted_ratio'))
+
+
+def format_result(result):
+    subject = result.get("dataset") or (f'{result["dtype"]}{" typed" if result["typed"] else ""} rows={result["rows"]} cardinality={result["cardinality"]} '
+                                        f'dirty={result["dirty_ratio"]} formatted={result["formatted_ratio"]}')
+    if result["error"] is not None:
+        return f'{result["benchmark"]:<45} {subject:<60} error: {result["error"]}'
+    memory = f'{result["peak_memory_bytes"] / 2**20:>9.1f} MiB' if result["peak_memory_bytes"] is not None else ''
+    return f'{result["benchmark"]:<45} {subject:<60} {result["seconds"]:>10.4f}s {result["rows_per_second"]:>14,.0f} rows/s {memory}'
+
+
+def compare_results(baseline_results, results):
+    """
+    Compare the results of two runs.
+
+    Args:
+    - baseline_results (list): Results of the baseline run.
+    - results (list): Results of the compared run.
+
+    Returns:
+    - list: Tuples of the result key, baseline seconds, seconds and speedup (baseline / compared seconds) of the
+      benchmarks measured without errors in both runs.
+    """
+
+    baseline_by_key = {get_result_key(result): result for result in baseline_results if result["error"] is None}
+    comparisons = []
+    for result in results:
+        baseline = baseline_by_key.get(get_result_key(result))
+        if baseline is not None and result["error"] is None and result["seconds"] > 0:
+            comparisons.append((get_result_key(result), baseline["seconds"], result["seconds"], baseline["seconds"] / result["seconds"]))
+    return comparisons
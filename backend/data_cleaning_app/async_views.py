@@ -0,0 +1,346 @@
+import asyncio
+import json
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.decorators import method_decorator
+from django.views.decorators.csrf import csrf_exempt
+from django.views.generic import View
+from rest_framework.exceptions import APIException, ValidationError
+from rest_framework.request import Request
+from rest_framework import status
+from .serializers import DataFileSerializer, DataTypesChangeRequestSerializer
+from pandas.errors import ParserError
+import os
+import time
+
+import sys
+sys.path.append('../')
+from data_cleanser import cleaning
+from .cache import AsyncCacheClient, AsyncDatasetReader, DatasetConflictError, compute_dataset_id, get_dataset_keys
+from .pagination import CustomPagination, DataFrameRows
+from .queries import DatasetQuery
+from .renderers import FastJSONRenderer, dataframe_to_records
+from .metrics import record_cleaning
+from .views import ColumnUpdatesMixin, ColumnsQueryMixin, SortFilterQueryMixin, cache, dataset_cache, inference_engine, reader_registry, record_upload_size
+
+# Initialising logger, async cache reader (sharing the local frame cache of the dataset cache) and the worker processes
+# running inference and conversion, so that CPU heavy uploads and updates don't block the event loop
+logger = logging.getLogger("django")
+async_cache = AsyncCacheClient.from_settings(cache, settings.DATASET_CACHE)
+dataset_reader = AsyncDatasetReader(dataset_cache, async_cache)
+
+
+def create_process_pool():
+    return ProcessPoolExecutor(
+        max_workers=settings.ASYNC_VIEWS["PROCESS_WORKERS"],
+        mp_context=multiprocessing.get_context(settings.ASYNC_VIEWS["START_METHOD"]))
+
+cleaning_processes = create_process_pool()
+
+
+def json_response(data, status_code=status.HTTP_200_OK):
+    """
+    Render a response with the same json renderer as the DRF views.
+    """
+
+    return HttpResponse(FastJSONRenderer().render(data), status=status_code, content_type='application/json')
+
+
+def exception_response(exc):
+    """
+    Render an API exception raised by validation or pagination the way DRF views do.
+    """
+
+    data = exc.detail if isinstance(exc.detail, (list, dict)) else {"detail": exc.detail}
+    return json_response(data, exc.status_code)
+
+
+async def run_in_process(function, *args):
+    """
+    Run a function in the pool of worker processes, without blocking the event loop.
+    """
+
+    global cleaning_processes
+    try:
+        return await asyncio.get_running_loop().run_in_executor(cleaning_processes, function, *args)
+    except BrokenProcessPool:
+        # A worker process died (e.g. killed when out of memory), replacing the pool for the next requests
+        logger.error('run_in_process : Worker process terminated abruptly, replacing the process pool')
+        cleaning_processes = create_process_pool()
+        raise
+
+
+@method_decorator(csrf_exempt, name='dispatch')
+class AsyncDataFileUploadView(View):
+    """
+    Async variant of DataFileUploadAPIView (without the preview mode).
+
+    The file is parsed in a thread and cleaned in a worker process, cache reads use the async redis client.
+    """
+
+    def parse_upload(self, request):
+        """
+        Validate the multipart request, run in a thread as parsing it may spool the file to disk.
+
+        Returns:
+        - UploadedFile: The uploaded file.
+
+        Raises:
+        - ValidationError: If the request is invalid.
+        """
+
+        data = request.POST.copy()
+        data.update(request.FILES)
+        file_data_serializer = DataFileSerializer(data=data)
+        if not file_data_serializer.is_valid():
+            logger.error(f"AsyncDataFileUploadView: Invalid file data serializer: {file_data_serializer.errors}")
+            raise ValidationError(file_data_serializer.errors)
+        return file_data_serializer.validated_data["file"]
+
+    def read_dataframe(self, uploaded_file, file_extension):
+        """
+        Parse an uploaded file with the reader registered for its extension (see data_cleanser.readers), run in a thread.
+
+        Returns:
+        - tuple or None: Parsed dataframes with the uploaded values and with the types hinted by the reader
+          (see data_cleanser.readers.DataReader.read_typed), None if the file type is not supported.
+
+        Raises:
+        - ParserError: If the file can't be parsed.
+        """
+
+        reader = reader_registry.get_reader(file_extension)
+        if reader is None:
+            return None
+        return reader.read_typed(uploaded_file)
+
+    async def post(self, request):
+        logger.debug('AsyncDataFileUploadView: Starting POST method')
+
+        try:
+            uploaded_file = await asyncio.to_thread(self.parse_upload, request)
+        except ValidationError as e:
+            return exception_response(e)
+
+        file_name = uploaded_file.name
+        file_extension = os.path.splitext(file_name)[1]
+        record_upload_size(uploaded_file, file_extension)
+
+        # Datasets are addressed by their content and processing settings, so identical uploads are only processed once
+        dataset_id = await asyncio.to_thread(compute_dataset_id, uploaded_file, extension=file_extension.lower(), inference_threshold=inference_engine.INFERENCE_THRESHOLD_PERCENTAGE)
+        original_df_key, cleaned_df_key = get_dataset_keys(dataset_id)
+
+        if await async_cache.redis.exists(original_df_key, cleaned_df_key) == 2:
+            meta = await dataset_reader.get_meta(cleaned_df_key)
+            if meta is not None and dataset_cache.get_status(meta) != dataset_cache.STATUS_FAILED:
+                logger.debug(f'AsyncDataFileUploadView: Dataset "{dataset_id}" already processed, returning cached result')
+                try:
+                    start, stop = CustomPagination().get_page_bounds(meta["rows"], Request(request))
+                except APIException as e:
+                    return exception_response(e)
+
+                df_page = await dataset_reader.get_columns(cleaned_df_key, start=start, stop=stop, meta=meta)
+                if df_page is not None:
+                    return self.build_response("Data already processed, returning cached result", df_page, dataset_cache.get_dtypes(meta), original_df_key, cleaned_df_key, dataset_cache.get_status(meta))
+
+        try:
+            dataframes = await asyncio.to_thread(self.read_dataframe, uploaded_file, file_extension)
+        except ParserError as e:
+            logger.error(f"AsyncDataFileUploadView: Error occurred while parsing file: {file_name}, error: {str(e)}")
+            return json_response({"message": f"Error occurred while parsing file: {file_name}"}, status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+        if dataframes is None:
+            logger.error(f"AsyncDataFileUploadView: Unsupported file type: {file_extension}")
+            return json_response({"message": "Received unsupported data file type"}, status.HTTP_400_BAD_REQUEST)
+        df, df_typed = dataframes
+
+        try:
+            start = time.perf_counter()
+            df_cleaning_result = await run_in_process(cleaning.clean_dataframe, df_typed, inference_engine.INFERENCE_THRESHOLD_PERCENTAGE)
+            # Timed from the event loop, including the transfer of the frames to and from the worker process
+            record_cleaning(len(df), time.perf_counter() - start, df_cleaning_result["inferred_dtypes"])
+            logger.debug('AsyncDataFileUploadView: Dataframe cleaned successfully')
+        except ValueError as e:
+            logger.error(f"AsyncDataFileUploadView: Error cleaning dataframe: {str(e)}")
+            return json_response({ "message" : "Error cleaning dataframe", "error" : str(e) }, status.HTTP_400_BAD_REQUEST)
+        except Exception as e:
+            logger.error(f"AsyncDataFileUploadView: Unexpected error cleaning dataframe: {str(e)}")
+            return json_response({ "message" : "Error cleaning dataframe", "error" : str(e) }, status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+        df_cleaned = df_cleaning_result["data"]
+
+        # Serializing and writing the frames is CPU bound as well, run in a thread with the sync dataset cache
+        await asyncio.to_thread(dataset_cache.set_frames, { original_df_key : df, cleaned_df_key : df_cleaned })
+        logger.debug('AsyncDataFileUploadView: Dataframes cached successfully')
+
+        try:
+            df_page = CustomPagination().paginate_rows(DataFrameRows(df_cleaned), Request(request))
+        except APIException as e:
+            return exception_response(e)
+
+        return self.build_response("Data uploaded and processed successfully", df_page, df_cleaning_result["dtypes"], original_df_key, cleaned_df_key, dataset_cache.STATUS_READY)
+
+    def build_response(self, message, df_page, df_cleaned_dtypes, original_df_key, cleaned_df_key, cleaning_status):
+        return json_response({
+            "message": message,
+            "dtypes": df_cleaned_dtypes,
+            "data": dataframe_to_records(df_page),
+            "original_data_key" : original_df_key,
+            "cleaned_data_key" : cleaned_df_key,
+            "status" : cleaning_status
+        })
+
+
+class AsyncPaginatedDataView(ColumnsQueryMixin, SortFilterQueryMixin, View):
+    """
+    Async variant of PaginatedDataView, taking the same query parameters.
+
+    The rows of the page are fetched with the async redis client, sort permutations and filter masks
+    are computed (or fetched from the cache) in a thread.
+    """
+
+    async def get(self, request, cleaned_data_key):
+        logger.debug(f'AsyncPaginatedDataView : get : Requesting paginated data for key: {cleaned_data_key}')
+
+        meta = await dataset_reader.get_meta(cleaned_data_key)
+        if meta is None:
+            logger.error(f'AsyncPaginatedDataView : get : Data not found for key: {cleaned_data_key}')
+            return json_response({"message": "Data not found. Please check your data key"}, status.HTTP_404_NOT_FOUND)
+
+        drf_request = Request(request)
+        paginator = CustomPagination()
+        try:
+            columns = self.get_requested_columns(drf_request, meta)
+            sort, filters = self.get_requested_query(drf_request, meta)
+
+            row_order = None
+            if sort is not None or filters:
+                try:
+                    row_order = await asyncio.to_thread(DatasetQuery(dataset_cache, cleaned_data_key, meta).get_row_order, sort, filters)
+                except ValueError as e:
+                    return json_response({self.filter_query_param: str(e)}, status.HTTP_400_BAD_REQUEST)
+
+            rows_count = meta["rows"] if row_order is None else len(row_order)
+            start, stop = paginator.get_page_bounds(rows_count, drf_request)
+        except APIException as e:
+            return exception_response(e)
+
+        if row_order is not None:
+            df_page = await dataset_reader.get_rows(cleaned_data_key, row_order[start:stop], columns, meta=meta)
+        else:
+            df_page = await dataset_reader.get_columns(cleaned_data_key, columns, start=start, stop=stop, meta=meta)
+
+        if df_page is None:
+            logger.error(f'AsyncPaginatedDataView : get : Data evicted while being read for key: {cleaned_data_key}')
+            return json_response({"message": "Data not found. Please check your data key"}, status.HTTP_404_NOT_FOUND)
+
+        return json_response({
+            "message": "Successfully retrieved paginated data.",
+            "data": dataframe_to_records(df_page),
+            "pagination": paginator.get_pagination_info(),
+            "cleaned_data_key" : cleaned_data_key,
+            "status" : dataset_cache.get_status(meta)})
+
+
+@method_decorator(csrf_exempt, name='dispatch')
+class AsyncUpdateColumnsDataTypesView(ColumnUpdatesMixin, View):
+    """
+    Async variant of UpdateColumnsDataTypesAPIView, taking the same json request and query parameters.
+
+    The updated columns are fetched with the async redis client and converted concurrently in the worker processes.
+    """
+
+    async def post(self, request):
+        logger.debug('AsyncUpdateColumnsDataTypesView : post : Beginning of method')
+
+        try:
+            request_data = json.loads(request.body)
+        except ValueError:
+            return json_response({"message": "Request body must be valid json"}, status.HTTP_400_BAD_REQUEST)
+
+        serializer = DataTypesChangeRequestSerializer(data=request_data)
+        if not serializer.is_valid():
+            logger.error(f'AsyncUpdateColumnsDataTypesView : post : Validation failed for request data: {serializer.errors}')
+            return json_response(serializer.errors, status.HTTP_400_BAD_REQUEST)
+
+        data = serializer.validated_data
+        original_df_key = data["original_data_key"]
+        cleaned_df_key = data["cleaned_data_key"]
+
+        cleaned_meta, original_meta = await asyncio.gather(dataset_reader.get_meta(cleaned_df_key), dataset_reader.get_meta(original_df_key))
+        if cleaned_meta is not None and dataset_cache.get_status(cleaned_meta) == dataset_cache.STATUS_PROCESSING:
+            logger.error(f'AsyncUpdateColumnsDataTypesView : post : Data is still being processed for key: {cleaned_df_key}')
+            return json_response({"message": "Data is still being processed. Please retry once it is ready"}, status.HTTP_409_CONFLICT)
+        if original_meta is None or cleaned_meta is None:
+            logger.error(f'AsyncUpdateColumnsDataTypesView : post : Data not found for keys: {original_df_key}, {cleaned_df_key}')
+            return json_response({"message": "Data not found. Please check your data keys"}, status.HTTP_404_NOT_FOUND)
+
+        col_dtypes_updates = [dict(col_dtype_update) for col_dtype_update in data["dtypes"]]
+        updated_col_names = self.get_updated_col_names(col_dtypes_updates)
+        unknown_col_names = self.get_unknown_columns(updated_col_names, original_meta, cleaned_meta)
+        if unknown_col_names:
+            logger.error(f'AsyncUpdateColumnsDataTypesView : post : Unknown columns: {unknown_col_names}')
+            return json_response({"message": "Invalid data passed", "error": f'Unknown columns: {unknown_col_names}'}, status.HTTP_400_BAD_REQUEST)
+
+        # Loading only the updated columns of the original dataframe from cache
+        original_columns = await dataset_reader.get_columns(original_df_key, updated_col_names, meta=original_meta)
+        if original_columns is None:
+            logger.error(f'AsyncUpdateColumnsDataTypesView : post : Data not found for key: {original_df_key}')
+            return json_response({"message": "Data not found. Please check your data keys"}, status.HTTP_404_NOT_FOUND)
+
+        # One task per column, each column converted through its updates in the requested order
+        col_updates = cleaning.group_column_updates(col_dtypes_updates)
+        results = await asyncio.gather(*(run_in_process(cleaning.convert_column, original_columns[col_name], updates, data["invalid_values"])
+                                         for col_name, updates in col_updates.items()), return_exceptions=True)
+
+        # Reporting the first failing column in the requested order
+        converted_columns = {}
+        for col_name, result in zip(col_updates, results):
+            if isinstance(result, ValueError):
+                logger.error(f'AsyncUpdateColumnsDataTypesView : post : Error converting column "{col_name}": {str(result)}')
+                return json_response({ "message" : "Error cleaning dataframe", "error" : str(result) }, status.HTTP_400_BAD_REQUEST)
+            if isinstance(result, TypeError):
+                logger.error(f'AsyncUpdateColumnsDataTypesView : post : Invalid data passed for column "{col_name}": {str(result)}')
+                return json_response({ "message" : "Invalid data passed", "error" : str(result) }, status.HTTP_400_BAD_REQUEST)
+            if isinstance(result, Exception):
+                logger.error(f'AsyncUpdateColumnsDataTypesView : post : Error cleaning dataframe for column "{col_name}": {str(result)}')
+                return json_response({ "message" : "Error cleaning dataframe", "error" : str(result) }, status.HTTP_500_INTERNAL_SERVER_ERROR)
+            converted_columns[col_name] = result
+
+        try:
+            cleaned_meta = await asyncio.to_thread(dataset_cache.set_columns, cleaned_df_key, converted_columns, cleaned_meta)
+        except DatasetConflictError as e:
+            logger.error(f'AsyncUpdateColumnsDataTypesView : post : Conflicting update for key: {cleaned_df_key}: {str(e)}')
+            return json_response(self.get_conflict_response_data(e), status.HTTP_409_CONFLICT)
+        except KeyError:
+            logger.error(f'AsyncUpdateColumnsDataTypesView : post : Data evicted while being updated for key: {cleaned_df_key}')
+            return json_response({"message": "Data not found. Please check your data keys"}, status.HTTP_404_NOT_FOUND)
+        logger.debug('AsyncUpdateColumnsDataTypesView : post : Updated columns cached')
+
+        drf_request = Request(request)
+        changed_only = self.is_changed_only_requested(drf_request)
+        df_cleaned_dtypes = dataset_cache.get_dtypes(cleaned_meta)
+        if changed_only:
+            df_cleaned_dtypes = {col_name: df_cleaned_dtypes[col_name] for col_name in updated_col_names}
+
+        # Fetching the rows of the requested page only, the updated columns are held by the local cache
+        paginator = CustomPagination()
+        try:
+            start, stop = paginator.get_page_bounds(cleaned_meta["rows"], drf_request)
+        except APIException as e:
+            return exception_response(e)
+        df_page = await dataset_reader.get_columns(cleaned_df_key, updated_col_names if changed_only else None, start=start, stop=stop, meta=cleaned_meta)
+        if df_page is None:
+            logger.error(f'AsyncUpdateColumnsDataTypesView : post : Data evicted while being read for key: {cleaned_df_key}')
+            return json_response({"message": "Data not found. Please check your data keys"}, status.HTTP_404_NOT_FOUND)
+
+        return json_response({
+            "message": "Request is successful.",
+            "data": dataframe_to_records(df_page),
+            "dtypes" : df_cleaned_dtypes,
+            "original_data_key" : original_df_key,
+            "cleaned_data_key" : cleaned_df_key})
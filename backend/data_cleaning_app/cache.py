@@ -0,0 +1,1759 @@
+import asyncio
+import hashlib
+import json
+import logging
+import pickle
+import threading
+import time
+import weakref
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+import redis
+import redis.asyncio
+from data_cleanser.instrumentation import span
+from .metrics import REDIS_LATENCY
+
+# Compression libraries are optional, the cache falls back to storing raw bytes when they are not installed
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:
+    lz4_frame = None
+
+logger = logging.getLogger("django")
+
+
+class CompressionCodecs:
+    """
+    Constants representing the compression codecs supported by the cache client.
+    """
+    NONE = 'none'
+    ZSTD = 'zstd'
+    LZ4 = 'lz4'
+
+
+# Every value written by the cache client is prefixed with a small header so that it can be decoded
+# regardless of the codec configured at read time. Values without the header are returned as is.
+_PAYLOAD_MAGIC = b'\x00DC'
+_CODEC_IDS = {
+    CompressionCodecs.NONE: b'n',
+    CompressionCodecs.ZSTD: b'z',
+    CompressionCodecs.LZ4: b'l',
+}
+_CODEC_NAMES = {codec_id: name for name, codec_id in _CODEC_IDS.items()}
+_HEADER_LENGTH = len(_PAYLOAD_MAGIC) + 1
+
+
+def is_codec_available(codec):
+    """
+    Check if the library backing a compression codec is installed.
+
+    Args:
+    - codec (str): One of the CompressionCodecs values.
+
+    Returns:
+    - bool: True if values can be compressed/decompressed with the codec, False otherwise.
+    """
+
+    if codec == CompressionCodecs.NONE:
+        return True
+    if codec == CompressionCodecs.ZSTD:
+        return zstandard is not None
+    if codec == CompressionCodecs.LZ4:
+        return lz4_frame is not None
+    return False
+
+
+def compress_payload(data, codec, level=3):
+    """
+    Compress bytes with the given codec and prefix them with the payload header.
+
+    Args:
+    - data (bytes): Raw bytes to compress.
+    - codec (str): One of the CompressionCodecs values.
+    - level (int): Compression level passed to the codec.
+
+    Returns:
+    - bytes: Header followed by the (possibly) compressed bytes.
+
+    Raises:
+    - KeyError: If the codec is not supported.
+    """
+
+    if codec == CompressionCodecs.ZSTD:
+        body = zstandard.ZstdCompressor(level=level).compress(data)
+    elif codec == CompressionCodecs.LZ4:
+        body = lz4_frame.compress(data, compression_level=level)
+    elif codec == CompressionCodecs.NONE:
+        body = data
+    else:
+        raise KeyError(f'Invalid compression codec provided i.e. {codec}. Please provide one of {list(_CODEC_IDS)}')
+
+    return _PAYLOAD_MAGIC + _CODEC_IDS[codec] + body
+
+
+def decompress_payload(payload):
+    """
+    Decode a value written with compress_payload.
+
+    Args:
+    - payload (bytes): Value read from the cache.
+
+    Returns:
+    - bytes: The original raw bytes. Values without the payload header are returned unchanged.
+
+    Raises:
+    - ValueError: If the payload was compressed with a codec that is not installed.
+    """
+
+    if payload is None or not payload.startswith(_PAYLOAD_MAGIC):
+        return payload
+
+    codec = _CODEC_NAMES.get(payload[len(_PAYLOAD_MAGIC):_HEADER_LENGTH])
+    body = payload[_HEADER_LENGTH:]
+
+    if codec == CompressionCodecs.NONE:
+        return body
+    if not is_codec_available(codec):
+        raise ValueError(f'Cached value is compressed with "{codec}" which is not installed')
+    if codec == CompressionCodecs.ZSTD:
+        return zstandard.ZstdDecompressor().decompress(body)
+    if codec == CompressionCodecs.LZ4:
+        return lz4_frame.decompress(body)
+
+    return payload
+
+
+def compute_dataset_id(uploaded_file, **processing_settings):
+    """
+    Compute a content address for an uploaded data file.
+
+    The file is hashed in chunks (without reading it into memory at once) together with the settings that
+    influence processing, so identical uploads processed the same way map to the same dataset.
+
+    Args:
+    - uploaded_file (UploadedFile): The uploaded file, rewound to the start after hashing.
+    - processing_settings: Settings affecting the processed result (e.g. inference threshold, file extension).
+
+    Returns:
+    - str: Hex digest identifying the dataset.
+    """
+
+    hasher = hashlib.blake2b(digest_size=20)
+    uploaded_file.seek(0)
+    for chunk in uploaded_file.chunks():
+        hasher.update(chunk)
+    uploaded_file.seek(0)
+
+    hasher.update(json.dumps(processing_settings, sort_keys=True, default=str).encode())
+    return hasher.hexdigest()
+
+
+def get_dataset_keys(dataset_id):
+    """
+    Returns:
+    - tuple: Cache keys of the original and cleaned dataframes of a dataset.
+    """
+
+    return 'df_' + dataset_id + '_original', 'df_' + dataset_id + '_cleaned'
+
+
+def get_sheet_dataset_id(dataset_id, sheet_name):
+    """
+    Returns:
+    - str: Id of the dataset of a sheet of an uploaded workbook, derived from the id of the workbook.
+    """
+
+    return hashlib.blake2b(json.dumps([dataset_id, sheet_name]).encode(), digest_size=20).hexdigest()
+
+
+def get_dataset_id(key):
+    """
+    Returns:
+    - str or None: Id of the dataset a cache key belongs to, None if the key is not a dataset key.
+    """
+
+    for suffix in ('_original', '_cleaned'):
+        if key.startswith('df_') and key.endswith(suffix):
+            return key[len('df_'):-len(suffix)]
+    return None
+
+
+class DatasetConflictError(Exception):
+    """
+    Raised when columns of a stored frame are replaced while they are being updated, or when an
+    update of a stored frame keeps conflicting with concurrent updates.
+    """
+
+
+class CacheTransferStats:
+    """
+    Thread safe accumulator of byte counts and timings for the values moved through the cache client.
+    The latency of each round trip is also observed in the redis latency histogram (see metrics).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reset_counters()
+
+    def reset(self):
+        with self._lock:
+            self._reset_counters()
+
+    def _reset_counters(self):
+        self.set_count = 0
+        self.get_count = 0
+        self.raw_bytes_written = 0
+        self.stored_bytes_written = 0
+        self.raw_bytes_read = 0
+        self.stored_bytes_read = 0
+        self.compression_seconds = 0.0
+        self.decompression_seconds = 0.0
+        self.set_seconds = 0.0
+        self.get_seconds = 0.0
+
+    def record_set(self, values_count, raw_bytes, stored_bytes, compression_seconds, transfer_seconds):
+        with self._lock:
+            self.set_count += values_count
+            self.raw_bytes_written += raw_bytes
+            self.stored_bytes_written += stored_bytes
+            self.compression_seconds += compression_seconds
+            self.set_seconds += transfer_seconds
+        REDIS_LATENCY.observe(transfer_seconds, operation='set')
+
+    def record_get(self, values_count, raw_bytes, stored_bytes, decompression_seconds, transfer_seconds):
+        with self._lock:
+            self.get_count += values_count
+            self.raw_bytes_read += raw_bytes
+            self.stored_bytes_read += stored_bytes
+            self.decompression_seconds += decompression_seconds
+            self.get_seconds += transfer_seconds
+        REDIS_LATENCY.observe(transfer_seconds, operation='get')
+
+    def as_dict(self):
+        """
+        Returns:
+        - dict: Snapshot of the accumulated counters, including the overall compression ratio (raw / stored bytes written).
+        """
+
+        with self._lock:
+            return {
+                "set_count": self.set_count,
+                "get_count": self.get_count,
+                "raw_bytes_written": self.raw_bytes_written,
+                "stored_bytes_written": self.stored_bytes_written,
+                "raw_bytes_read": self.raw_bytes_read,
+                "stored_bytes_read": self.stored_bytes_read,
+                "compression_ratio": self.raw_bytes_written / self.stored_bytes_written if self.stored_bytes_written else 1.0,
+                "compression_seconds": self.compression_seconds,
+                "decompression_seconds": self.decompression_seconds,
+                "set_seconds": self.set_seconds,
+                "get_seconds": self.get_seconds,
+            }
+
+
+class CacheClient:
+    """
+    Redis client wrapper used for storing (large) serialized datasets.
+
+    Uses an explicit connection pool, optionally compresses values larger than a threshold
+    with zstd or lz4 and supports pipelined multi-key reads and writes so that related values
+    (e.g. the original and cleaned dataframes) are transferred in a single round trip.
+    """
+
+    DEFAULT_COMPRESSION_THRESHOLD = 64 * 1024 # Values smaller than this (in bytes) are stored uncompressed
+
+    def __init__(self, host='localhost', port=6379, db=0, max_connections=20, socket_timeout=None,
+                 compression=CompressionCodecs.NONE, compression_threshold=DEFAULT_COMPRESSION_THRESHOLD,
+                 compression_level=3, client=None):
+        if compression not in _CODEC_IDS:
+            raise KeyError(f'Invalid compression codec provided i.e. {compression}. Please provide one of {list(_CODEC_IDS)}')
+
+        if not is_codec_available(compression):
+            logger.warning(f'CacheClient : __init__ : Compression codec "{compression}" is not installed, storing values uncompressed')
+            compression = CompressionCodecs.NONE
+
+        self.compression = compression
+        self.compression_threshold = compression_threshold
+        self.compression_level = compression_level
+        self.stats = CacheTransferStats()
+
+        if client is not None:
+            self.redis = client
+        else:
+            self.pool = redis.ConnectionPool(host=host, port=port, db=db, max_connections=max_connections, socket_timeout=socket_timeout)
+            self.redis = redis.Redis(connection_pool=self.pool)
+
+    @classmethod
+    def from_settings(cls, cache_settings):
+        """
+        Create a cache client from a settings dictionary (see DATASET_CACHE in the project settings).
+        """
+
+        return cls(
+            host=cache_settings.get("HOST", 'localhost'),
+            port=cache_settings.get("PORT", 6379),
+            db=cache_settings.get("DB", 0),
+            max_connections=cache_settings.get("MAX_CONNECTIONS", 20),
+            socket_timeout=cache_settings.get("SOCKET_TIMEOUT"),
+            compression=cache_settings.get("COMPRESSION", CompressionCodecs.NONE),
+            compression_threshold=cache_settings.get("COMPRESSION_THRESHOLD", cls.DEFAULT_COMPRESSION_THRESHOLD),
+            compression_level=cache_settings.get("COMPRESSION_LEVEL", 3),
+        )
+
+    def _encode(self, value):
+        """
+        (Private) Encode a value for storage, compressing it if it is larger than the compression threshold.
+        """
+
+        if self.compression != CompressionCodecs.NONE and len(value) >= self.compression_threshold:
+            return compress_payload(value, self.compression, self.compression_level)
+        return compress_payload(value, CompressionCodecs.NONE)
+
+    def _encode_many(self, mapping):
+        """
+        (Private) Encode all values of a mapping, recording the raw and stored byte counts.
+        """
+
+        start = time.perf_counter()
+        encoded = {key: self._encode(value) for key, value in mapping.items()}
+        compression_seconds = time.perf_counter() - start
+
+        raw_bytes = sum(len(value) for value in mapping.values())
+        stored_bytes = sum(len(value) for value in encoded.values())
+        return encoded, raw_bytes, stored_bytes, compression_seconds
+
+    def _decode_many(self, payloads):
+        """
+        (Private) Decode a list of payloads read from redis, keeping None for missing keys.
+        """
+
+        start = time.perf_counter()
+        values = [decompress_payload(payload) for payload in payloads]
+        decompression_seconds = time.perf_counter() - start
+
+        raw_bytes = sum(len(value) for value in values if value is not None)
+        stored_bytes = sum(len(payload) for payload in payloads if payload is not None)
+        return values, raw_bytes, stored_bytes, decompression_seconds
+
+    def set(self, key, value, ex=None):
+        """
+        Store a bytes value under a key.
+
+        Args:
+        - key (str): Cache key.
+        - value (bytes): Value to store.
+        - ex (int): Optional expiry in seconds.
+        """
+
+        self.set_many({key: value}, ex=ex)
+
+    def get(self, key):
+        """
+        Fetch the bytes value stored under a key.
+
+        Returns:
+        - bytes or None: The decoded value or None if the key does not exist.
+        """
+
+        return self.get_many([key])[0]
+
+    def set_many(self, mapping, ex=None):
+        """
+        Store multiple bytes values in a single pipelined round trip.
+
+        Args:
+        - mapping (dict): Mapping of cache keys to bytes values.
+        - ex (int): Optional expiry in seconds applied to every key.
+
+        Returns:
+        - dict: Mapping of cache keys to the number of bytes stored for them (after compression).
+        """
+
+        encoded, raw_bytes, stored_bytes, compression_seconds = self._encode_many(mapping)
+
+        start = time.perf_counter()
+        pipeline = self.redis.pipeline(transaction=False)
+        for key, payload in encoded.items():
+            pipeline.set(key, payload, ex=ex)
+        pipeline.execute()
+        transfer_seconds = time.perf_counter() - start
+
+        self.stats.record_set(len(mapping), raw_bytes, stored_bytes, compression_seconds, transfer_seconds)
+        logger.debug(f'CacheClient : set_many : Stored {len(mapping)} values, {raw_bytes} bytes as {stored_bytes} bytes '
+                     f'(compression {compression_seconds:.4f}s, transfer {transfer_seconds:.4f}s)')
+        return {key: len(payload) for key, payload in encoded.items()}
+
+    def get_many(self, keys):
+        """
+        Fetch multiple values in a single round trip.
+
+        Args:
+        - keys (list): Cache keys to fetch.
+
+        Returns:
+        - list: Decoded values in the same order as the keys, None for missing keys.
+        """
+
+        start = time.perf_counter()
+        payloads = self.redis.mget(keys)
+        transfer_seconds = time.perf_counter() - start
+
+        values, raw_bytes, stored_bytes, decompression_seconds = self._decode_many(payloads)
+
+        self.stats.record_get(len(keys), raw_bytes, stored_bytes, decompression_seconds, transfer_seconds)
+        logger.debug(f'CacheClient : get_many : Fetched {len(keys)} values, {stored_bytes} bytes as {raw_bytes} bytes '
+                     f'(transfer {transfer_seconds:.4f}s, decompression {decompression_seconds:.4f}s)')
+        return values
+
+    def hset_many(self, mapping, ex=None, replace=False):
+        """
+        Store fields of multiple redis hashes in a single pipelined round trip.
+
+        Args:
+        - mapping (dict): Mapping of cache keys to dicts of hash fields and their bytes values.
+        - ex (int): Optional expiry in seconds applied to every key.
+        - replace (bool): If True, existing hashes are deleted before the fields are written.
+
+        Returns:
+        - dict: Mapping of cache keys to dicts of hash fields and the number of bytes stored for them.
+        """
+
+        flat_mapping = {(key, field): value for key, fields in mapping.items() for field, value in fields.items()}
+        encoded, raw_bytes, stored_bytes, compression_seconds = self._encode_many(flat_mapping)
+
+        start = time.perf_counter()
+        pipeline = self.redis.pipeline(transaction=False)
+        for key, fields in mapping.items():
+            if replace:
+                pipeline.delete(key)
+            if fields:
+                pipeline.hset(key, mapping={field: encoded[(key, field)] for field in fields})
+            if ex is not None:
+                pipeline.expire(key, ex)
+        pipeline.execute()
+        transfer_seconds = time.perf_counter() - start
+
+        self.stats.record_set(len(flat_mapping), raw_bytes, stored_bytes, compression_seconds, transfer_seconds)
+        logger.debug(f'CacheClient : hset_many : Stored {len(flat_mapping)} fields, {raw_bytes} bytes as {stored_bytes} bytes '
+                     f'(compression {compression_seconds:.4f}s, transfer {transfer_seconds:.4f}s)')
+        return {key: {field: len(encoded[(key, field)]) for field in fields} for key, fields in mapping.items()}
+
+    def hget_many(self, requests):
+        """
+        Fetch fields of multiple redis hashes in a single pipelined round trip.
+
+        Args:
+        - requests (dict): Mapping of cache keys to lists of hash fields.
+
+        Returns:
+        - dict: Mapping of cache keys to lists of decoded values in the order of the requested fields, None for missing fields.
+        """
+
+        requests = {key: list(fields) for key, fields in requests.items() if fields}
+
+        start = time.perf_counter()
+        pipeline = self.redis.pipeline(transaction=False)
+        for key, fields in requests.items():
+            pipeline.hmget(key, fields)
+        results = pipeline.execute()
+        transfer_seconds = time.perf_counter() - start
+
+        payloads = [payload for result in results for payload in result]
+        values, raw_bytes, stored_bytes, decompression_seconds = self._decode_many(payloads)
+
+        self.stats.record_get(len(payloads), raw_bytes, stored_bytes, decompression_seconds, transfer_seconds)
+        logger.debug(f'CacheClient : hget_many : Fetched {len(payloads)} fields, {stored_bytes} bytes as {raw_bytes} bytes '
+                     f'(transfer {transfer_seconds:.4f}s, decompression {decompression_seconds:.4f}s)')
+
+        values_by_key = {}
+        position = 0
+        for key, fields in requests.items():
+            values_by_key[key] = values[position:position + len(fields)]
+            position += len(fields)
+        return values_by_key
+
+    def delete(self, *keys):
+        """
+        Delete keys from the cache.
+
+        Returns:
+        - int: Number of keys deleted.
+        """
+
+        return self.redis.delete(*keys) if keys else 0
+
+    def exists(self, *keys):
+        """
+        Returns:
+        - int: Number of the passed keys that exist in the cache.
+        """
+
+        return self.redis.exists(*keys)
+
+    def get_stats(self):
+        """
+        Returns:
+        - dict: Transfer statistics including compression ratio and timings.
+        """
+
+        stats = self.stats.as_dict()
+        stats["compression"] = self.compression
+        stats["compression_threshold"] = self.compression_threshold
+        return stats
+
+
+class FrameCache:
+    """
+    Per-process, size bounded LRU cache of deserialized dataframes, columns and arrays.
+
+    Values are cached under a key together with the version they were read at, and are only
+    served for that version, so a value is never served once its version in redis moved on.
+    Cached values are shared between requests and must not be modified in place by callers.
+    """
+
+    DEFAULT_MAX_BYTES = 512 * 1024 ** 2
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._values = OrderedDict() # key -> (version, value, size)
+        self._lock = threading.Lock()
+        self.bytes_held = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, version):
+        """
+        Returns:
+        - object or None: The cached value for the key and version, None if it is not cached.
+        """
+
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None or entry[0] != version:
+                self.misses += 1
+                return None
+
+            self._values.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, version, value, size=None):
+        """
+        Cache a value for a key and version, replacing older versions of the key and dropping least
+        recently used values until the cache fits its budget. Values larger than the budget are not cached.
+
+        The size of values other than dataframes, series and arrays must be passed (e.g. their pickled size).
+        """
+
+        if size is None:
+            size = value.nbytes if isinstance(value, np.ndarray) else int(np.sum(value.memory_usage(index=True, deep=True)))
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            self._remove(key)
+            self._values[key] = (version, value, size)
+            self.bytes_held += size
+
+            while self.bytes_held > self.max_bytes:
+                _, (_, _, evicted_size) = self._values.popitem(last=False)
+                self.bytes_held -= evicted_size
+                self.evictions += 1
+
+    def invalidate(self, key):
+        """
+        Drop the cached value of a key.
+        """
+
+        with self._lock:
+            self._remove(key)
+
+    def _remove(self, key):
+        """
+        (Private) Drop the cached value of a key, the lock must be held by the caller.
+        """
+
+        entry = self._values.pop(key, None)
+        if entry is not None:
+            self.bytes_held -= entry[2]
+
+    def get_stats(self):
+        """
+        Returns:
+        - dict: Values and bytes held, hits, misses, hit ratio and evictions of this process.
+        """
+
+        with self._lock:
+            return {
+                "values": len(self._values),
+                "bytes_held": self.bytes_held,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / (self.hits + self.misses) if self.hits + self.misses else 0.0,
+                "evictions": self.evictions,
+            }
+
+
+class DatasetCacheManager:
+    """
+    Keeps the cached datasets within a total byte budget.
+
+    A dataset is the pair of original and cleaned dataframes cached under the keys returned by
+    get_dataset_keys. Both are expired and evicted together: every access refreshes the TTL of
+    the dataset and its position in a least recently used order kept in redis, and storing a
+    dataset evicts the least recently used datasets until the bytes held fit the budget again.
+    Bytes held, evictions, hits and misses are shared between workers through redis.
+
+    Frames are stored column by column in row chunks. Each key is a redis hash holding a json
+    `meta` field (columns, dtypes, rows and rows per chunk) and one pickled series per column
+    chunk, so reads only load the requested columns of the requested row window and single
+    columns can be replaced without rewriting the frame. Deserialized chunks are additionally
+    kept in a per-process FrameCache. Every write of a column bumps its version counter in
+    redis, which invalidates the chunks other processes hold for it.
+
+    Data derived from a column (e.g. sort permutations or filter masks) can be stored next to
+    its chunks with the version of the column it was computed from. It is deleted whenever the
+    column is replaced and is only served for the current version of the column.
+
+    Replacing columns writes their chunks under a new generation and keeps the chunks they replace
+    in the hash, with an entry recording the previous generation and dtype of each replaced column
+    in a json `history` field. Undoing or redoing a replacement only swaps the generations referenced
+    by the meta, no chunk is rewritten. The history is bounded to history_length replacements, the
+    chunks of older replacements are deleted. Replacing the whole frame drops its history.
+
+    Updates of the meta and the history are optimistic: they are read while watching a version key
+    of the frame and written in a transaction bumping it, and applied again to the fresh meta if
+    another update was committed in between. Concurrent updates of different columns are merged,
+    an update of columns replaced since they were read raises a DatasetConflictError.
+    """
+
+    LRU_KEY = 'datasets:lru' # Sorted set of dataset ids scored by last access time
+    SIZES_KEY = 'datasets:sizes' # Hash of cache keys to their stored size in bytes
+    STATS_KEY = 'datasets:stats' # Hash of counters i.e. bytes, hits, misses, evictions
+    COUNTER_KEY = 'datasets:counter' # Counter the versions and generations of columns are drawn from, never reset so they stay unique across evictions
+
+    META_FIELD = 'meta'
+    HISTORY_FIELD = 'history'
+
+    # Processing status of a stored frame, kept in its meta
+    STATUS_READY = 'ready'
+    STATUS_PROCESSING = 'processing' # A preview is stored while the full frame is being processed
+    STATUS_FAILED = 'failed'
+
+    DEFAULT_MAX_BYTES = 2 * 1024 ** 3
+    DEFAULT_TTL = 6 * 60 * 60
+    DEFAULT_CHUNK_ROWS = 64 * 1024
+    DEFAULT_HISTORY_LENGTH = 10
+    DEFAULT_COMMIT_RETRIES = 10
+    DEFAULT_PROCESSING_TIMEOUT = 30 * 60
+
+    def __init__(self, client, max_bytes=DEFAULT_MAX_BYTES, ttl=DEFAULT_TTL, frame_cache=None, chunk_rows=DEFAULT_CHUNK_ROWS, history_length=DEFAULT_HISTORY_LENGTH,
+                 commit_retries=DEFAULT_COMMIT_RETRIES, processing_timeout=DEFAULT_PROCESSING_TIMEOUT):
+        self.client = client
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.frame_cache = frame_cache if frame_cache is not None else FrameCache()
+        self.chunk_rows = chunk_rows
+        self.history_length = history_length
+        self.commit_retries = commit_retries
+        self.processing_timeout = processing_timeout
+
+    @classmethod
+    def from_settings(cls, client, cache_settings):
+        """
+        Create a dataset cache manager from a settings dictionary (see DATASET_CACHE in the project settings).
+        """
+
+        return cls(
+            client,
+            max_bytes=cache_settings.get("MAX_BYTES", cls.DEFAULT_MAX_BYTES),
+            ttl=cache_settings.get("TTL", cls.DEFAULT_TTL),
+            frame_cache=FrameCache(cache_settings.get("LOCAL_MAX_BYTES", FrameCache.DEFAULT_MAX_BYTES)),
+            chunk_rows=cache_settings.get("CHUNK_ROWS", cls.DEFAULT_CHUNK_ROWS),
+            history_length=cache_settings.get("HISTORY_LENGTH", cls.DEFAULT_HISTORY_LENGTH),
+            commit_retries=cache_settings.get("COMMIT_RETRIES", cls.DEFAULT_COMMIT_RETRIES),
+            processing_timeout=cache_settings.get("PROCESSING_TIMEOUT", cls.DEFAULT_PROCESSING_TIMEOUT),
+        )
+
+    @property
+    def redis(self):
+        return self.client.redis
+
+    @staticmethod
+    def get_chunk_field(position, chunk, generation=0):
+        """
+        Returns:
+        - str: Hash field holding a chunk of a generation of the column at a position.
+        """
+
+        return f'c:{position}:{chunk}' if not generation else f'c:{position}:{chunk}:{generation}'
+
+    @staticmethod
+    def get_version_key(key):
+        """
+        Returns:
+        - str: Key holding the version of the frame stored under a dataset key, watched by the updates of its meta.
+        """
+
+        return f'{key}:version'
+
+    @staticmethod
+    def get_generation(meta, position):
+        """
+        Returns:
+        - int: Generation of the chunks of the column at a position of a stored frame, 0 until the column is replaced.
+        """
+
+        return meta.get("generations", {}).get(str(position), 0)
+
+    @staticmethod
+    def get_version_field(position):
+        """
+        Returns:
+        - str: Hash field holding the version of the column at a position, deleted with the frame.
+        """
+
+        return f'v:{position}'
+
+    @staticmethod
+    def get_derived_field(position, name):
+        """
+        Returns:
+        - str: Hash field holding data derived from the column at a position.
+        """
+
+        return f'd:{position}:{name}'
+
+    @staticmethod
+    def get_chunks_count(meta):
+        """
+        Returns:
+        - int: Number of row chunks of a stored frame, at least one so that empty frames keep their dtypes.
+        """
+
+        return max(1, -(-meta["rows"] // meta["chunk_rows"]))
+
+    def _get_version_fields(self, positions):
+        return [self.get_version_field(position) for position in positions]
+
+    def _touch(self, dataset_ids, counters=None):
+        """
+        (Private) Refresh the TTL and the last access time of datasets, incrementing stats counters in the same round trip.
+        """
+
+        pipeline = self.redis.pipeline(transaction=False)
+        self._queue_touch(pipeline, dataset_ids, counters)
+        pipeline.execute()
+
+    def _queue_touch(self, pipeline, dataset_ids, counters=None):
+        """
+        (Private) Queue the commands of _touch on a (sync or asyncio) redis pipeline.
+        """
+
+        now = time.time()
+        for dataset_id in dataset_ids:
+            for key in get_dataset_keys(dataset_id):
+                pipeline.expire(key, self.ttl)
+            pipeline.zadd(self.LRU_KEY, {dataset_id: now})
+        for counter, increment in (counters or {}).items():
+            pipeline.hincrby(self.STATS_KEY, counter, increment)
+
+    def _evict(self, dataset_id):
+        """
+        (Private) Remove a dataset and its accounting from the cache.
+
+        Returns:
+        - int: Number of bytes released.
+        """
+
+        keys = get_dataset_keys(dataset_id)
+        sizes = self.redis.hmget(self.SIZES_KEY, keys)
+        released_bytes = sum(int(size) for size in sizes if size is not None)
+
+        pipeline = self.redis.pipeline(transaction=False)
+        pipeline.delete(*keys, *[self.get_version_key(key) for key in keys])
+        pipeline.hdel(self.SIZES_KEY, *keys)
+        pipeline.zrem(self.LRU_KEY, dataset_id)
+        pipeline.hincrby(self.STATS_KEY, "bytes", -released_bytes)
+        pipeline.execute()
+        return released_bytes
+
+    def _release_expired(self):
+        """
+        (Private) Release the accounting of datasets expired through their TTL. The TTL is refreshed whenever
+        the last access time is, so only datasets not accessed for longer than the TTL can have expired.
+        """
+
+        candidates = self.redis.zrangebyscore(self.LRU_KEY, '-inf', time.time() - self.ttl)
+        for candidate in candidates:
+            dataset_id = candidate.decode()
+            if not self.redis.exists(*get_dataset_keys(dataset_id)):
+                released_bytes = self._evict(dataset_id)
+                logger.debug(f'DatasetCacheManager : _release_expired : Released {released_bytes} bytes of expired dataset "{dataset_id}"')
+
+    def _enforce_budget(self, protected_dataset_id=None):
+        """
+        (Private) Evict least recently used datasets until the bytes held are within the budget.
+        The dataset that was just written is never evicted.
+        """
+
+        self._release_expired()
+        while self.get_bytes_held() > self.max_bytes:
+            candidates = self.redis.zrange(self.LRU_KEY, 0, 1)
+            candidates = [candidate.decode() for candidate in candidates if candidate.decode() != protected_dataset_id]
+            if not candidates:
+                break
+
+            # Datasets expired in the meantime only have their accounting released
+            expired = not self.redis.exists(*get_dataset_keys(candidates[0]))
+            released_bytes = self._evict(candidates[0])
+            if not expired:
+                self.redis.hincrby(self.STATS_KEY, "evictions", 1)
+            logger.debug(f'DatasetCacheManager : _enforce_budget : Evicted dataset "{candidates[0]}" releasing {released_bytes} bytes')
+
+    def _write_fields(self, mapping, replace):
+        """
+        (Private) Write hash fields of dataset keys, keeping the byte accounting, the TTL and the
+        last access time of their datasets up to date and enforcing the budget.
+
+        Args:
+        - mapping (dict): Mapping of dataset keys to dicts of hash fields and bytes values.
+        - replace (bool): If True, the hashes are replaced as a whole.
+        """
+
+        # Sizes of the data being overwritten, to account for the difference only
+        pipeline = self.redis.pipeline(transaction=False)
+        for key, fields in mapping.items():
+            pipeline.hget(self.SIZES_KEY, key)
+            if not replace:
+                for field in fields:
+                    pipeline.hstrlen(key, field)
+        results = iter(pipeline.execute())
+
+        previous_sizes = {}
+        replaced_sizes = {}
+        for key, fields in mapping.items():
+            previous_sizes[key] = int(next(results) or 0)
+            replaced_sizes[key] = previous_sizes[key] if replace else sum(int(next(results) or 0) for _ in fields)
+
+        stored_sizes = self.client.hset_many(mapping, ex=self.ttl, replace=replace)
+
+        new_sizes = {key: previous_sizes[key] - replaced_sizes[key] + sum(stored_sizes[key].values()) for key in mapping}
+        size_delta = sum(new_sizes[key] - previous_sizes[key] for key in mapping)
+
+        pipeline = self.redis.pipeline(transaction=False)
+        pipeline.hset(self.SIZES_KEY, mapping=new_sizes)
+        pipeline.hincrby(self.STATS_KEY, "bytes", size_delta)
+        pipeline.execute()
+
+        dataset_ids = {get_dataset_id(key) for key in mapping}
+        dataset_ids.discard(None)
+        self._touch(dataset_ids)
+        for dataset_id in dataset_ids:
+            self._enforce_budget(protected_dataset_id=dataset_id)
+
+    def _delete_fields(self, key, fields):
+        """
+        (Private) Delete hash fields of a dataset key, keeping the byte accounting up to date.
+        """
+
+        if not fields:
+            return
+
+        pipeline = self.redis.pipeline(transaction=False)
+        for field in fields:
+            pipeline.hstrlen(key, field)
+        released_bytes = sum(int(size or 0) for size in pipeline.execute())
+
+        pipeline = self.redis.pipeline(transaction=False)
+        pipeline.hdel(key, *fields)
+        pipeline.hincrby(self.SIZES_KEY, key, -released_bytes)
+        pipeline.hincrby(self.STATS_KEY, "bytes", -released_bytes)
+        pipeline.execute()
+
+    def _bump_versions(self, key, positions):
+        """
+        (Private) Assign new versions to columns of a key, drawn from the global counter so that a version
+        is never reused by a frame stored again under the key after being evicted.
+
+        Returns:
+        - list: New versions of the columns, in the order of the positions.
+        """
+
+        if not positions:
+            return []
+
+        last_version = self.redis.incrby(self.COUNTER_KEY, len(positions))
+        versions = list(range(last_version - len(positions) + 1, last_version + 1))
+
+        pipeline = self.redis.pipeline(transaction=False)
+        pipeline.hset(key, mapping=dict(zip(self._get_version_fields(positions), versions)))
+        pipeline.expire(key, self.ttl)
+        pipeline.execute()
+        return versions
+
+    def _split_column(self, column, chunk_rows):
+        """
+        (Private) Split a column into row chunks.
+
+        Returns:
+        - list: Chunks of the column, at least one.
+        """
+
+        return [column.iloc[start:start + chunk_rows] for start in range(0, max(len(column), 1), chunk_rows)]
+
+    def _serialize_chunks(self, chunks, generation=0):
+        """
+        (Private) Pickle the chunks of columns.
+
+        Args:
+        - chunks (dict): Mapping of column positions to the chunks of the columns (see _split_column).
+        - generation (int): Generation the chunks are stored under.
+
+        Returns:
+        - dict: Mapping of hash fields to the pickled chunks.
+        """
+
+        fields = {}
+        with span('cache.serialize'):
+            for position, column_chunks in chunks.items():
+                for chunk, column_chunk in enumerate(column_chunks):
+                    fields[self.get_chunk_field(position, chunk, generation)] = pickle.dumps(column_chunk, protocol=pickle.HIGHEST_PROTOCOL)
+        return fields
+
+    def _keep_local_chunks(self, key, chunks, versions, generation=0):
+        """
+        (Private) Keep written chunks in the local cache with the new versions of their columns.
+        """
+
+        for (position, column_chunks), version in zip(chunks.items(), versions):
+            for chunk, column_chunk in enumerate(column_chunks):
+                self.frame_cache.put((key, self.get_chunk_field(position, chunk, generation)), version, column_chunk)
+
+    def _write_columns(self, key, meta, columns):
+        """
+        (Private) Replace the frame stored under a key with a meta and the chunks of its columns.
+
+        Args:
+        - key (str): Dataset key.
+        - meta (dict): Meta of the frame.
+        - columns (dict): Mapping of column positions to columns (pd.Series) to store.
+        """
+
+        chunks = {position: self._split_column(column, meta["chunk_rows"]) for position, column in columns.items()}
+        fields = {self.META_FIELD: json.dumps(meta, default=str).encode(), **self._serialize_chunks(chunks)}
+
+        with span('cache.write'):
+            self._write_fields({key: fields}, replace=True)
+        self._keep_local_chunks(key, chunks, self._bump_versions(key, list(chunks)))
+
+    def _commit(self, key, update):
+        """
+        (Private) Update the meta and the history of a stored frame with optimistic concurrency control.
+
+        The meta and the history are read while watching the version key of the frame and written in a transaction
+        incrementing the version, which aborts if another update was committed in between. The update is then applied
+        again to the fresh meta and history.
+
+        Args:
+        - key (str): Dataset key.
+        - update (callable): Called with the meta and the history of the frame (see _get_history), updates them in place
+          and returns a result. Nothing is written if it returns None.
+
+        Returns:
+        - tuple: Meta of the frame after the update and the result of the update.
+
+        Raises:
+        - KeyError: If the frame does not exist.
+        - DatasetConflictError: If the update was aborted by concurrent updates commit_retries times.
+        """
+
+        version_key = self.get_version_key(key)
+        for attempt in range(self.commit_retries):
+            with self.redis.pipeline(transaction=True) as pipeline:
+                try:
+                    pipeline.watch(version_key)
+                    fields = [self.META_FIELD, self.HISTORY_FIELD]
+                    meta, history = self.client._decode_many(pipeline.hmget(key, fields))[0]
+                    if meta is None:
+                        raise KeyError(f'Data not found for key "{key}"')
+                    previous_bytes = sum(int(pipeline.hstrlen(key, field)) for field in fields)
+
+                    meta = json.loads(meta)
+                    history = json.loads(history) if history is not None else {"undo": [], "redo": []}
+                    result = update(meta, history)
+                    if result is None:
+                        return meta, None
+
+                    meta["version"] = meta.get("version", 0) + 1
+                    encoded, raw_bytes, stored_bytes, compression_seconds = self.client._encode_many({
+                        self.META_FIELD: json.dumps(meta, default=str).encode(),
+                        self.HISTORY_FIELD: json.dumps(history).encode(),
+                    })
+
+                    pipeline.multi()
+                    pipeline.hset(key, mapping=encoded)
+                    pipeline.set(version_key, meta["version"], ex=self.ttl)
+                    pipeline.hincrby(self.SIZES_KEY, key, stored_bytes - previous_bytes)
+                    pipeline.hincrby(self.STATS_KEY, "bytes", stored_bytes - previous_bytes)
+                    pipeline.execute()
+                    self.client.stats.record_set(len(encoded), raw_bytes, stored_bytes, compression_seconds, 0)
+                    return meta, result
+                except redis.WatchError:
+                    logger.debug(f'DatasetCacheManager : _commit : Key "{key}" was updated concurrently, retrying (attempt {attempt + 1})')
+
+        raise DatasetConflictError(f'Data of key "{key}" kept being updated concurrently')
+
+    def _invalidate_columns(self, key, positions):
+        """
+        (Private) Drop the data derived from replaced columns of a key and bump their versions.
+
+        Returns:
+        - list: New versions of the columns, in the order of the positions.
+        """
+
+        prefixes = tuple(self.get_derived_field(position, '') for position in positions)
+        self._delete_fields(key, [field.decode() for field in self.redis.hkeys(key) if field.decode().startswith(prefixes)])
+        return self._bump_versions(key, positions)
+
+    def set_frames(self, mapping, status=STATUS_READY):
+        """
+        Store dataframes under dataset keys, replacing whatever is stored under them.
+
+        Args:
+        - mapping (dict): Mapping of dataset keys to dataframes. The frames must not be modified afterwards.
+        - status (str): Processing status of the frames, one of the STATUS_* constants.
+        """
+
+        for key, df in mapping.items():
+            meta = {
+                "columns": list(df.columns),
+                "dtypes": [str(dtype) for dtype in df.dtypes],
+                "rows": len(df),
+                "chunk_rows": self.chunk_rows,
+                "status": status,
+                "version": 0,
+            }
+            if status == self.STATUS_PROCESSING:
+                meta["processing_since"] = time.time()
+            self._write_columns(key, meta, {position: df.iloc[:, position] for position in range(len(df.columns))})
+            # Aborting the updates of the replaced frame being committed
+            self.redis.set(self.get_version_key(key), 0, ex=self.ttl)
+
+    def set_frame(self, key, df, status=STATUS_READY):
+        self.set_frames({key: df}, status=status)
+
+    def set_status(self, key, status, error=None):
+        """
+        Update the processing status of a stored frame, leaving its columns untouched.
+
+        Args:
+        - key (str): Dataset key.
+        - status (str): One of the STATUS_* constants.
+        - error (str): Reason of a failure, included in the meta.
+
+        Raises:
+        - KeyError: If the frame does not exist.
+        """
+
+        def update_status(meta, history):
+            meta["status"] = status
+            meta.pop("error", None)
+            meta.pop("processing_since", None)
+            if status == self.STATUS_PROCESSING:
+                meta["processing_since"] = time.time()
+            if error is not None:
+                meta["error"] = error
+            return True
+
+        self._commit(key, update_status)
+
+    def get_status(self, meta):
+        """
+        Returns:
+        - str: Processing status of a stored frame, frames stored without a status are ready. Frames processing for longer
+          than the processing timeout are failed, their processing was lost (e.g. the worker process restarted).
+        """
+
+        status = meta.get("status", self.STATUS_READY)
+        if status == self.STATUS_PROCESSING and time.time() - meta.get("processing_since", time.time()) > self.processing_timeout:
+            return self.STATUS_FAILED
+        return status
+
+    def set_columns(self, key, columns, base_meta=None):
+        """
+        Replace some columns of a stored frame, leaving the other columns untouched. The replaced columns
+        are kept as an entry of the history of the frame, the replacement can be undone with undo.
+
+        Columns replaced concurrently by other updates are merged, unless they are the same columns.
+
+        Args:
+        - key (str): Dataset key.
+        - columns (dict): Mapping of column names to columns (pd.Series) with the same rows as the stored frame.
+        - base_meta (dict): Meta of the stored frame the columns were computed from, the columns must not have been
+          replaced since. The current meta if None.
+
+        Returns:
+        - dict: Meta of the stored frame with the dtypes of the replaced columns (see get_meta).
+
+        Raises:
+        - KeyError: If the frame or one of the columns does not exist.
+        - DatasetConflictError: If one of the columns was replaced since the base meta was read.
+        """
+
+        meta = base_meta if base_meta is not None else self.get_meta(key)
+        if meta is None:
+            raise KeyError(f'Data not found for key "{key}"')
+
+        _, positions = self._get_positions(meta, list(columns))
+        columns = dict(zip(positions, columns.values()))
+        base_generations = {position: self.get_generation(meta, position) for position in columns}
+
+        # Writing the chunks under a new generation, they are only read once the meta referencing them is committed
+        generation = self.redis.incr(self.COUNTER_KEY)
+        chunks = {position: self._split_column(column, meta["chunk_rows"]) for position, column in columns.items()}
+        fields = self._serialize_chunks(chunks, generation)
+        with span('cache.write'):
+            self._write_fields({key: fields}, replace=False)
+
+        def replace_columns(meta, history):
+            # The entry records the generations and dtypes the columns replace
+            entry = {}
+            for position, column in columns.items():
+                if self.get_generation(meta, position) != base_generations[position]:
+                    raise DatasetConflictError(f'Column "{meta["columns"][position]}" was updated concurrently')
+                entry[str(position)] = [base_generations[position], meta["dtypes"][position]]
+                meta["dtypes"][position] = str(column.dtype)
+                meta.setdefault("generations", {})[str(position)] = generation
+
+            # A replacement can't be redone once other columns were written, and only the latest replacements are kept
+            undo_entries = history["undo"] + [entry]
+            dropped_count = max(len(undo_entries) - self.history_length, 0)
+            dropped_entries = history["redo"] + undo_entries[:dropped_count]
+            history["undo"] = undo_entries[dropped_count:]
+            history["redo"] = []
+            return dropped_entries
+
+        try:
+            meta, dropped_entries = self._commit(key, replace_columns)
+        except (KeyError, DatasetConflictError):
+            self._delete_fields(key, list(fields))
+            raise
+
+        self._delete_fields(key, self._get_entries_fields(meta, dropped_entries))
+        self._keep_local_chunks(key, chunks, self._invalidate_columns(key, list(chunks)), generation)
+        return meta
+
+    def _get_history(self, key):
+        """
+        (Private) Returns:
+        - dict: Entries of the replacements of columns of a stored frame that can be undone (`undo`, oldest first)
+          and redone (`redo`, latest undone last). Each entry maps column positions to the generation and dtype they replaced.
+        """
+
+        history = self.client.hget_many({key: [self.HISTORY_FIELD]})[key][0]
+        return json.loads(history) if history is not None else {"undo": [], "redo": []}
+
+    def _get_entries_fields(self, meta, entries):
+        """
+        (Private) Returns:
+        - list: Hash fields of the chunks of the generations referenced by history entries.
+        """
+
+        chunks_count = self.get_chunks_count(meta)
+        return [self.get_chunk_field(int(position), chunk, generation)
+                for entry in entries for position, (generation, _) in entry.items() for chunk in range(chunks_count)]
+
+    def _swap_history(self, key, source, target):
+        """
+        (Private) Restore the columns of the latest entry of one side of the history of a stored frame, recording the
+        columns they replace as an entry of the other side. Only the meta and the history are written.
+
+        Returns:
+        - dict or None: Meta of the stored frame, None if there is nothing to restore.
+        """
+
+        def restore_columns(meta, history):
+            if not history[source]:
+                return None
+
+            entry = history[source].pop()
+            swapped_entry = {}
+            for position, (generation, dtype) in entry.items():
+                swapped_entry[position] = [self.get_generation(meta, int(position)), meta["dtypes"][int(position)]]
+                meta.setdefault("generations", {})[position] = generation
+                meta["dtypes"][int(position)] = dtype
+            history[target].append(swapped_entry)
+            return entry
+
+        meta, entry = self._commit(key, restore_columns)
+        if entry is None:
+            return None
+
+        self._invalidate_columns(key, [int(position) for position in entry])
+        return meta
+
+    def undo(self, key):
+        """
+        Undo the latest replacement of columns of a stored frame (see set_columns), restoring the columns it replaced.
+
+        Returns:
+        - dict or None: Meta of the stored frame, None if there is nothing to undo.
+
+        Raises:
+        - KeyError: If the frame does not exist.
+        - DatasetConflictError: If the frame kept being updated concurrently.
+        """
+
+        return self._swap_history(key, "undo", "redo")
+
+    def redo(self, key):
+        """
+        Redo the latest undone replacement of columns of a stored frame.
+
+        Returns:
+        - dict or None: Meta of the stored frame, None if there is nothing to redo.
+
+        Raises:
+        - KeyError: If the frame does not exist.
+        - DatasetConflictError: If the frame kept being updated concurrently.
+        """
+
+        return self._swap_history(key, "redo", "undo")
+
+    def get_history(self, key):
+        """
+        Returns:
+        - dict: Numbers of replacements of columns of a stored frame that can be undone (`undo`) and redone (`redo`).
+        """
+
+        history = self._get_history(key)
+        return {"undo": len(history["undo"]), "redo": len(history["redo"])}
+
+    def get_meta(self, key):
+        """
+        Returns:
+        - dict or None: Meta of the frame stored under a key (columns, dtypes, rows, chunk_rows, status, version), None if it is not cached.
+        """
+
+        meta = self.client.hget_many({key: [self.META_FIELD]})[key][0]
+        return json.loads(meta) if meta is not None else None
+
+    def get_dtypes(self, meta):
+        """
+        Returns:
+        - dict: Mapping of column names to dtypes of a stored frame.
+        """
+
+        return dict(zip(meta["columns"], meta["dtypes"]))
+
+    def _get_positions(self, meta, columns):
+        """
+        (Private) Resolve the names of requested columns to their positions in a stored frame.
+
+        Returns:
+        - tuple: Names and positions of the columns, all columns if columns is None.
+
+        Raises:
+        - KeyError: If one of the columns does not exist.
+        """
+
+        col_names = meta["columns"] if columns is None else columns
+        for col_name in col_names:
+            if col_name not in meta["columns"]:
+                raise KeyError(f'Column "{col_name}" does not exist in the dataset')
+        return col_names, [meta["columns"].index(col_name) for col_name in col_names]
+
+    def _get_chunks(self, key, meta, positions, chunk_ids, keep_local=True):
+        """
+        (Private) Fetch row chunks of columns of a stored frame. Chunks whose current version is held in
+        the local frame cache are served from memory, the rest are fetched from redis and deserialized, and
+        kept in the local frame cache if keep_local is True.
+
+        Returns:
+        - dict or None: Mapping of chunk fields to chunks (pd.Series), None if the frame was evicted or expired while being read.
+        """
+
+        versions = {}
+        if positions:
+            versions = self._parse_versions(positions, self.redis.hmget(key, self._get_version_fields(positions)))
+
+        # Serving chunks from the local cache, fetching the rest from redis
+        chunks, missing_fields = self._get_local_chunks(key, meta, positions, chunk_ids, versions)
+        if missing_fields:
+            values = self.client.hget_many({key: missing_fields})[key]
+            if not self._add_fetched_chunks(key, chunks, missing_fields, values, versions, keep_local):
+                self.redis.hincrby(self.STATS_KEY, "misses", 1)
+                return None # Evicted or expired while being read
+
+        dataset_id = get_dataset_id(key)
+        self._touch([dataset_id] if dataset_id is not None else [], counters={"hits": 1})
+        return chunks
+
+    def _parse_versions(self, positions, stored_versions):
+        return {position: int(version or 0) for position, version in zip(positions, stored_versions)}
+
+    def _get_local_chunks(self, key, meta, positions, chunk_ids, versions):
+        """
+        (Private) Look chunks up in the local frame cache.
+
+        Returns:
+        - tuple: Mapping of chunk fields to the chunks found (None for the others) and the list of fields not found.
+        """
+
+        chunks = {}
+        missing_fields = []
+        for position in positions:
+            generation = self.get_generation(meta, position)
+            for chunk in chunk_ids:
+                field = self.get_chunk_field(position, chunk, generation)
+                chunks[field] = self.frame_cache.get((key, field), versions[position])
+                if chunks[field] is None:
+                    missing_fields.append(field)
+        return chunks, missing_fields
+
+    def _add_fetched_chunks(self, key, chunks, fields, values, versions, keep_local=True):
+        """
+        (Private) Deserialize chunks fetched from redis into a mapping of chunks, keeping them in the local frame cache if keep_local is True.
+
+        Returns:
+        - bool: False if one of the chunks is missing in redis.
+        """
+
+        if any(value is None for value in values):
+            return False
+
+        for field, value in zip(fields, values):
+            chunks[field] = pickle.loads(value)
+            if keep_local:
+                self.frame_cache.put((key, field), versions[int(field.split(':')[1])], chunks[field])
+        return True
+
+    def _get_window_chunk_ids(self, meta, start, stop):
+        """
+        (Private) Clamp a window of rows to a stored frame.
+
+        Returns:
+        - tuple: Start and stop of the clamped window and the ids of the chunks holding it.
+        """
+
+        rows, chunk_rows = meta["rows"], meta["chunk_rows"]
+        stop = rows if stop is None else min(stop, rows)
+        start = min(max(start, 0), stop)
+        first_chunk = min(start // chunk_rows, self.get_chunks_count(meta) - 1)
+        last_chunk = max(first_chunk, (stop - 1) // chunk_rows)
+        return start, stop, range(first_chunk, last_chunk + 1)
+
+    def _assemble_window(self, chunks, meta, col_names, positions, start, stop, chunk_ids):
+        """
+        (Private) Assemble a window of rows from the chunks of each column.
+        """
+
+        offset = chunk_ids[0] * meta["chunk_rows"]
+        window_columns = []
+        for position in positions:
+            generation = self.get_generation(meta, position)
+            column_chunks = [chunks[self.get_chunk_field(position, chunk, generation)] for chunk in chunk_ids]
+            column = column_chunks[0] if len(column_chunks) == 1 else pd.concat(column_chunks)
+            window_columns.append(column.iloc[start - offset:stop - offset])
+
+        if not window_columns:
+            return pd.DataFrame(index=pd.RangeIndex(start, stop))
+
+        df = pd.concat(window_columns, axis=1, copy=False)
+        df.columns = col_names
+        return df
+
+    def _get_rows_chunk_ids(self, meta, rows):
+        """
+        (Private) Validate positions of rows of a stored frame.
+
+        Returns:
+        - tuple: Positions of the rows (np.ndarray) and the sorted ids of the chunks holding them.
+
+        Raises:
+        - IndexError: If one of the rows does not exist.
+        """
+
+        rows = np.asarray(rows, dtype=np.int64)
+        if len(rows) and (rows.min() < 0 or rows.max() >= meta["rows"]):
+            raise IndexError('Row positions are out of bounds')
+        return rows, np.unique(rows // meta["chunk_rows"]).tolist() if len(rows) else [0]
+
+    def _assemble_rows(self, chunks, meta, col_names, positions, rows, chunk_ids):
+        """
+        (Private) Assemble rows from the chunks of each column, in the order of the rows.
+        """
+
+        # Positions of the rows within the concatenated chunks, only the last chunk of a frame can be partial
+        chunk_rows = meta["chunk_rows"]
+        local_rows = np.searchsorted(chunk_ids, rows // chunk_rows) * chunk_rows + rows % chunk_rows
+
+        selected_columns = []
+        for position in positions:
+            generation = self.get_generation(meta, position)
+            column_chunks = [chunks[self.get_chunk_field(position, chunk, generation)] for chunk in chunk_ids]
+            column = column_chunks[0] if len(column_chunks) == 1 else pd.concat(column_chunks)
+            selected_columns.append(column.iloc[local_rows])
+
+        if not selected_columns:
+            return pd.DataFrame(index=pd.Index(rows))
+
+        df = pd.concat(selected_columns, axis=1, copy=False)
+        df.columns = col_names
+        return df
+
+    def get_columns(self, key, columns=None, start=0, stop=None, meta=None, keep_local=True):
+        """
+        Fetch some columns and a window of rows of a stored frame. Only the chunks holding the window are loaded.
+
+        Args:
+        - key (str): Dataset key.
+        - columns (list): Names of the columns to fetch, all columns if None.
+        - start (int): First row of the window.
+        - stop (int): Row after the last row of the window, the end of the frame if None.
+        - meta (dict): Meta of the stored frame if it was already fetched.
+        - keep_local (bool): If False, chunks fetched from redis are not kept in the local frame cache (e.g. for full scans).
+
+        Returns:
+        - pd.DataFrame or None: The requested window, None if the frame is not cached.
+
+        Raises:
+        - KeyError: If one of the columns does not exist.
+        """
+
+        meta = meta if meta is not None else self.get_meta(key)
+        if meta is None:
+            self.redis.hincrby(self.STATS_KEY, "misses", 1)
+            return None
+
+        col_names, positions = self._get_positions(meta, columns)
+        start, stop, chunk_ids = self._get_window_chunk_ids(meta, start, stop)
+
+        chunks = self._get_chunks(key, meta, positions, chunk_ids, keep_local)
+        if chunks is None:
+            return None
+        return self._assemble_window(chunks, meta, col_names, positions, start, stop, chunk_ids)
+
+    def get_rows(self, key, rows, columns=None, meta=None):
+        """
+        Fetch some columns of arbitrary rows of a stored frame (e.g. a page of a sorted or filtered view).
+        Only the chunks holding the requested rows are loaded.
+
+        Args:
+        - key (str): Dataset key.
+        - rows (np.ndarray): Positions of the rows to fetch, in the order they are returned.
+        - columns (list): Names of the columns to fetch, all columns if None.
+        - meta (dict): Meta of the stored frame if it was already fetched.
+
+        Returns:
+        - pd.DataFrame or None: The requested rows indexed by their positions, None if the frame is not cached.
+
+        Raises:
+        - KeyError: If one of the columns does not exist.
+        - IndexError: If one of the rows does not exist.
+        """
+
+        meta = meta if meta is not None else self.get_meta(key)
+        if meta is None:
+            self.redis.hincrby(self.STATS_KEY, "misses", 1)
+            return None
+
+        col_names, positions = self._get_positions(meta, columns)
+        rows, chunk_ids = self._get_rows_chunk_ids(meta, rows)
+
+        chunks = self._get_chunks(key, meta, positions, chunk_ids)
+        if chunks is None:
+            return None
+        return self._assemble_rows(chunks, meta, col_names, positions, rows, chunk_ids)
+
+    def get_column_version(self, key, col_name, meta):
+        """
+        Returns:
+        - int: Current version of a column of a stored frame.
+
+        Raises:
+        - KeyError: If the column does not exist.
+        """
+
+        _, positions = self._get_positions(meta, [col_name])
+        return int(self.redis.hget(key, self.get_version_field(positions[0])) or 0)
+
+    def get_column_data(self, key, col_name, name, version, meta):
+        """
+        Fetch data derived from a column, from the local frame cache or from redis.
+
+        Args:
+        - key (str): Dataset key.
+        - col_name (str): Name of the column the data was derived from.
+        - name (str): Name of the derived data.
+        - version (int): Current version of the column (see get_column_version).
+        - meta (dict): Meta of the stored frame.
+
+        Returns:
+        - object or None: The derived data, None if it is not stored for the version of the column.
+        """
+
+        _, positions = self._get_positions(meta, [col_name])
+        field = self.get_derived_field(positions[0], name)
+
+        value = self.frame_cache.get((key, field), version)
+        if value is not None:
+            return value
+
+        payload = self.client.hget_many({key: [field]})[key][0]
+        if payload is None:
+            return None
+
+        stored_version, value = pickle.loads(payload)
+        if stored_version != version:
+            return None
+
+        self.frame_cache.put((key, field), version, value, size=len(payload))
+        return value
+
+    def set_column_data(self, key, col_name, name, version, value, meta):
+        """
+        Store data derived from a column next to its chunks. The data is deleted when the column is replaced.
+
+        Args:
+        - key (str): Dataset key.
+        - col_name (str): Name of the column the data was derived from.
+        - name (str): Name of the derived data.
+        - version (int): Version of the column the data was derived from, read before reading the column.
+        - value (object): Derived data e.g. an array or a dict, picklable.
+        - meta (dict): Meta of the stored frame.
+        """
+
+        _, positions = self._get_positions(meta, [col_name])
+        field = self.get_derived_field(positions[0], name)
+        if not self.redis.exists(key):
+            return # Evicted or expired since the column was read
+
+        payload = pickle.dumps((version, value), protocol=pickle.HIGHEST_PROTOCOL)
+        self._write_fields({key: {field: payload}}, replace=False)
+        self.frame_cache.put((key, field), version, value, size=len(payload))
+
+    def get_frame(self, key):
+        return self.get_columns(key)
+
+    def get_frames(self, keys):
+        """
+        Returns:
+        - list: Dataframes stored under the keys, None for keys that are not cached. The frames must not be modified in place.
+        """
+
+        return [self.get_frame(key) for key in keys]
+
+    def contains(self, dataset_id):
+        """
+        Returns:
+        - bool: True if both the original and the cleaned dataframes of the dataset are cached.
+        """
+
+        return self.client.exists(*get_dataset_keys(dataset_id)) == 2
+
+    def evict(self, dataset_id):
+        """
+        Remove a dataset from the cache.
+        """
+
+        self._evict(dataset_id)
+
+    def get_bytes_held(self):
+        """
+        Returns:
+        - int: Bytes held by the cached datasets (after compression).
+        """
+
+        return int(self.redis.hget(self.STATS_KEY, "bytes") or 0)
+
+    def get_stats(self):
+        """
+        Returns:
+        - dict: Bytes held, budget, number of datasets, evictions, hits, misses and hit ratio. The accounting of datasets
+          expired through their TTL is released first.
+        """
+
+        self._release_expired()
+        counters = {field.decode(): int(value) for field, value in self.redis.hgetall(self.STATS_KEY).items()}
+        hits = counters.get("hits", 0)
+        misses = counters.get("misses", 0)
+
+        return {
+            "bytes_held": counters.get("bytes", 0),
+            "max_bytes": self.max_bytes,
+            "datasets": self.redis.zcard(self.LRU_KEY),
+            "evictions": counters.get("evictions", 0),
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": hits / (hits + misses) if hits + misses else 0.0,
+            "ttl": self.ttl,
+            "local": self.frame_cache.get_stats(),
+        }
+
+
+class AsyncCacheClient:
+    """
+    Asyncio counterpart of the read operations of a CacheClient, used by async views so that they
+    don't block the event loop on redis I/O. Payloads are decoded with the codec settings of the
+    CacheClient and transfers are recorded in its statistics.
+
+    Asyncio connections can't be shared between event loops, so a redis client is created per loop.
+    """
+
+    def __init__(self, client, host='localhost', port=6379, db=0, max_connections=20, socket_timeout=None, redis_factory=None):
+        self.client = client
+        self.redis_factory = redis_factory or (lambda: redis.asyncio.Redis(
+            host=host, port=port, db=db, max_connections=max_connections, socket_timeout=socket_timeout))
+        self._clients = weakref.WeakKeyDictionary() # event loop -> redis client
+
+    @classmethod
+    def from_settings(cls, client, cache_settings):
+        """
+        Create an async cache client from a settings dictionary (see DATASET_CACHE in the project settings).
+        """
+
+        return cls(
+            client,
+            host=cache_settings.get("HOST", 'localhost'),
+            port=cache_settings.get("PORT", 6379),
+            db=cache_settings.get("DB", 0),
+            max_connections=cache_settings.get("MAX_CONNECTIONS", 20),
+            socket_timeout=cache_settings.get("SOCKET_TIMEOUT"),
+        )
+
+    @property
+    def redis(self):
+        """
+        Returns:
+        - redis.asyncio.Redis: Redis client of the running event loop.
+        """
+
+        loop = asyncio.get_running_loop()
+        if loop not in self._clients:
+            self._clients[loop] = self.redis_factory()
+        return self._clients[loop]
+
+    async def hget_many(self, requests):
+        """
+        Fetch fields of multiple redis hashes in a single pipelined round trip (see CacheClient.hget_many).
+        """
+
+        requests = {key: list(fields) for key, fields in requests.items() if fields}
+
+        start = time.perf_counter()
+        pipeline = self.redis.pipeline(transaction=False)
+        for key, fields in requests.items():
+            pipeline.hmget(key, fields)
+        results = await pipeline.execute()
+        transfer_seconds = time.perf_counter() - start
+
+        payloads = [payload for result in results for payload in result]
+        values, raw_bytes, stored_bytes, decompression_seconds = self.client._decode_many(payloads)
+        self.client.stats.record_get(len(payloads), raw_bytes, stored_bytes, decompression_seconds, transfer_seconds)
+
+        values_by_key = {}
+        position = 0
+        for key, fields in requests.items():
+            values_by_key[key] = values[position:position + len(fields)]
+            position += len(fields)
+        return values_by_key
+
+
+class AsyncDatasetReader:
+    """
+    Reads frames stored by a DatasetCacheManager with an AsyncCacheClient, sharing the local frame
+    cache, the accounting and the layout of the manager. Writes go through the manager.
+    """
+
+    def __init__(self, manager, client):
+        self.manager = manager
+        self.client = client
+
+    async def get_meta(self, key):
+        """
+        Returns:
+        - dict or None: Meta of the frame stored under a key, None if it is not cached (see DatasetCacheManager.get_meta).
+        """
+
+        meta = (await self.client.hget_many({key: [self.manager.META_FIELD]}))[key][0]
+        return json.loads(meta) if meta is not None else None
+
+    async def _count_miss(self):
+        await self.client.redis.hincrby(self.manager.STATS_KEY, "misses", 1)
+
+    async def _get_chunks(self, key, meta, positions, chunk_ids):
+        """
+        (Private) Fetch row chunks of columns of a stored frame (see DatasetCacheManager._get_chunks).
+        """
+
+        versions = {}
+        if positions:
+            stored_versions = await self.client.redis.hmget(key, self.manager._get_version_fields(positions))
+            versions = self.manager._parse_versions(positions, stored_versions)
+
+        chunks, missing_fields = self.manager._get_local_chunks(key, meta, positions, chunk_ids, versions)
+        if missing_fields:
+            values = (await self.client.hget_many({key: missing_fields}))[key]
+            if not self.manager._add_fetched_chunks(key, chunks, missing_fields, values, versions):
+                await self._count_miss()
+                return None # Evicted or expired while being read
+
+        dataset_id = get_dataset_id(key)
+        pipeline = self.client.redis.pipeline(transaction=False)
+        self.manager._queue_touch(pipeline, [dataset_id] if dataset_id is not None else [], counters={"hits": 1})
+        await pipeline.execute()
+        return chunks
+
+    async def get_columns(self, key, columns=None, start=0, stop=None, meta=None):
+        """
+        Fetch some columns and a window of rows of a stored frame (see DatasetCacheManager.get_columns).
+        """
+
+        meta = meta if meta is not None else await self.get_meta(key)
+        if meta is None:
+            await self._count_miss()
+            return None
+
+        col_names, positions = self.manager._get_positions(meta, columns)
+        start, stop, chunk_ids = self.manager._get_window_chunk_ids(meta, start, stop)
+
+        chunks = await self._get_chunks(key, meta, positions, chunk_ids)
+        if chunks is None:
+            return None
+        return self.manager._assemble_window(chunks, meta, col_names, positions, start, stop, chunk_ids)
+
+    async def get_rows(self, key, rows, columns=None, meta=None):
+        """
+        Fetch some columns of arbitrary rows of a stored frame (see DatasetCacheManager.get_rows).
+        """
+
+        meta = meta if meta is not None else await self.get_meta(key)
+        if meta is None:
+            await self._count_miss()
+            return None
+
+        col_names, positions = self.manager._get_positions(meta, columns)
+        rows, chunk_ids = self.manager._get_rows_chunk_ids(meta, rows)
+
+        chunks = await self._get_chunks(key, meta, positions, chunk_ids)
+        if chunks is None:
+            return None
+        return self.manager._assemble_rows(chunks, meta, col_names, positions, rows, chunk_ids)
+
+    async def get_frames(self, keys):
+        """
+        Returns:
+        - list: Dataframes stored under the keys, None for keys that are not cached, fetched concurrently.
+        """
+
+        return list(await asyncio.gather(*(self.get_columns(key) for key in keys)))
@@ -0,0 +1,170 @@
+import io
+import pandas as pd
+
+# pyarrow is optional, only CSV exports are available when it is not installed
+try:
+    import pyarrow
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+
+class ExportFormats:
+    """
+    Constants representing the file formats cleaned datasets can be exported to.
+    """
+    CSV = 'csv'
+    PARQUET = 'parquet'
+    ARROW = 'arrow' # Arrow IPC stream format
+
+
+class DatasetEvictedError(Exception):
+    """
+    Raised when a dataset is evicted or expires while it is being exported.
+    """
+
+
+def iter_frame_chunks(dataset_cache, key, meta, columns=None):
+    """
+    Iterate over a stored frame chunk by chunk, so that only a single chunk of rows is held in memory.
+    The chunks are not kept in the local frame cache of the dataset cache.
+
+    Args:
+    - dataset_cache (DatasetCacheManager): Dataset cache holding the frame.
+    - key (str): Dataset key.
+    - meta (dict): Meta of the stored frame.
+    - columns (list): Names of the columns to export, all columns if None.
+
+    Yields:
+    - pd.DataFrame: Consecutive row chunks of the frame, at least one so that empty frames keep their columns.
+
+    Raises:
+    - DatasetEvictedError: If the frame is evicted or expires while being read.
+    """
+
+    chunk_rows = meta["chunk_rows"]
+    for chunk in range(dataset_cache.get_chunks_count(meta)):
+        df_chunk = dataset_cache.get_columns(key, columns, start=chunk * chunk_rows, stop=(chunk + 1) * chunk_rows, meta=meta, keep_local=False)
+        if df_chunk is None:
+            raise DatasetEvictedError(f'Data evicted while being exported for key "{key}"')
+        yield df_chunk
+
+
+def stream_csv(df_chunks):
+    """
+    Yields:
+    - bytes: CSV encoded chunks, the header is written with the first chunk.
+    """
+
+    for position, df_chunk in enumerate(df_chunks):
+        yield df_chunk.to_csv(index=False, header=position == 0).encode()
+
+
+class _StreamSink(io.RawIOBase):
+    """
+    (Private) Writable file object buffering the bytes written by pyarrow writers until they are drained.
+    """
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._buffer += data
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def drain(self):
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        return data
+
+
+def _to_arrow_compatible(df_chunk):
+    """
+    (Private) Convert the columns arrow has no type for: complex numbers and objects (possibly mixing types) become strings.
+    Other dtypes chosen by the convertor (sized integers and floats, booleans, categories, datetimes, timedeltas) are kept.
+    """
+
+    df_chunk = df_chunk.copy(deep=False)
+    for col_name in df_chunk.columns:
+        column = df_chunk[col_name]
+        if pd.api.types.is_complex_dtype(column.dtype) or pd.api.types.is_object_dtype(column.dtype):
+            df_chunk[col_name] = column.astype(str).where(column.notna(), None).astype(object)
+    return df_chunk
+
+
+def _get_arrow_schema(df_chunk):
+    """
+    (Private) Get the schema of the exported table from its first chunk, strings for the converted object columns
+    so that chunks with only missing values in a column share the schema.
+    """
+
+    schema = pyarrow.Schema.from_pandas(df_chunk, preserve_index=False)
+    for position, col_name in enumerate(df_chunk.columns):
+        if pd.api.types.is_object_dtype(df_chunk[col_name].dtype):
+            schema = schema.set(position, pyarrow.field(str(col_name), pyarrow.string()))
+    return schema
+
+
+def _stream_arrow_tables(df_chunks, create_writer):
+    """
+    (Private) Write chunks as arrow tables with a writer created from the schema of the first chunk, yielding the written bytes.
+    """
+
+    sink = _StreamSink()
+    writer = None
+    schema = None
+    for df_chunk in df_chunks:
+        df_chunk = _to_arrow_compatible(df_chunk)
+        if writer is None:
+            schema = _get_arrow_schema(df_chunk)
+            writer = create_writer(sink, schema)
+        writer.write_table(pyarrow.Table.from_pandas(df_chunk, schema=schema, preserve_index=False))
+        yield sink.drain()
+
+    if writer is not None:
+        writer.close()
+    yield sink.drain()
+
+
+def stream_parquet(df_chunks):
+    """
+    Yields:
+    - bytes: Parquet file, one row group per chunk.
+    """
+
+    return _stream_arrow_tables(df_chunks, lambda sink, schema: pyarrow.parquet.ParquetWriter(sink, schema))
+
+
+def stream_arrow(df_chunks):
+    """
+    Yields:
+    - bytes: Arrow IPC stream, one record batch per chunk.
+    """
+
+    return _stream_arrow_tables(df_chunks, lambda sink, schema: pyarrow.ipc.new_stream(sink, schema))
+
+
+# Export formats mapped to their content type, file extension, writer and whether they require pyarrow
+EXPORT_FORMATS = {
+    ExportFormats.CSV: ('text/csv', '.csv', stream_csv, False),
+    ExportFormats.PARQUET: ('application/vnd.apache.parquet', '.parquet', stream_parquet, True),
+    ExportFormats.ARROW: ('application/vnd.apache.arrow.stream', '.arrows', stream_arrow, True),
+}
+
+
+def get_available_formats():
+    """
+    Returns:
+    - list: Export formats available with the installed packages.
+    """
+
+    return [export_format for export_format, (_, _, _, requires_pyarrow) in EXPORT_FORMATS.items() if pyarrow is not None or not requires_pyarrow]
@@ -0,0 +1,272 @@
+import bisect
+import logging
+import math
+import threading
+import time
+from asgiref.sync import iscoroutinefunction
+from django.utils.decorators import sync_and_async_middleware
+
+logger = logging.getLogger("django")
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Buckets of the histograms, in seconds, bytes and rows per second
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+REDIS_LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+SIZE_BUCKETS = (1e3, 1e4, 1e5, 1e6, 1e7, 1e8, 1e9)
+THROUGHPUT_BUCKETS = (1e3, 1e4, 5e4, 1e5, 5e5, 1e6, 5e6, 1e7)
+
+
+def _format_value(value):
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    return repr(float(value))
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for value in labels.values())
+    return '{' + ','.join(f'{name}="{value}"' for name, value in zip(labels, escaped)) + '}'
+
+
+class Metric:
+    """
+    Base of the metrics held by a MetricsRegistry, each labelled series is kept under the tuple of its label values.
+    """
+
+    type_name = 'untyped'
+
+    def __init__(self, name, documentation, label_names=()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._lock = threading.Lock()
+        self._series = {}
+
+    def _get_label_values(self, labels):
+        if set(labels) != set(self.label_names):
+            raise ValueError(f'Metric "{self.name}" expects the labels {list(self.label_names)}, received {list(labels)}')
+        return tuple(str(labels[label_name]) for label_name in self.label_names)
+
+    def samples(self):
+        """
+        Returns:
+        - list: Samples of the metric as tuples of the sample name, the labels (dict) and the value.
+        """
+
+        raise NotImplementedError
+
+
+class Counter(Metric):
+    """
+    Monotonically increasing count, e.g. of processed rows.
+    """
+
+    type_name = 'counter'
+
+    def inc(self, amount=1, **labels):
+        label_values = self._get_label_values(labels)
+        with self._lock:
+            self._series[label_values] = self._series.get(label_values, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            return [(self.name, dict(zip(self.label_names, label_values)), value) for label_values, value in self._series.items()]
+
+
+class Histogram(Metric):
+    """
+    Distribution of observed values, counted in cumulative buckets along with their sum and count.
+    """
+
+    type_name = 'histogram'
+
+    def __init__(self, name, documentation, label_names=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, label_names)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        label_values = self._get_label_values(labels)
+        position = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                # Counts of the buckets and of the +Inf bucket, then the sum of the observed values
+                series = self._series[label_values] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[position] += 1
+            series[-1] += value
+
+    def samples(self):
+        samples = []
+        with self._lock:
+            series_items = [(label_values, list(series)) for label_values, series in self._series.items()]
+
+        for label_values, series in series_items:
+            labels = dict(zip(self.label_names, label_values))
+            cumulative_count = 0
+            for upper_bound, bucket_count in zip(self.buckets + (math.inf,), series[:-1]):
+                cumulative_count += bucket_count
+                samples.append((f'{self.name}_bucket', {**labels, "le": _format_value(upper_bound)}, cumulative_count))
+            samples.append((f'{self.name}_sum', labels, series[-1]))
+            samples.append((f'{self.name}_count', labels, cumulative_count))
+        return samples
+
+
+class CallbackMetric(Metric):
+    """
+    Metric read from statistics kept elsewhere (e.g. by the cache) when the metrics are collected.
+    """
+
+    def __init__(self, name, documentation, type_name, label_names, callback):
+        """
+        Args:
+        - type_name (str): Prometheus type of the metric i.e. 'counter' or 'gauge'.
+        - callback (callable): Returns a dict mapping tuples of label values to the values of the series.
+        """
+
+        super().__init__(name, documentation, label_names)
+        self.type_name = type_name
+        self.callback = callback
+
+    def samples(self):
+        return [(self.name, dict(zip(self.label_names, label_values)), value) for label_values, value in self.callback().items()]
+
+
+class MetricsRegistry:
+    """
+    In-process registry of metrics rendered in the Prometheus text format.
+
+    Metrics are kept per process, with several worker processes each one exposes its own series
+    (e.g. scraped through each worker or aggregated by the load balancer).
+    """
+
+    def __init__(self):
+        self._metrics = {}
+
+    def register(self, metric):
+        if metric.name in self._metrics:
+            raise ValueError(f'Metric "{metric.name}" is already registered')
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, documentation, label_names=()):
+        return self.register(Counter(name, documentation, label_names))
+
+    def histogram(self, name, documentation, label_names=(), buckets=LATENCY_BUCKETS):
+        return self.register(Histogram(name, documentation, label_names, buckets))
+
+    def render(self):
+        """
+        Returns:
+        - str: All metrics in the Prometheus text exposition format, metrics failing to be collected are left out.
+        """
+
+        lines = []
+        for metric in self._metrics.values():
+            try:
+                samples = metric.samples()
+            except Exception as e:
+                logger.error(f'MetricsRegistry : render : Error collecting metric "{metric.name}": {str(e)}')
+                continue
+            lines.append(f'# HELP {metric.name} {metric.documentation}')
+            lines.append(f'# TYPE {metric.name} {metric.type_name}')
+            for sample_name, labels, value in samples:
+                lines.append(f'{sample_name}{_format_labels(labels)} {_format_value(value)}')
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
+
+REQUEST_LATENCY = registry.histogram('data_cleanser_request_duration_seconds', 'Latency of the requests by view, method and status code.', ('view', 'method', 'status'))
+UPLOAD_SIZE = registry.histogram('data_cleanser_upload_size_bytes', 'Size of the uploaded files by file type.', ('file_type',), SIZE_BUCKETS)
+CLEANED_ROWS = registry.counter('data_cleanser_cleaned_rows_total', 'Rows cleaned (types inferred and converted).')
+CLEANING_LATENCY = registry.histogram('data_cleanser_cleaning_duration_seconds', 'Duration of the cleaning of whole dataframes.')
+CLEANING_THROUGHPUT = registry.histogram('data_cleanser_cleaning_rows_per_second', 'Rows cleaned per second by each cleaning of a whole dataframe.', buckets=THROUGHPUT_BUCKETS)
+INFERRED_DTYPES = registry.counter('data_cleanser_inferred_dtypes_total', 'Columns by inferred data type.', ('dtype',))
+REDIS_LATENCY = registry.histogram('data_cleanser_redis_duration_seconds', 'Latency of the round trips to redis by operation.', ('operation',), REDIS_LATENCY_BUCKETS)
+
+
+def record_cleaning(rows, seconds, inferred_dtypes):
+    """
+    Record the cleaning of a whole dataframe.
+
+    Args:
+    - rows (int): Number of rows cleaned.
+    - seconds (float): Duration of the cleaning.
+    - inferred_dtypes (dict): Mapping of column names to their inferred data types.
+    """
+
+    CLEANED_ROWS.inc(rows)
+    CLEANING_LATENCY.observe(seconds)
+    if seconds > 0:
+        CLEANING_THROUGHPUT.observe(rows / seconds)
+    for dtype in inferred_dtypes.values():
+        INFERRED_DTYPES.inc(dtype=dtype)
+
+
+def register_cache_metrics(cache, dataset_cache, metrics_registry=registry):
+    """
+    Expose the statistics of the cache client (bytes moved to and from redis) and of the dataset cache (hits and
+    misses of the local frame cache, level 1, and of redis, level 2).
+
+    Args:
+    - cache (CacheClient): Cache client of the process.
+    - dataset_cache (DatasetCacheManager): Dataset cache of the process.
+    - metrics_registry (MetricsRegistry): Registry the metrics are added to.
+    """
+
+    def get_transfer_bytes():
+        stats = cache.stats.as_dict()
+        return {
+            ('get', 'raw'): stats["raw_bytes_read"], ('get', 'stored'): stats["stored_bytes_read"],
+            ('set', 'raw'): stats["raw_bytes_written"], ('set', 'stored'): stats["stored_bytes_written"],
+        }
+
+    def get_transfer_values():
+        stats = cache.stats.as_dict()
+        return {('get',): stats["get_count"], ('set',): stats["set_count"]}
+
+    def get_cache_lookups():
+        local_stats = dataset_cache.frame_cache.get_stats()
+        shared_stats = dataset_cache.get_stats()
+        return {
+            ('l1', 'hit'): local_stats["hits"], ('l1', 'miss'): local_stats["misses"],
+            ('l2', 'hit'): shared_stats["hits"], ('l2', 'miss'): shared_stats["misses"],
+        }
+
+    def get_hit_ratios():
+        return {(level,): stats["hit_ratio"] for level, stats in (('l1', dataset_cache.frame_cache.get_stats()), ('l2', dataset_cache.get_stats()))}
+
+    metrics_registry.register(CallbackMetric('data_cleanser_redis_bytes_total', 'Bytes moved to (set) and from (get) redis, before (raw) and after (stored) compression.', 'counter', ('operation', 'encoding'), get_transfer_bytes))
+    metrics_registry.register(CallbackMetric('data_cleanser_redis_values_total', 'Values moved to (set) and from (get) redis.', 'counter', ('operation',), get_transfer_values))
+    metrics_registry.register(CallbackMetric('data_cleanser_cache_lookups_total', 'Lookups of the local frame cache (l1) and of the datasets in redis (l2) by result.', 'counter', ('level', 'result'), get_cache_lookups))
+    metrics_registry.register(CallbackMetric('data_cleanser_cache_hit_ratio', 'Hit ratio of the local frame cache (l1) and of the datasets in redis (l2).', 'gauge', ('level',), get_hit_ratios))
+
+
+@sync_and_async_middleware
+def request_metrics_middleware(get_response):
+    """
+    Middleware recording the latency of the requests by view (name of the matched url pattern), method and status code.
+    The latency of streamed responses (e.g. exports) is the time until the response starts.
+    """
+
+    def record_request(request, response, start):
+        resolver_match = getattr(request, 'resolver_match', None)
+        view_name = resolver_match.url_name if resolver_match is not None and resolver_match.url_name else 'unmatched'
+        REQUEST_LATENCY.observe(time.perf_counter() - start, view=view_name, method=request.method, status=response.status_code)
+
+    if iscoroutinefunction(get_response):
+        async def middleware(request):
+            start = time.perf_counter()
+            response = await get_response(request)
+            record_request(request, response, start)
+            return response
+    else:
+        def middleware(request):
+            start = time.perf_counter()
+            response = get_response(request)
+            record_request(request, response, start)
+            return response
+
+    return middleware
@@ -0,0 +1,122 @@
+from django.core.paginator import InvalidPage
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import PageNumberPagination
+
+
+class DataFrameRows:
+    """
+    Sequence view over the rows of a dataframe held in memory.
+    """
+
+    def __init__(self, df):
+        self.df = df
+
+    def __len__(self):
+        return len(self.df)
+
+    def __getitem__(self, index):
+        return self.df.iloc[index]
+
+
+class DatasetRows:
+    """
+    Sequence view over the rows of a cached dataset. Slicing it only fetches the requested
+    columns of the requested row window from the dataset cache.
+
+    When the positions of the rows of a sorted or filtered view are passed (see DatasetQuery),
+    the sequence follows them and slicing only fetches the rows of the slice.
+    """
+
+    def __init__(self, dataset_cache, key, meta, columns=None, row_order=None):
+        self.dataset_cache = dataset_cache
+        self.key = key
+        self.meta = meta
+        self.columns = columns
+        self.row_order = row_order
+
+    def __len__(self):
+        return self.meta["rows"] if self.row_order is None else len(self.row_order)
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice) or index.step not in (None, 1):
+            raise TypeError('Dataset rows can only be sliced with a step of 1')
+
+        if self.row_order is not None:
+            return self.dataset_cache.get_rows(self.key, self.row_order[index], self.columns, meta=self.meta)
+        return self.dataset_cache.get_columns(self.key, self.columns, start=index.start or 0, stop=index.stop, meta=self.meta)
+
+
+class CustomPagination(PageNumberPagination):
+    page_size = 10  # Default number of items per page
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
+    offset_query_param = 'offset'
+
+    def paginate_rows(self, rows, request):
+        """
+        Paginate a sequence of rows (DataFrameRows or DatasetRows).
+
+        Pages are selected by page number (`page`) unless a row offset (`offset`) is passed, in which
+        case the rows starting at the offset are returned and the offset of the following rows is kept
+        as a cursor. The number of rows per page can be set with `page_size`, up to `max_page_size`.
+
+        Returns:
+        - pd.DataFrame: Rows of the requested page.
+
+        Raises:
+        - ValidationError: If the offset is not a non-negative integer.
+        - NotFound: If the page number is invalid.
+        """
+
+        start, stop = self.get_page_bounds(len(rows), request)
+        return rows[start:stop]
+
+    def get_page_bounds(self, rows_count, request):
+        """
+        Select the rows of the requested page without fetching them (see paginate_rows).
+
+        Returns:
+        - tuple: Start and stop positions of the rows of the page.
+
+        Raises:
+        - ValidationError: If the offset is not a non-negative integer.
+        - NotFound: If the page number is invalid.
+        """
+
+        self.request = request
+        page_size = self.get_page_size(request)
+        self.rows_count = rows_count
+
+        offset = request.query_params.get(self.offset_query_param)
+        if offset is not None:
+            try:
+                self.offset = int(offset)
+                if self.offset < 0:
+                    raise ValueError()
+            except ValueError:
+                raise ValidationError({self.offset_query_param: 'Offset must be a non-negative integer.'})
+
+            self.next_offset = self.offset + page_size if self.offset + page_size < self.rows_count else None
+            self.page = None
+            return self.offset, self.offset + page_size
+
+        # Paginating the row positions, the rows themselves are only sliced once the page is known
+        paginator = self.django_paginator_class(range(rows_count), page_size)
+        page_number = self.get_page_number(request, paginator)
+
+        try:
+            self.page = paginator.page(page_number)
+        except InvalidPage as exc:
+            raise NotFound(self.invalid_page_message.format(page_number=page_number, message=str(exc)))
+
+        return self.page.object_list.start, self.page.object_list.stop
+
+    def get_pagination_info(self):
+        """
+        Returns:
+        - dict: Total number of rows and the position of the returned rows, to be included in responses.
+        """
+
+        if self.page is None:
+            return {"count": self.rows_count, "offset": self.offset, "next_offset": self.next_offset}
+        return {"count": self.rows_count, "page": self.page.number, "num_pages": self.page.paginator.num_pages}
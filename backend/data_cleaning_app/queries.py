@@ -0,0 +1,262 @@
+import hashlib
+import operator
+import re
+import numpy as np
+import pandas as pd
+
+COMPARISON_OPERATORS = {
+    'eq': operator.eq,
+    'ne': operator.ne,
+    'gt': operator.gt,
+    'gte': operator.ge,
+    'lt': operator.lt,
+    'lte': operator.le,
+}
+NULL_OPERATORS = ('isnull', 'notnull')
+FILTER_OPERATORS = tuple(COMPARISON_OPERATORS) + ('contains',) + NULL_OPERATORS
+
+_FILTER_PATTERN = re.compile(r'^(?P<column>.+?):(?P<operator>' + '|'.join(FILTER_OPERATORS) + r')(?::(?P<operand>.*))?$', re.DOTALL)
+_TRUE_VALUES = ('true', '1', 'yes')
+_FALSE_VALUES = ('false', '0', 'no')
+
+
+def parse_sort(value):
+    """
+    Parse a sort expression, the name of a column optionally prefixed with '-' for a descending order e.g. '-age'.
+
+    Returns:
+    - tuple: Name of the column and True if the order is ascending.
+
+    Raises:
+    - ValueError: If the expression is empty.
+    """
+
+    value = value.strip()
+    ascending = not value.startswith('-')
+    col_name = value if ascending else value[1:]
+    if not col_name:
+        raise ValueError('Sort expression must be a column name, optionally prefixed with "-"')
+    return col_name, ascending
+
+
+def parse_filter(value):
+    """
+    Parse a filter expression of the form '<column>:<operator>:<operand>' e.g. 'age:gte:18' or 'email:isnull'.
+
+    Returns:
+    - tuple: Name of the column, the operator and the operand (None for isnull and notnull).
+
+    Raises:
+    - ValueError: If the expression is malformed.
+    """
+
+    match = _FILTER_PATTERN.match(value)
+    if match is None:
+        raise ValueError(f'Filter must be of the form "<column>:<operator>:<value>" with an operator in {list(FILTER_OPERATORS)}')
+
+    col_name, filter_operator, operand = match.group('column', 'operator', 'operand')
+    if filter_operator in NULL_OPERATORS:
+        if operand:
+            raise ValueError(f'Operator "{filter_operator}" does not take a value')
+        return col_name, filter_operator, None
+
+    if operand is None:
+        raise ValueError(f'Operator "{filter_operator}" requires a value')
+    return col_name, filter_operator, operand
+
+
+def _get_index_dtype(rows):
+    return np.int32 if rows < 2 ** 31 else np.int64
+
+
+def compute_sort_permutation(column, ascending=True):
+    """
+    Compute the permutation sorting a column, stable and with missing values last in both orders.
+    Object columns mixing incomparable types are ordered by the string form of their values.
+
+    Args:
+    - column (pd.Series): Column to sort.
+    - ascending (bool): Order of the sort.
+
+    Returns:
+    - np.ndarray: Positions of the rows in sorted order.
+    """
+
+    values = column.reset_index(drop=True)
+    try:
+        ordered = values.sort_values(ascending=ascending, kind='stable', na_position='last')
+    except TypeError:
+        ordered = values.astype(str).where(values.notna()).sort_values(ascending=ascending, kind='stable', na_position='last')
+    return ordered.index.to_numpy(dtype=_get_index_dtype(len(values)))
+
+
+def _get_comparable(column, operand):
+    """
+    (Private) Convert a filter operand to the type of a column.
+
+    Returns:
+    - tuple: Values of the column and the operand to compare them with.
+
+    Raises:
+    - ValueError: If the operand can't be converted to the type of the column.
+    """
+
+    dtype = column.dtype
+
+    if pd.api.types.is_bool_dtype(dtype):
+        if operand.lower() in _TRUE_VALUES:
+            return column, True
+        if operand.lower() in _FALSE_VALUES:
+            return column, False
+        raise ValueError(f'"{operand}" is not a boolean value')
+
+    if pd.api.types.is_complex_dtype(dtype):
+        return column, complex(operand.replace(' ', ''))
+
+    if pd.api.types.is_numeric_dtype(dtype):
+        return column, pd.to_numeric(operand)
+
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        timestamp = pd.Timestamp(operand)
+        tz = getattr(dtype, 'tz', None)
+        if tz is not None and timestamp.tzinfo is None:
+            timestamp = timestamp.tz_localize(tz)
+        elif tz is None and timestamp.tzinfo is not None:
+            timestamp = timestamp.tz_convert(None)
+        return column, timestamp
+
+    if pd.api.types.is_timedelta64_dtype(dtype):
+        return column, pd.Timedelta(operand)
+
+    # Categories and objects are compared by their string form
+    return column.astype(str), operand
+
+
+def compute_filter_mask(column, filter_operator, operand=None):
+    """
+    Compute the rows of a column matching a predicate. Missing values only match 'isnull'.
+
+    Args:
+    - column (pd.Series): Column to filter.
+    - filter_operator (str): One of FILTER_OPERATORS.
+    - operand (str): Value to compare with, converted to the type of the column.
+
+    Returns:
+    - np.ndarray: Boolean mask of the matching rows.
+
+    Raises:
+    - ValueError: If the operand can't be converted or the operator is not supported for the type of the column.
+    """
+
+    missing = column.isna().to_numpy()
+    if filter_operator == 'isnull':
+        return missing
+    if filter_operator == 'notnull':
+        return ~missing
+
+    if filter_operator == 'contains':
+        matches = column.astype(str).str.contains(operand, case=False, regex=False)
+        return matches.to_numpy(dtype=bool, na_value=False) & ~missing
+
+    if filter_operator not in COMPARISON_OPERATORS:
+        raise ValueError(f'Unknown filter operator "{filter_operator}"')
+
+    values, operand = _get_comparable(column, operand)
+    try:
+        matches = COMPARISON_OPERATORS[filter_operator](values, operand)
+    except TypeError:
+        raise ValueError(f'Operator "{filter_operator}" is not supported for columns of type {column.dtype}')
+    return matches.to_numpy(dtype=bool, na_value=False) & ~missing
+
+
+class DatasetQuery:
+    """
+    Sorted and filtered views over a frame stored in the dataset cache.
+
+    Sort permutations and filter masks (packed as bitmaps) are computed once per version of their
+    column and stored next to the dataset, so repeated queries only combine the cached arrays and
+    take the rows of the requested page. They are dropped when their column is replaced.
+    """
+
+    def __init__(self, dataset_cache, key, meta):
+        self.dataset_cache = dataset_cache
+        self.key = key
+        self.meta = meta
+
+    def _get_column_data(self, col_name, name, compute):
+        """
+        (Private) Fetch data derived from a column, computing and storing it if it is not cached.
+
+        Returns:
+        - np.ndarray or None: The derived data, None if the dataset is not cached.
+        """
+
+        version = self.dataset_cache.get_column_version(self.key, col_name, self.meta)
+        value = self.dataset_cache.get_column_data(self.key, col_name, name, version, self.meta)
+        if value is not None:
+            return value
+
+        df = self.dataset_cache.get_columns(self.key, [col_name], meta=self.meta)
+        if df is None:
+            return None
+
+        value = compute(df.iloc[:, 0])
+        self.dataset_cache.set_column_data(self.key, col_name, name, version, value, self.meta)
+        return value
+
+    def get_sort_permutation(self, col_name, ascending=True):
+        """
+        Returns:
+        - np.ndarray or None: Positions of the rows sorted by a column, None if the dataset is not cached.
+        """
+
+        name = 'sort:asc' if ascending else 'sort:desc'
+        return self._get_column_data(col_name, name, lambda column: compute_sort_permutation(column, ascending))
+
+    def get_filter_mask(self, col_name, filter_operator, operand=None):
+        """
+        Returns:
+        - np.ndarray or None: Boolean mask of the rows matching a predicate on a column, None if the dataset is not cached.
+
+        Raises:
+        - ValueError: If the predicate is not valid for the column (see compute_filter_mask).
+        """
+
+        name = f'mask:{filter_operator}'
+        if operand is not None:
+            name += ':' + hashlib.blake2b(operand.encode(), digest_size=16).hexdigest()
+
+        packed_mask = self._get_column_data(col_name, name, lambda column: np.packbits(compute_filter_mask(column, filter_operator, operand)))
+        if packed_mask is None:
+            return None
+        return np.unpackbits(packed_mask, count=self.meta["rows"]).astype(bool)
+
+    def get_row_order(self, sort=None, filters=()):
+        """
+        Compute the rows of a sorted and filtered view of the frame.
+
+        Args:
+        - sort (tuple): Name of the column to sort by and True for an ascending order, unsorted if None.
+        - filters (list): Tuples of column name, operator and operand, all of which rows must match.
+
+        Returns:
+        - np.ndarray or None: Positions of the rows of the view in order, None if the dataset is not cached.
+
+        Raises:
+        - ValueError: If one of the filters is not valid for its column.
+        """
+
+        mask = None
+        for col_name, filter_operator, operand in filters:
+            column_mask = self.get_filter_mask(col_name, filter_operator, operand)
+            if column_mask is None:
+                return None
+            mask = column_mask if mask is None else mask & column_mask
+
+        if sort is None:
+            return np.flatnonzero(mask) if mask is not None else np.arange(self.meta["rows"])
+
+        order = self.get_sort_permutation(*sort)
+        if order is None:
+            return None
+        return order[mask[order]] if mask is not None else order
@@ -0,0 +1,119 @@
+import datetime
+import decimal
+import numpy as np
+import pandas as pd
+from rest_framework.renderers import JSONRenderer
+
+# orjson is listed in the requirements, responses are rendered with the default DRF json encoder when it is not installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _encode_default(value):
+    """
+    (Private) Encode values the json encoders don't support natively, used for values within object columns.
+    """
+
+    if value is pd.NaT:
+        return None
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, (pd.Timedelta, datetime.timedelta)):
+        return str(value.total_seconds()) # As the DRF json encoder does
+    if isinstance(value, complex):
+        return str(value)
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, decimal.Decimal):
+        return float(value)
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    raise TypeError(f'Type is not JSON serializable: {type(value).__name__}')
+
+
+def _with_missing_as_none(values, missing_mask):
+    """
+    (Private) Convert an array to a list of python values, replacing missing entries with None.
+    """
+
+    if not missing_mask.any():
+        return values.tolist()
+    encoded = values.astype(object)
+    encoded[missing_mask] = None
+    return encoded.tolist()
+
+
+def encode_column(column):
+    """
+    Encode a column into a list of json compatible python values, vectorized per dtype.
+
+    - Numeric and boolean values are converted from the column array, missing values become None.
+    - Datetimes are encoded as ISO 8601 strings, timedeltas as strings of their total seconds (e.g. '5400.0') like
+      the DRF json encoder does.
+    - Categoricals encode their categories once and take them by code.
+    - Complex numbers are encoded as strings e.g. '(3+4j)'.
+
+    Args:
+    - column (pd.Series): Column to encode, typically the slice of a page.
+
+    Returns:
+    - list: Encoded values of the column.
+    """
+
+    dtype = column.dtype
+    missing_mask = column.isna().to_numpy()
+
+    if isinstance(dtype, pd.CategoricalDtype):
+        categories = np.array(encode_column(pd.Series(dtype.categories)) + [None], dtype=object)
+        return categories[column.cat.codes.to_numpy()].tolist() # code -1 (missing) takes the trailing None
+
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        if getattr(dtype, 'tz', None) is not None:
+            return [None if missing else value.isoformat() for value, missing in zip(column, missing_mask)]
+        values = column.to_numpy(dtype='datetime64[ns]')
+        sub_second = (values[~missing_mask].astype('int64') % 10 ** 9 != 0).any()
+        return _with_missing_as_none(np.datetime_as_string(values, unit='us' if sub_second else 's'), missing_mask)
+
+    if pd.api.types.is_timedelta64_dtype(dtype):
+        return [None if missing else str(seconds) for seconds, missing in zip(column.dt.total_seconds().tolist(), missing_mask)]
+
+    if pd.api.types.is_complex_dtype(dtype):
+        return _with_missing_as_none(column.astype(str).to_numpy(), missing_mask)
+
+    if pd.api.types.is_bool_dtype(dtype) or pd.api.types.is_numeric_dtype(dtype):
+        return _with_missing_as_none(column.to_numpy(dtype=object if pd.api.types.is_extension_array_dtype(dtype) else None), missing_mask)
+
+    return [None if missing else value for value, missing in zip(column.tolist(), missing_mask)]
+
+
+def dataframe_to_records(df):
+    """
+    Encode the rows of a dataframe (e.g. a page slice) as a list of records, column by column.
+
+    Args:
+    - df (pd.DataFrame): Dataframe to encode, only its rows are touched.
+
+    Returns:
+    - list: List of dicts mapping column names to json compatible values.
+    """
+
+    columns = [str(col_name) for col_name in df.columns]
+    encoded_columns = [encode_column(df.iloc[:, position]) for position in range(len(df.columns))]
+    return [dict(zip(columns, row)) for row in zip(*encoded_columns)]
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSON renderer using orjson when it is installed, falling back to the DRF json renderer otherwise.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        if data is None:
+            return b''
+
+        return orjson.dumps(data, default=_encode_default, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
@@ -6,6 +6,10 @@ class DataFileSerializer(serializers.ModelSerializer):
         model = DataFile
         fields = ('file', 'uploaded_on')
 
+class BatchDataFileSerializer(serializers.Serializer):
+    files = serializers.ListField(child=serializers.FileField(), allow_empty=False)
+    uploaded_on = serializers.DateTimeField(required=False)
+
 class DataTypeChangeSerializer(serializers.Serializer):
     dtype_choices = [
         ("object", "Object"),
@@ -1,3 +1,1268 @@
-from django.test import TestCase
+import asyncio
+import io
+import json
+import pickle
+import unittest
+from concurrent.futures import Future, ThreadPoolExecutor
+from unittest import mock
+import numpy as np
+import pandas as pd
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase
+from rest_framework.renderers import JSONRenderer
+from data_cleanser.instrumentation import instrument
+from benchmarks.budgets import check_budget, is_performance_testing_enabled, PERFORMANCE_TESTS_ENV
 
-# Create your tests here.
+from .cache import AsyncCacheClient, AsyncDatasetReader, CacheClient, DatasetCacheManager, DatasetConflictError, FrameCache, CompressionCodecs, compress_payload, decompress_payload, is_codec_available, compute_dataset_id, get_dataset_keys, get_dataset_id, get_sheet_dataset_id
+from . import async_views, views
+from .pagination import DatasetRows
+from .metrics import REQUEST_LATENCY, CallbackMetric, MetricsRegistry, register_cache_metrics
+from .export import DatasetEvictedError, iter_frame_chunks, pyarrow, stream_arrow, stream_csv, stream_parquet
+from .queries import DatasetQuery, compute_filter_mask, compute_sort_permutation, parse_filter, parse_sort
+from .renderers import FastJSONRenderer, dataframe_to_records
+
+# fakeredis is only needed to run the cache tests without a redis server
+try:
+    import fakeredis
+except ImportError:
+    fakeredis = None
+
+
+class SynchronousExecutor:
+    """
+    Executor running the submitted tasks right away, standing in for the executors of background tasks
+    """
+
+    def submit(self, fn, *args, **kwargs):
+        future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+
+class TestCachePayloadEncoding(SimpleTestCase):
+    """
+    Unit tests for the cache payload compression helpers
+    """
+
+    def test_uncompressed_payload_round_trip(self):
+        data = pickle.dumps(pd.DataFrame({'col': range(100)}))
+        self.assertEqual(decompress_payload(compress_payload(data, CompressionCodecs.NONE)), data)
+
+    @unittest.skipUnless(is_codec_available(CompressionCodecs.ZSTD), 'zstandard is not installed')
+    def test_zstd_payload_round_trip(self):
+        data = pickle.dumps(pd.DataFrame({'col': ['value'] * 10000}))
+        payload = compress_payload(data, CompressionCodecs.ZSTD)
+        self.assertLess(len(payload), len(data))
+        self.assertEqual(decompress_payload(payload), data)
+
+    @unittest.skipUnless(is_codec_available(CompressionCodecs.LZ4), 'lz4 is not installed')
+    def test_lz4_payload_round_trip(self):
+        data = pickle.dumps(pd.DataFrame({'col': ['value'] * 10000}))
+        payload = compress_payload(data, CompressionCodecs.LZ4)
+        self.assertLess(len(payload), len(data))
+        self.assertEqual(decompress_payload(payload), data)
+
+    def test_legacy_payload_returned_unchanged(self):
+        # Values written before the payload header was introduced are plain pickles
+        data = pickle.dumps(pd.DataFrame({'col': range(10)}))
+        self.assertEqual(decompress_payload(data), data)
+
+    def test_invalid_codec(self):
+        with self.assertRaises(KeyError):
+            compress_payload(b'data', 'invalid')
+
+
+@unittest.skipIf(fakeredis is None, 'fakeredis is not installed')
+class TestCacheClient(SimpleTestCase):
+    """
+    Unit tests for the pipelined, compressed cache client
+    """
+
+    def setUp(self):
+        self.client = CacheClient(compression=CompressionCodecs.ZSTD, compression_threshold=1024, client=fakeredis.FakeRedis())
+
+    def test_set_many_get_many(self):
+        original = pickle.dumps(pd.DataFrame({'col': ['1', '2', '3'] * 1000}))
+        cleaned = pickle.dumps(pd.DataFrame({'col': [1, 2, 3] * 1000}))
+        self.client.set_many({'original': original, 'cleaned': cleaned})
+        self.assertEqual(self.client.get_many(['original', 'cleaned', 'missing']), [original, cleaned, None])
+
+    def test_small_values_are_not_compressed(self):
+        self.client.set('small', b'abc')
+        self.assertEqual(self.client.redis.get('small'), compress_payload(b'abc', CompressionCodecs.NONE))
+        self.assertEqual(self.client.get('small'), b'abc')
+
+    @unittest.skipUnless(is_codec_available(CompressionCodecs.ZSTD), 'zstandard is not installed')
+    def test_stats_report_compression_ratio(self):
+        self.client.set('large', b'a' * 100000)
+        self.client.get('large')
+        stats = self.client.get_stats()
+        self.assertEqual(stats["set_count"], 1)
+        self.assertEqual(stats["get_count"], 1)
+        self.assertEqual(stats["raw_bytes_written"], 100000)
+        self.assertGreater(stats["compression_ratio"], 10)
+
+
+class TestDatasetKeys(SimpleTestCase):
+    """
+    Unit tests for content addressed dataset keys
+    """
+
+    def test_identical_content_same_id(self):
+        first = SimpleUploadedFile('data.csv', b'a,b\n1,2\n')
+        second = SimpleUploadedFile('other_name.csv', b'a,b\n1,2\n')
+        self.assertEqual(compute_dataset_id(first, inference_threshold=0.5), compute_dataset_id(second, inference_threshold=0.5))
+
+    def test_different_content_different_id(self):
+        first = SimpleUploadedFile('data.csv', b'a,b\n1,2\n')
+        second = SimpleUploadedFile('data.csv', b'a,b\n1,3\n')
+        self.assertNotEqual(compute_dataset_id(first), compute_dataset_id(second))
+
+    def test_different_settings_different_id(self):
+        uploaded_file = SimpleUploadedFile('data.csv', b'a,b\n1,2\n')
+        self.assertNotEqual(compute_dataset_id(uploaded_file, inference_threshold=0.5), compute_dataset_id(uploaded_file, inference_threshold=0.7))
+
+    def test_file_rewound_after_hashing(self):
+        uploaded_file = SimpleUploadedFile('data.csv', b'a,b\n1,2\n')
+        compute_dataset_id(uploaded_file)
+        self.assertEqual(uploaded_file.read(), b'a,b\n1,2\n')
+
+    def test_dataset_keys(self):
+        self.assertEqual(get_dataset_keys('abc'), ('df_abc_original', 'df_abc_cleaned'))
+
+    def test_dataset_id_from_key(self):
+        self.assertEqual(get_dataset_id('df_abc_original'), 'abc')
+        self.assertEqual(get_dataset_id('df_abc_cleaned'), 'abc')
+        self.assertIsNone(get_dataset_id('abc'))
+
+    def test_sheet_dataset_ids(self):
+        self.assertNotEqual(get_sheet_dataset_id('abc', 'first'), get_sheet_dataset_id('abc', 'second'))
+        self.assertNotEqual(get_sheet_dataset_id('abc', 'first'), 'abc')
+        self.assertEqual(len(get_sheet_dataset_id('abc', 'first')), len(compute_dataset_id(SimpleUploadedFile('data.csv', b'a'))))
+
+
+@unittest.skipIf(fakeredis is None, 'fakeredis is not installed')
+class TestDatasetCacheManager(SimpleTestCase):
+    """
+    Unit tests for the memory budgeted dataset cache
+    """
+
+    def setUp(self):
+        client = CacheClient(client=fakeredis.FakeRedis())
+        self.manager = DatasetCacheManager(client, ttl=60)
+
+    def store_dataset(self, dataset_id):
+        original_key, cleaned_key = get_dataset_keys(dataset_id)
+        self.manager.set_frames({original_key: pd.DataFrame({'col': ['1'] * 500}), cleaned_key: pd.DataFrame({'col': [1] * 500})})
+
+    def test_store_and_fetch(self):
+        self.store_dataset('first')
+        self.assertTrue(self.manager.contains('first'))
+        self.assertEqual(self.manager.get_frame(get_dataset_keys('first')[1])['col'].tolist(), [1] * 500)
+        self.assertGreater(self.manager.redis.ttl(get_dataset_keys('first')[0]), 0)
+
+    def test_least_recently_used_dataset_evicted_as_a_whole(self):
+        self.store_dataset('first')
+        self.manager.max_bytes = int(self.manager.get_bytes_held() * 2.5)
+        self.store_dataset('second')
+        self.manager.get_frame(get_dataset_keys('first')[1]) # 'second' becomes the least recently used dataset
+        self.store_dataset('third')
+
+        self.assertTrue(self.manager.contains('first'))
+        self.assertFalse(self.manager.redis.exists(*get_dataset_keys('second')))
+        self.assertTrue(self.manager.contains('third'))
+        self.assertLessEqual(self.manager.get_bytes_held(), self.manager.max_bytes)
+        self.assertEqual(self.manager.get_stats()["evictions"], 1)
+
+    def test_evicted_dataset_leaves_no_keys(self):
+        cleaned_key = get_dataset_keys('first')[1]
+        self.store_dataset('first')
+        self.manager.set_columns(cleaned_key, {'col': pd.Series([1.0] * 500)})
+        version = self.manager.get_column_version(cleaned_key, 'col', self.manager.get_meta(cleaned_key))
+
+        self.manager.evict('first')
+        global_keys = {self.manager.COUNTER_KEY, self.manager.LRU_KEY, self.manager.SIZES_KEY, self.manager.STATS_KEY}
+        self.assertLessEqual({key.decode() for key in self.manager.redis.keys()}, global_keys)
+
+        # Versions are not reused by the dataset stored again after its eviction
+        self.store_dataset('first')
+        self.assertGreater(self.manager.get_column_version(cleaned_key, 'col', self.manager.get_meta(cleaned_key)), version)
+
+    def test_expired_dataset_released(self):
+        self.store_dataset('first')
+        self.store_dataset('second')
+        bytes_held = self.manager.get_bytes_held()
+
+        # Expiring the first dataset as its TTL would, its last access being older than the TTL
+        self.manager.redis.delete(*get_dataset_keys('first'))
+        self.manager.redis.zadd(self.manager.LRU_KEY, {'first': 0})
+
+        stats = self.manager.get_stats()
+        self.assertEqual(stats["datasets"], 1)
+        self.assertLess(stats["bytes_held"], bytes_held)
+        self.assertEqual(stats["evictions"], 0)
+        self.assertIsNone(self.manager.redis.hget(self.manager.SIZES_KEY, get_dataset_keys('first')[0]))
+
+    def test_replacing_a_column_updates_bytes_held(self):
+        self.store_dataset('first')
+        bytes_held = self.manager.get_bytes_held()
+        self.manager.set_columns(get_dataset_keys('first')[0], {'col': pd.Series(['1' * 100] * 500)})
+        self.assertGreater(self.manager.get_bytes_held(), bytes_held)
+
+    def test_hit_ratio(self):
+        self.store_dataset('first')
+        self.manager.get_frame(get_dataset_keys('first')[1])
+        self.manager.get_frame(get_dataset_keys('missing')[1])
+        stats = self.manager.get_stats()
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["hit_ratio"], 0.5)
+
+
+class TestFrameCache(SimpleTestCase):
+    """
+    Unit tests for the per-process cache of deserialized dataframes and columns
+    """
+
+    def test_get_matching_version(self):
+        frame_cache = FrameCache()
+        df = pd.DataFrame({'col': range(10)})
+        frame_cache.put('key', 1, df)
+        self.assertIs(frame_cache.get('key', 1), df)
+        self.assertIsNone(frame_cache.get('key', 2))
+
+    def test_new_version_replaces_old(self):
+        frame_cache = FrameCache()
+        frame_cache.put('key', 1, pd.Series(range(10)))
+        frame_cache.put('key', 2, pd.Series(range(10)))
+        self.assertIsNone(frame_cache.get('key', 1))
+        self.assertEqual(frame_cache.get_stats()["values"], 1)
+
+    def test_size_bound(self):
+        df = pd.DataFrame({'col': range(1000)})
+        size = int(df.memory_usage(index=True, deep=True).sum())
+        frame_cache = FrameCache(max_bytes=int(size * 2.5))
+        for key in ['first', 'second', 'third']:
+            frame_cache.put(key, 1, df)
+        self.assertIsNone(frame_cache.get('first', 1))
+        self.assertIsNotNone(frame_cache.get('third', 1))
+        self.assertLessEqual(frame_cache.bytes_held, frame_cache.max_bytes)
+
+
+@unittest.skipIf(fakeredis is None, 'fakeredis is not installed')
+class TestDatasetCacheManagerFrames(SimpleTestCase):
+    """
+    Unit tests for reading and writing chunked columnar frames through both cache levels
+    """
+
+    def setUp(self):
+        self.server = fakeredis.FakeServer()
+        self.manager = self.create_manager()
+        self.key = get_dataset_keys('first')[1]
+        self.df = pd.DataFrame({
+            'int': range(10),
+            'category': pd.Categorical(['a', 'b'] * 5),
+            'date': pd.date_range('2022-01-01', periods=10),
+        })
+
+    def create_manager(self):
+        # Every manager has its own local cache, standing in for a worker process
+        return DatasetCacheManager(CacheClient(client=fakeredis.FakeRedis(server=self.server)), chunk_rows=4)
+
+    def test_frame_round_trip(self):
+        self.manager.set_frame(self.key, self.df)
+        pd.testing.assert_frame_equal(self.create_manager().get_frame(self.key), self.df)
+
+    def test_writes_instrumented(self):
+        with instrument() as instrumentation:
+            self.manager.set_frame(self.key, self.df)
+        spans = instrumentation.as_dict()["spans"]
+        assert spans["cache.serialize"]["calls"] == 1 and spans["cache.write"]["calls"] == 1
+
+    def test_meta(self):
+        self.manager.set_frame(self.key, self.df)
+        meta = self.manager.get_meta(self.key)
+        self.assertEqual(meta["rows"], 10)
+        self.assertEqual(self.manager.get_dtypes(meta), {'int': 'int64', 'category': 'category', 'date': 'datetime64[ns]'})
+
+    def test_set_columns_returns_meta(self):
+        self.manager.set_frame(self.key, self.df)
+        meta = self.manager.set_columns(self.key, {'int': self.df['int'].astype('float64')})
+        self.assertEqual(meta, self.manager.get_meta(self.key))
+        self.assertEqual(self.manager.get_dtypes(meta)['int'], 'float64')
+
+    def test_projected_columns_and_row_window(self):
+        self.manager.set_frame(self.key, self.df)
+        window = self.create_manager().get_columns(self.key, ['date', 'int'], start=3, stop=9)
+        pd.testing.assert_frame_equal(window, self.df[['date', 'int']].iloc[3:9])
+
+    def test_only_window_chunks_fetched(self):
+        self.manager.set_frame(self.key, self.df)
+        other_manager = self.create_manager()
+        other_manager.get_columns(self.key, ['int'], start=4, stop=6)
+        self.assertEqual(other_manager.client.get_stats()["get_count"], 2) # meta and a single chunk
+
+    def test_empty_window(self):
+        self.manager.set_frame(self.key, self.df)
+        window = self.manager.get_columns(self.key, ['int'], start=20, stop=30)
+        self.assertEqual(len(window), 0)
+        self.assertEqual(list(window.columns), ['int'])
+
+    def test_unknown_column(self):
+        self.manager.set_frame(self.key, self.df)
+        with self.assertRaises(KeyError):
+            self.manager.get_columns(self.key, ['unknown'])
+
+    def test_chunks_served_from_local_cache(self):
+        self.manager.set_frame(self.key, self.df)
+        self.manager.get_frame(self.key)
+        self.assertEqual(self.manager.client.get_stats()["get_count"], 1) # meta only
+        self.assertGreater(self.manager.get_stats()["local"]["hits"], 0)
+
+    def test_set_columns_invalidates_other_processes(self):
+        other_manager = self.create_manager()
+        self.manager.set_frame(self.key, self.df)
+        other_manager.get_frame(self.key)
+
+        self.manager.set_columns(self.key, {'int': self.df['int'].astype('float32')})
+        df = other_manager.get_frame(self.key)
+        self.assertEqual(str(df['int'].dtype), 'float32')
+        pd.testing.assert_series_equal(df['date'], self.df['date'])
+        self.assertEqual(self.manager.get_dtypes(self.manager.get_meta(self.key))['int'], 'float32')
+
+    def test_undo_and_redo_columns(self):
+        other_manager = self.create_manager()
+        self.manager.set_frame(self.key, self.df)
+        self.manager.set_columns(self.key, {'int': self.df['int'].astype('float32')})
+        other_manager.get_frame(self.key)
+
+        meta = self.manager.undo(self.key)
+        self.assertEqual(self.manager.get_dtypes(meta)['int'], 'int64')
+        pd.testing.assert_frame_equal(other_manager.get_frame(self.key), self.df)
+        self.assertEqual(self.manager.get_history(self.key), {"undo": 0, "redo": 1})
+        self.assertIsNone(self.manager.undo(self.key))
+
+        self.manager.redo(self.key)
+        self.assertEqual(str(other_manager.get_frame(self.key)['int'].dtype), 'float32')
+        self.assertIsNone(self.manager.redo(self.key))
+
+    def test_undo_only_writes_meta(self):
+        self.manager.set_frame(self.key, self.df)
+        self.manager.set_columns(self.key, {'int': self.df['int'] * 2})
+        set_count = self.manager.client.get_stats()["set_count"]
+        self.manager.undo(self.key)
+        self.assertEqual(self.manager.client.get_stats()["set_count"] - set_count, 2) # meta and history
+
+    def test_history_bounded(self):
+        self.manager.history_length = 2
+        self.manager.set_frame(self.key, self.df)
+        bytes_held = self.manager.get_bytes_held()
+        for multiplier in range(2, 6):
+            self.manager.set_columns(self.key, {'int': self.df['int'] * multiplier})
+
+        # The chunks of the original column and of the first replacement are deleted
+        self.assertFalse(self.manager.redis.hexists(self.key, self.manager.get_chunk_field(0, 0)))
+        self.assertEqual(self.manager.get_history(self.key), {"undo": 2, "redo": 0})
+        self.manager.undo(self.key)
+        self.manager.undo(self.key)
+        self.assertEqual(self.manager.get_frame(self.key)['int'].tolist(), (self.df['int'] * 3).tolist())
+        self.assertLess(self.manager.get_bytes_held(), bytes_held * 2)
+
+    def test_update_drops_redo(self):
+        self.manager.set_frame(self.key, self.df)
+        self.manager.set_columns(self.key, {'int': self.df['int'] * 2})
+        self.manager.undo(self.key)
+        self.manager.set_columns(self.key, {'date': self.df['date'].astype(str)})
+        self.assertEqual(self.manager.get_history(self.key), {"undo": 1, "redo": 0})
+        self.assertIsNone(self.manager.redo(self.key))
+        self.assertEqual(self.manager.get_frame(self.key)['int'].tolist(), self.df['int'].tolist())
+
+    def test_concurrent_updates_of_different_columns_merged(self):
+        self.manager.set_frame(self.key, self.df)
+        base_meta = self.manager.get_meta(self.key)
+        self.create_manager().set_columns(self.key, {'date': self.df['date'].astype(str)})
+
+        meta = self.manager.set_columns(self.key, {'int': self.df['int'].astype('float64')}, base_meta=base_meta)
+        self.assertEqual(self.manager.get_dtypes(meta), {'int': 'float64', 'category': 'category', 'date': 'object'})
+        self.assertEqual(meta["version"], 2)
+        self.assertEqual(self.manager.get_history(self.key), {"undo": 2, "redo": 0})
+
+    def test_concurrent_update_of_same_column_conflicts(self):
+        self.manager.set_frame(self.key, self.df)
+        base_meta = self.manager.get_meta(self.key)
+        self.create_manager().set_columns(self.key, {'int': self.df['int'] * 2})
+        bytes_held = self.manager.get_bytes_held()
+
+        with self.assertRaises(DatasetConflictError):
+            self.manager.set_columns(self.key, {'int': self.df['int'] * 3}, base_meta=base_meta)
+        # The chunks written for the rejected update are deleted
+        self.assertEqual(self.manager.get_bytes_held(), bytes_held)
+        self.assertEqual(self.create_manager().get_frame(self.key)['int'].tolist(), (self.df['int'] * 2).tolist())
+
+    def test_commit_retried_when_aborted(self):
+        self.manager.set_frame(self.key, self.df)
+        encode_many = self.manager.client._encode_many
+        calls = []
+
+        def encode_many_with_concurrent_update(mapping):
+            # Another process commits an update of another column while the meta is being committed
+            if DatasetCacheManager.META_FIELD in mapping and not calls:
+                calls.append(mapping)
+                self.create_manager().set_columns(self.key, {'date': self.df['date'].astype(str)})
+            return encode_many(mapping)
+
+        with mock.patch.object(self.manager.client, '_encode_many', side_effect=encode_many_with_concurrent_update):
+            meta = self.manager.set_columns(self.key, {'int': self.df['int'].astype('float64')})
+        self.assertEqual(self.manager.get_dtypes(self.manager.get_meta(self.key)), self.manager.get_dtypes(meta))
+        self.assertEqual(self.manager.get_dtypes(meta), {'int': 'float64', 'category': 'category', 'date': 'object'})
+
+    def test_status(self):
+        self.manager.set_frame(self.key, self.df, status=DatasetCacheManager.STATUS_PROCESSING)
+        self.assertEqual(self.manager.get_status(self.manager.get_meta(self.key)), DatasetCacheManager.STATUS_PROCESSING)
+
+        self.manager.set_status(self.key, DatasetCacheManager.STATUS_FAILED, error='Conversion failed')
+        meta = self.manager.get_meta(self.key)
+        self.assertEqual(self.manager.get_status(meta), DatasetCacheManager.STATUS_FAILED)
+        self.assertEqual(meta["error"], 'Conversion failed')
+        pd.testing.assert_frame_equal(self.create_manager().get_frame(self.key), self.df)
+
+        self.manager.set_frame(self.key, self.df)
+        self.assertNotIn("error", self.manager.get_meta(self.key))
+
+    def test_stale_processing_status(self):
+        self.manager.set_frame(self.key, self.df, status=DatasetCacheManager.STATUS_PROCESSING)
+        meta = self.manager.get_meta(self.key)
+
+        # The processing was lost if the frame is still processing after the timeout
+        with mock.patch('data_cleaning_app.cache.time.time', return_value=meta["processing_since"] + self.manager.processing_timeout + 1):
+            self.assertEqual(self.manager.get_status(meta), DatasetCacheManager.STATUS_FAILED)
+        self.assertEqual(self.manager.get_status(meta), DatasetCacheManager.STATUS_PROCESSING)
+
+        self.manager.set_frame(self.key, self.df)
+        self.assertNotIn("processing_since", self.manager.get_meta(self.key))
+
+    def test_missing_frame(self):
+        self.assertIsNone(self.manager.get_frame(self.key))
+        self.assertIsNone(self.manager.get_meta(self.key))
+
+    def test_rows_in_order(self):
+        self.manager.set_frame(self.key, self.df)
+        rows = self.create_manager().get_rows(self.key, np.array([9, 0, 5]), ['int', 'date'])
+        pd.testing.assert_frame_equal(rows, self.df[['int', 'date']].iloc[[9, 0, 5]])
+
+    def test_only_chunks_of_rows_fetched(self):
+        self.manager.set_frame(self.key, self.df)
+        other_manager = self.create_manager()
+        other_manager.get_rows(self.key, np.array([9, 8]), ['int'])
+        self.assertEqual(other_manager.client.get_stats()["get_count"], 2) # meta and a single chunk
+
+    def test_column_data_dropped_when_column_replaced(self):
+        self.manager.set_frame(self.key, self.df)
+        meta = self.manager.get_meta(self.key)
+        for col_name in ('int', 'date'):
+            version = self.manager.get_column_version(self.key, col_name, meta)
+            self.manager.set_column_data(self.key, col_name, 'sort:asc', version, np.arange(10), meta)
+
+        self.manager.set_columns(self.key, {'int': self.df['int'] * 2})
+        other_manager = self.create_manager()
+        for manager in (self.manager, other_manager):
+            int_version = manager.get_column_version(self.key, 'int', meta)
+            date_version = manager.get_column_version(self.key, 'date', meta)
+            self.assertIsNone(manager.get_column_data(self.key, 'int', 'sort:asc', int_version, meta))
+            self.assertIsNotNone(manager.get_column_data(self.key, 'date', 'sort:asc', date_version, meta))
+
+    def test_column_data_shared_between_processes(self):
+        self.manager.set_frame(self.key, self.df)
+        meta = self.manager.get_meta(self.key)
+        version = self.manager.get_column_version(self.key, 'int', meta)
+        self.manager.set_column_data(self.key, 'int', 'profile', version, {'nulls': 0}, meta)
+
+        self.assertEqual(self.create_manager().get_column_data(self.key, 'int', 'profile', version, meta), {'nulls': 0})
+        self.assertIsNone(self.create_manager().get_column_data(self.key, 'int', 'profile', version + 1, meta))
+
+
+@unittest.skipIf(fakeredis is None, 'fakeredis is not installed')
+class TestAsyncDatasetReader(SimpleTestCase):
+    """
+    Unit tests for reading frames with the async redis client
+    """
+
+    def setUp(self):
+        self.server = fakeredis.FakeServer()
+        self.key = get_dataset_keys('first')[1]
+        self.df = pd.DataFrame({'int': range(10), 'text': list('abcdefghij')})
+        DatasetCacheManager(CacheClient(client=fakeredis.FakeRedis(server=self.server)), chunk_rows=4).set_frame(self.key, self.df)
+
+        client = CacheClient(client=fakeredis.FakeRedis(server=self.server))
+        self.manager = DatasetCacheManager(client, chunk_rows=4)
+        self.reader = AsyncDatasetReader(self.manager, AsyncCacheClient(client, redis_factory=lambda: fakeredis.FakeAsyncRedis(server=self.server)))
+
+    def test_columns_window(self):
+        window = asyncio.run(self.reader.get_columns(self.key, ['text'], start=3, stop=7))
+        pd.testing.assert_frame_equal(window, self.df[['text']].iloc[3:7])
+
+    def test_rows(self):
+        rows = asyncio.run(self.reader.get_rows(self.key, np.array([8, 1])))
+        pd.testing.assert_frame_equal(rows, self.df.iloc[[8, 1]])
+
+    def test_chunks_shared_with_manager(self):
+        asyncio.run(self.reader.get_columns(self.key))
+        self.manager.get_frame(self.key)
+        self.assertEqual(self.manager.client.get_stats()["get_count"], 8) # meta and 2 x 3 chunks by the reader, meta only by the manager
+
+    def test_missing_frame(self):
+        self.assertIsNone(asyncio.run(self.reader.get_meta(get_dataset_keys('second')[1])))
+        self.assertEqual(asyncio.run(self.reader.get_frames([get_dataset_keys('second')[1]])), [None])
+
+
+@unittest.skipIf(fakeredis is None, 'fakeredis is not installed')
+class TestAsyncViews(SimpleTestCase):
+    """
+    Unit tests for the async upload, data and update views
+    """
+
+    data = b'amount,name\n1,a\n2,b\n3,c\n4,d\nx,e\n'
+
+    def setUp(self):
+        server = fakeredis.FakeServer()
+        client = CacheClient(client=fakeredis.FakeRedis(server=server))
+        self.manager = DatasetCacheManager(client, chunk_rows=2)
+        async_client = AsyncCacheClient(client, redis_factory=lambda: fakeredis.FakeAsyncRedis(server=server))
+        executor = ThreadPoolExecutor(max_workers=2)
+        self.addCleanup(executor.shutdown)
+        # The worker processes are replaced by threads, the views and the reader share the fake redis server
+        for module, name, value in ((views, 'dataset_cache', self.manager), (async_views, 'dataset_cache', self.manager), (async_views, 'async_cache', async_client),
+                                    (async_views, 'dataset_reader', AsyncDatasetReader(self.manager, async_client)), (async_views, 'cleaning_processes', executor)):
+            patcher = mock.patch.object(module, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    async def upload(self):
+        response = await self.async_client.post('/data_cleanser/async/upload-file/', {"file": SimpleUploadedFile('amounts.csv', self.data), "uploaded_on": '2024-01-01T00:00:00'})
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    async def test_upload_then_cached(self):
+        response = await self.upload()
+        self.assertEqual(response["message"], 'Data uploaded and processed successfully')
+        self.assertEqual(response["dtypes"], {'amount': 'float64', 'name': 'object'})
+        self.assertEqual(self.manager.get_frame(response["cleaned_data_key"])['name'].tolist(), list('abcde'))
+
+        # The same file is served from the cache without being read again
+        with mock.patch.object(async_views.AsyncDataFileUploadView, 'read_dataframe', side_effect=AssertionError('read again')):
+            cached_response = await self.upload()
+        self.assertEqual(cached_response["message"], 'Data already processed, returning cached result')
+        self.assertEqual(cached_response["cleaned_data_key"], response["cleaned_data_key"])
+        self.assertEqual(cached_response["data"], response["data"])
+
+    async def test_offset_paging(self):
+        cleaned_key = (await self.upload())["cleaned_data_key"]
+        response = (await self.async_client.get(f'/data_cleanser/async/data/{cleaned_key}/?offset=1&page_size=3&columns=name')).json()
+        self.assertEqual(response["data"], [{'name': 'b'}, {'name': 'c'}, {'name': 'd'}])
+        self.assertEqual(response["pagination"], {"count": 5, "offset": 1, "next_offset": 4})
+
+        self.assertEqual((await self.async_client.get(f'/data_cleanser/async/data/{cleaned_key}/?offset=-1')).status_code, 400)
+        self.assertEqual((await self.async_client.get(f'/data_cleanser/async/data/{get_dataset_keys("missing")[1]}/')).status_code, 404)
+
+    async def test_update_persisted(self):
+        upload = await self.upload()
+        response = await self.async_client.post('/data_cleanser/async/update-columns-dtypes/', {
+            "dtypes": [{"col_name": 'amount', "dtype": 'object', "missing_values": 'ignore', "default": None}],
+            "invalid_values": 'coerce',
+            "original_data_key": upload["original_data_key"],
+            "cleaned_data_key": upload["cleaned_data_key"],
+        }, content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["dtypes"], {'amount': 'object', 'name': 'object'})
+
+        # Converted from the uploaded values, read back through the async data view
+        data = (await self.async_client.get(f'/data_cleanser/async/data/{upload["cleaned_data_key"]}/?columns=amount')).json()["data"]
+        self.assertEqual([row['amount'] for row in data], ['1', '2', '3', '4', 'x'])
+        self.assertEqual(self.manager.get_dtypes(self.manager.get_meta(upload["cleaned_data_key"]))['amount'], 'object')
+
+
+class TestQueries(SimpleTestCase):
+    """
+    Unit tests for sort and filter expressions, permutations and masks
+    """
+
+    def test_parse_sort(self):
+        self.assertEqual(parse_sort('age'), ('age', True))
+        self.assertEqual(parse_sort('-age'), ('age', False))
+        with self.assertRaises(ValueError):
+            parse_sort('-')
+
+    def test_parse_filter(self):
+        self.assertEqual(parse_filter('age:gte:18'), ('age', 'gte', '18'))
+        self.assertEqual(parse_filter('start:lt:10:30'), ('start', 'lt', '10:30'))
+        self.assertEqual(parse_filter('email:isnull'), ('email', 'isnull', None))
+        for value in ('age', 'age:between:1', 'age:gt', 'age:notnull:1'):
+            with self.assertRaises(ValueError):
+                parse_filter(value)
+
+    def test_sort_permutation_missing_values_last(self):
+        column = pd.Series([3.0, None, 1.0, 2.0])
+        self.assertEqual(compute_sort_permutation(column).tolist(), [2, 3, 0, 1])
+        self.assertEqual(compute_sort_permutation(column, ascending=False).tolist(), [0, 3, 2, 1])
+
+    def test_sort_permutation_mixed_objects(self):
+        column = pd.Series(['b', 1, 'a'], dtype=object)
+        self.assertEqual(compute_sort_permutation(column).tolist(), [1, 2, 0])
+
+    def test_filter_masks(self):
+        column = pd.Series([1, 5, None, 10], dtype='Int64')
+        self.assertEqual(compute_filter_mask(column, 'gte', '5').tolist(), [False, True, False, True])
+        self.assertEqual(compute_filter_mask(column, 'ne', '5').tolist(), [True, False, False, True])
+        self.assertEqual(compute_filter_mask(column, 'isnull').tolist(), [False, False, True, False])
+
+    def test_filter_operands_converted_to_column_type(self):
+        dates = pd.Series(pd.to_datetime(['2022-01-01', '2022-02-01']))
+        self.assertEqual(compute_filter_mask(dates, 'lt', '2022-01-15').tolist(), [True, False])
+        categories = pd.Series(pd.Categorical(['Paris', 'Berlin']))
+        self.assertEqual(compute_filter_mask(categories, 'contains', 'par').tolist(), [True, False])
+        with self.assertRaises(ValueError):
+            compute_filter_mask(pd.Series([1, 2]), 'eq', 'abc')
+
+    @unittest.skipIf(fakeredis is None, 'fakeredis is not installed')
+    def test_dataset_query_row_order(self):
+        manager = DatasetCacheManager(CacheClient(client=fakeredis.FakeRedis()), chunk_rows=4)
+        key = get_dataset_keys('first')[1]
+        df = pd.DataFrame({'score': [5, 3, 9, 1, 7, 3], 'city': ['a', 'b', 'a', 'a', 'b', 'a']})
+        manager.set_frame(key, df)
+
+        query = DatasetQuery(manager, key, manager.get_meta(key))
+        order = query.get_row_order(sort=('score', False), filters=[('city', 'eq', 'a')])
+        self.assertEqual(order.tolist(), [2, 0, 5, 3])
+
+        # Repeated queries are served from the cached permutation and mask
+        get_count = manager.client.get_stats()["get_count"]
+        self.assertEqual(query.get_row_order(sort=('score', False), filters=[('city', 'eq', 'a')]).tolist(), [2, 0, 5, 3])
+        self.assertEqual(manager.client.get_stats()["get_count"], get_count)
+
+
+@unittest.skipIf(fakeredis is None, 'fakeredis is not installed')
+class TestDatasetExport(SimpleTestCase):
+    """
+    Unit tests for streaming exports of cached frames
+    """
+
+    def setUp(self):
+        server = fakeredis.FakeServer()
+        self.key = get_dataset_keys('first')[1]
+        self.df = pd.DataFrame({
+            'int': pd.array([1, None, 3, 4, 5, 6, 7, 8, 9, 10], dtype='Int16'),
+            'date': pd.to_datetime(['2022-01-01'] * 5 + [None] * 5),
+            'grade': pd.Categorical(list('ABABABABAB')),
+            'complex': [complex(1, position) for position in range(10)],
+            'text': ['x'] * 4 + [None] * 6,
+        })
+        DatasetCacheManager(CacheClient(client=fakeredis.FakeRedis(server=server)), chunk_rows=4).set_frame(self.key, self.df)
+        self.manager = DatasetCacheManager(CacheClient(client=fakeredis.FakeRedis(server=server)), chunk_rows=4)
+        patcher = mock.patch.object(views, 'dataset_cache', self.manager)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def export(self, query=''):
+        return self.client.get(f'/data_cleanser/export/{self.key}/{query}')
+
+    def get_chunks(self, columns=None):
+        return iter_frame_chunks(self.manager, self.key, self.manager.get_meta(self.key), columns)
+
+    def test_chunks_not_kept_locally(self):
+        chunks = list(self.get_chunks(['int']))
+        self.assertEqual([len(chunk) for chunk in chunks], [4, 4, 2])
+        self.assertEqual(self.manager.frame_cache.bytes_held, 0)
+
+    def test_csv_export(self):
+        exported = b''.join(stream_csv(self.get_chunks(['int', 'text']))).decode()
+        self.assertEqual(exported.splitlines()[:3], ['int,text', '1,x', ',x'])
+        self.assertEqual(len(exported.splitlines()), 11)
+
+    def test_evicted_during_export(self):
+        chunks = self.get_chunks()
+        next(chunks)
+        self.manager.client.delete(self.key)
+        with self.assertRaises(DatasetEvictedError):
+            next(chunks)
+
+    def test_csv_download(self):
+        # Columns are exported in the requested order
+        response = self.export('?columns=text,int')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        self.assertEqual(response['Content-Disposition'], f'attachment; filename="{self.key}.csv"')
+        self.assertEqual(b''.join(response.streaming_content).decode().splitlines()[:2], ['text,int', 'x,1'])
+
+    @unittest.skipIf(pyarrow is None, 'pyarrow is not installed')
+    def test_parquet_download(self):
+        response = self.export('?file_format=PARQUET&columns=grade')
+        self.assertEqual(response['Content-Type'], 'application/vnd.apache.parquet')
+        self.assertEqual(response['Content-Disposition'], f'attachment; filename="{self.key}.parquet"')
+        exported = pd.read_parquet(io.BytesIO(b''.join(response.streaming_content)))
+        self.assertEqual(list(exported.columns), ['grade'])
+
+    def test_download_errors(self):
+        response = self.export('?file_format=xlsx')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('file_format', response.json())
+        self.assertEqual(self.export('?columns=missing').status_code, 400)
+        self.assertEqual(self.client.get(f'/data_cleanser/export/{get_dataset_keys("missing")[1]}/').status_code, 404)
+
+    def test_download_while_processing(self):
+        self.manager.set_status(self.key, DatasetCacheManager.STATUS_PROCESSING)
+        self.assertEqual(self.export().status_code, 409)
+
+    @unittest.skipIf(pyarrow is None, 'pyarrow is not installed')
+    def test_parquet_export_keeps_dtypes(self):
+        exported = pd.read_parquet(io.BytesIO(b''.join(stream_parquet(self.get_chunks()))))
+        self.assertEqual(exported['int'].dtype, 'Int16')
+        self.assertEqual(exported['grade'].dtype, 'category')
+        pd.testing.assert_series_equal(exported['date'], self.df['date'], check_dtype=False)
+        self.assertEqual(exported['complex'][1], '(1+1j)')
+        self.assertEqual(exported['text'].isna().sum(), 6)
+
+    @unittest.skipIf(pyarrow is None, 'pyarrow is not installed')
+    def test_arrow_export(self):
+        table = pyarrow.ipc.open_stream(b''.join(stream_arrow(self.get_chunks(['int', 'text'])))).read_all()
+        self.assertEqual(table.num_rows, 10)
+        self.assertEqual(str(table.schema.field('int').type), 'int16')
+        self.assertEqual(str(table.schema.field('text').type), 'string')
+
+
+class TestPageEncoding(SimpleTestCase):
+    """
+    Unit tests for encoding page slices to json compatible records
+    """
+
+    def test_numeric_and_boolean_columns(self):
+        df = pd.DataFrame({'int': [1, 2], 'float': [1.5, np.nan], 'bool': [True, False]})
+        self.assertEqual(dataframe_to_records(df), [{'int': 1, 'float': 1.5, 'bool': True}, {'int': 2, 'float': None, 'bool': False}])
+
+    def test_datetime_column(self):
+        df = pd.DataFrame({'date': pd.to_datetime(['2022-01-01 00:00:00', None, '2022-03-01 10:30:00'], format='%Y-%m-%d %H:%M:%S')})
+        self.assertEqual([record['date'] for record in dataframe_to_records(df)], ['2022-01-01T00:00:00', None, '2022-03-01T10:30:00'])
+
+    def test_timedelta_column(self):
+        df = pd.DataFrame({'delta': pd.to_timedelta(['5 days', None, '01:30:00'])})
+        self.assertEqual([record['delta'] for record in dataframe_to_records(df)], ['432000.0', None, '5400.0'])
+
+    def test_categorical_column(self):
+        df = pd.DataFrame({'grade': pd.Categorical(['A', 'B', None, 'A'])})
+        self.assertEqual([record['grade'] for record in dataframe_to_records(df)], ['A', 'B', None, 'A'])
+
+    def test_complex_column(self):
+        df = pd.DataFrame({'complex': [complex(3, 4), complex(5, -6)]})
+        self.assertEqual([record['complex'] for record in dataframe_to_records(df)], ['(3+4j)', '(5-6j)'])
+
+    def test_only_slice_rows_encoded(self):
+        df = pd.DataFrame({'col': range(100)})
+        self.assertEqual(dataframe_to_records(df.iloc[10:12]), [{'col': 10}, {'col': 11}])
+
+    def test_renderer_output_is_valid_json(self):
+        df = pd.DataFrame({'float': [np.nan, 1.0], 'object': [pd.Timestamp('2022-01-01'), 'text']})
+        rendered = FastJSONRenderer().render({"data": dataframe_to_records(df)})
+        self.assertEqual(json.loads(rendered), {"data": [{'float': None, 'object': '2022-01-01T00:00:00'}, {'float': 1.0, 'object': 'text'}]})
+
+    def test_timedelta_encoded_as_by_drf(self):
+        # Timedeltas keep the wire format of the DRF json encoder, whether orjson is installed or not
+        data = {"data": [{'delta': pd.Timedelta('01:30:00')}]}
+        self.assertEqual(json.loads(FastJSONRenderer().render(data)), json.loads(JSONRenderer().render(data)))
+
+
+@unittest.skipIf(fakeredis is None, 'fakeredis is not installed')
+class TestPaginatedDataView(SimpleTestCase):
+    """
+    Unit tests for the pages of cached datasets returned by the data view
+    """
+
+    def setUp(self):
+        self.manager = DatasetCacheManager(CacheClient(client=fakeredis.FakeRedis(server=fakeredis.FakeServer())), chunk_rows=256)
+        self.key = get_dataset_keys('first')[1]
+        self.df = pd.DataFrame({'id': range(1500), 'score': [float(i % 7) for i in range(1500)], 'name': [f'row {i}' for i in range(1500)]})
+        self.manager.set_frame(self.key, self.df)
+        patcher = mock.patch.object(views, 'dataset_cache', self.manager)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def get(self, query=''):
+        return self.client.get(f'/data_cleanser/data/{self.key}/{query}')
+
+    def test_page_number(self):
+        response = self.get('?page=2').json()
+        self.assertEqual([row['id'] for row in response["data"]], list(range(10, 20)))
+        self.assertEqual(response["pagination"], {"count": 1500, "page": 2, "num_pages": 150})
+
+    def test_offset(self):
+        response = self.get('?offset=5&page_size=20').json()
+        self.assertEqual([row['id'] for row in response["data"]], list(range(5, 25)))
+        self.assertEqual(response["pagination"], {"count": 1500, "offset": 5, "next_offset": 25})
+
+        # The last page has no next offset
+        response = self.get('?offset=1490&page_size=20').json()
+        self.assertEqual([row['id'] for row in response["data"]], list(range(1490, 1500)))
+        self.assertIsNone(response["pagination"]["next_offset"])
+
+    def test_page_size_capped(self):
+        response = self.get('?offset=0&page_size=5000').json()
+        self.assertEqual(len(response["data"]), 1000)
+        self.assertEqual(response["pagination"]["next_offset"], 1000)
+
+    def test_invalid_offset(self):
+        for offset in ('-1', 'first'):
+            response = self.get(f'?offset={offset}')
+            self.assertEqual(response.status_code, 400)
+            self.assertIn('offset', response.json())
+
+    def test_invalid_page(self):
+        self.assertEqual(self.get('?page=1000').status_code, 404)
+
+    def test_projected_columns(self):
+        # Columns are returned in the requested order
+        response = self.get('?columns=name,id,name&page_size=2').json()
+        self.assertEqual(response["data"], [{'name': 'row 0', 'id': 0}, {'name': 'row 1', 'id': 1}])
+        self.assertEqual(list(response["data"][0]), ['name', 'id'])
+
+    def test_unknown_column(self):
+        response = self.get('?columns=id,missing')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('columns', response.json())
+
+    def test_missing_dataset(self):
+        self.assertEqual(self.client.get(f'/data_cleanser/data/{get_dataset_keys("missing")[1]}/').status_code, 404)
+
+    def test_descending_sort(self):
+        response = self.get('?sort=-id&page_size=3').json()
+        self.assertEqual([row['id'] for row in response["data"]], [1499, 1498, 1497])
+
+    def test_filter_with_paging(self):
+        # Counts and offsets are those of the filtered rows
+        response = self.get('?filter=score:gte:5&sort=-id&offset=0&page_size=4').json()
+        self.assertEqual([row['id'] for row in response["data"]], [1497, 1496, 1490, 1489])
+        self.assertEqual(response["pagination"], {"count": 428, "offset": 0, "next_offset": 4})
+
+        response = self.get('?filter=score:gte:5&filter=id:lt:20&page=1').json()
+        self.assertEqual([row['id'] for row in response["data"]], [5, 6, 12, 13, 19])
+        self.assertEqual(response["pagination"]["count"], 5)
+
+    def test_invalid_queries(self):
+        for query in ('?filter=score:gte:abc', '?filter=score', '?filter=missing:eq:1', '?sort=missing'):
+            response = self.get(query)
+            self.assertEqual(response.status_code, 400, query)
+            self.assertTrue({'filter', 'sort'} & set(response.json()), query)
+
+
+@unittest.skipIf(fakeredis is None, 'fakeredis is not installed')
+class TestUpdateColumnsDataTypes(SimpleTestCase):
+    """
+    Unit tests for the column by column updates of the data types of a cached dataset
+    """
+
+    def setUp(self):
+        self.manager = DatasetCacheManager(CacheClient(client=fakeredis.FakeRedis(server=fakeredis.FakeServer())), chunk_rows=4)
+        self.original_key, self.cleaned_key = get_dataset_keys('first')
+        original_df = pd.DataFrame({'amount': ['1', '2', None, 'x', '5'], 'name': list('abcde')})
+        self.manager.set_frames({self.original_key: original_df, self.cleaned_key: original_df.astype({'name': 'category'})})
+        patcher = mock.patch.object(views, 'dataset_cache', self.manager)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def update(self, dtypes, query='', invalid_values='coerce'):
+        return self.client.post(f'/data_cleanser/update-columns-dtypes/{query}', {
+            "dtypes": dtypes,
+            "invalid_values": invalid_values,
+            "original_data_key": self.original_key,
+            "cleaned_data_key": self.cleaned_key,
+        }, content_type='application/json')
+
+    def test_only_updated_columns_written(self):
+        response = self.update([{"col_name": 'amount', "dtype": 'float64', "missing_values": 'ignore', "default": None}])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["dtypes"], {'amount': 'float64', 'name': 'category'})
+        cleaned_df = self.manager.get_frame(self.cleaned_key)
+        self.assertEqual(cleaned_df['amount'].tolist()[:2], [1.0, 2.0])
+        self.assertEqual(str(cleaned_df['name'].dtype), 'category')
+
+    def test_changed_columns_only_returned(self):
+        response = self.update([{"col_name": 'amount', "dtype": 'float64', "missing_values": 'ignore', "default": None}], '?changed_only=true')
+        self.assertEqual(response.json()["dtypes"], {'amount': 'float64'})
+        self.assertEqual(list(response.json()["data"][0]), ['amount'])
+
+    def test_deleted_rows_left_missing(self):
+        # The cleaned dataset keeps its rows, the rows deleted from the column are missing
+        response = self.update([{"col_name": 'amount', "dtype": 'float64', "missing_values": 'delete', "default": None}])
+        self.assertEqual(response.status_code, 200)
+        cleaned_df = self.manager.get_frame(self.cleaned_key)
+        self.assertEqual(len(cleaned_df), 5)
+        self.assertTrue(cleaned_df['amount'].isna()[2])
+
+    def test_several_columns_converted_in_worker_processes(self):
+        response = self.update([
+            {"col_name": 'amount', "dtype": 'object', "missing_values": 'ignore', "default": None},
+            {"col_name": 'name', "dtype": 'object', "missing_values": 'ignore', "default": None},
+            {"col_name": 'amount', "dtype": 'float64', "missing_values": 'ignore', "default": None},
+        ])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["dtypes"], {'amount': 'float64', 'name': 'object'})
+        self.assertEqual(self.manager.get_frame(self.cleaned_key)['amount'].tolist()[:2], [1.0, 2.0])
+
+    def test_failing_column_reported(self):
+        response = self.update([
+            {"col_name": 'name', "dtype": 'object', "missing_values": 'ignore', "default": None},
+            {"col_name": 'amount', "dtype": 'datetime64[ns]', "missing_values": 'ignore', "default": None},
+        ], invalid_values='raise')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["message"], 'Error cleaning dataframe')
+        # Nothing is written when a column fails
+        self.assertEqual(str(self.manager.get_frame(self.cleaned_key)['name'].dtype), 'category')
+
+    def test_unknown_column(self):
+        response = self.update([{"col_name": 'missing', "dtype": 'float64', "missing_values": 'ignore', "default": None}])
+        self.assertEqual(response.status_code, 400)
+
+    def test_undo_and_redo_update(self):
+        self.update([{"col_name": 'amount', "dtype": 'float64', "missing_values": 'ignore', "default": None}])
+
+        response = self.client.post(f'/data_cleanser/undo/{self.cleaned_key}/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["dtypes"], {'amount': 'object', 'name': 'category'})
+        self.assertEqual(response.json()["history"], {"undo": 0, "redo": 1})
+        self.assertEqual(response.json()["data"][0]['amount'], '1')
+
+        response = self.client.post(f'/data_cleanser/redo/{self.cleaned_key}/')
+        self.assertEqual(response.json()["dtypes"]['amount'], 'float64')
+        self.assertEqual(self.client.post(f'/data_cleanser/redo/{self.cleaned_key}/').status_code, 409) # Nothing to redo
+
+    def test_conflicting_update(self):
+        with mock.patch.object(self.manager, 'set_columns', side_effect=DatasetConflictError('Column "amount" was updated concurrently')):
+            response = self.update([{"col_name": 'amount', "dtype": 'float64', "missing_values": 'ignore', "default": None}])
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(self.manager.get_dtypes(self.manager.get_meta(self.cleaned_key))['amount'], 'object')
+
+    def test_undo_missing_dataset(self):
+        response = self.client.post(f'/data_cleanser/undo/{get_dataset_keys("missing")[1]}/')
+        self.assertEqual(response.status_code, 404)
+
+    def test_only_updated_columns_profiled_again(self):
+        profile = self.client.get(f'/data_cleanser/profile/{self.cleaned_key}/').json()["profile"]
+        self.assertEqual(list(profile), ['amount', 'name'])
+        self.update([{"col_name": 'amount', "dtype": 'float64', "missing_values": 'ignore', "default": None}])
+
+        with mock.patch.object(views.profiler, 'profile_column', wraps=views.profiler.profile_column) as profile_column:
+            response = self.client.get(f'/data_cleanser/profile/{self.cleaned_key}/')
+            self.assertEqual([call.args[0].name for call in profile_column.call_args_list], ['amount'])
+            self.assertEqual(response.json()["profile"]['name'], profile['name'])
+
+            # Both profiles are now current
+            self.client.get(f'/data_cleanser/profile/{self.cleaned_key}/')
+            self.assertEqual(profile_column.call_count, 1)
+
+    def test_uploaded_values_converted(self):
+        # Datetimes parsed by the reader are only typed in the cleaned dataset, updates convert from the uploaded values
+        upload = self.client.post('/data_cleanser/upload-file/', {"file": SimpleUploadedFile('dates.csv', b'when\n2020-01-02\n2020-01-03\n'), "uploaded_on": '2024-01-01T00:00:00'}).json()
+        self.assertEqual(upload["dtypes"], {'when': 'datetime64[ns]'})
+        self.original_key, self.cleaned_key = upload["original_data_key"], upload["cleaned_data_key"]
+
+        response = self.update([{"col_name": 'when', "dtype": 'object', "missing_values": 'ignore', "default": None}])
+        self.assertEqual([row['when'] for row in response.json()["data"]], ['2020-01-02', '2020-01-03'])
+
+
+@unittest.skipIf(fakeredis is None, 'fakeredis is not installed')
+class TestDataFileUpload(SimpleTestCase):
+    """
+    Unit tests for the uploads of single files
+    """
+
+    def setUp(self):
+        self.manager = DatasetCacheManager(CacheClient(client=fakeredis.FakeRedis(server=fakeredis.FakeServer())))
+        patcher = mock.patch.object(views, 'dataset_cache', self.manager)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def upload(self, data):
+        response = self.client.post('/data_cleanser/upload-file/', {"file": SimpleUploadedFile('amounts.csv', data), "uploaded_on": '2024-01-01T00:00:00'})
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_identical_upload_served_from_cache(self):
+        response = self.upload(b'amount\n1\n2\n')
+
+        # The same bytes are neither read nor cleaned again
+        with mock.patch.object(views.reader_registry.get_reader('.csv'), 'read_typed', side_effect=AssertionError('read again')) as read_typed, \
+             mock.patch.object(views.DataFileUploadAPIView, 'clean_dataframe', side_effect=AssertionError('cleaned again')) as clean_dataframe:
+            cached_response = self.upload(b'amount\n1\n2\n')
+        read_typed.assert_not_called()
+        clean_dataframe.assert_not_called()
+        self.assertEqual(cached_response["message"], 'Data already processed, returning cached result')
+        self.assertEqual((cached_response["original_data_key"], cached_response["cleaned_data_key"]), (response["original_data_key"], response["cleaned_data_key"]))
+        self.assertEqual(cached_response["dtypes"], response["dtypes"])
+        self.assertEqual(cached_response["data"], response["data"])
+
+    def test_different_upload_processed(self):
+        response = self.upload(b'amount\n1\n2\n')
+        other_response = self.upload(b'amount\n1\n3\n')
+        self.assertEqual(other_response["message"], 'Data uploaded and processed successfully')
+        self.assertNotEqual(other_response["cleaned_data_key"], response["cleaned_data_key"])
+
+
+@unittest.skipIf(fakeredis is None, 'fakeredis is not installed')
+class TestPreviewUpload(SimpleTestCase):
+    """
+    Unit tests for the uploads returning a preview while the full dataset is cleaned in background
+    """
+
+    data = b'amount\n1\n2\n3\n4\n5.5\n'
+
+    def setUp(self):
+        self.manager = DatasetCacheManager(CacheClient(client=fakeredis.FakeRedis(server=fakeredis.FakeServer())))
+        self.executor = mock.Mock(wraps=SynchronousExecutor())
+        for name, value in (('dataset_cache', self.manager), ('cleaning_executor', self.executor)):
+            patcher = mock.patch.object(views, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def upload(self, query='?preview=true', sample_rows=0):
+        with self.settings(DATASET_PREVIEW={**views.settings.DATASET_PREVIEW, "ROWS": 2, "SAMPLE_ROWS": sample_rows}):
+            return self.client.post(f'/data_cleanser/upload-file/{query}', {"file": SimpleUploadedFile('amounts.csv', self.data), "uploaded_on": '2024-01-01T00:00:00'}).json()
+
+    def test_preview_then_full_dataset(self):
+        # Types of the preview are inferred from the leading rows, the ones of the full dataset from all rows
+        response = self.upload()
+        self.assertEqual(response["status"], 'processing')
+        self.assertEqual(response["dtypes"], {'amount': 'int8'})
+        self.assertEqual([row['amount'] for row in response["data"]], [1, 2])
+        self.executor.submit.assert_called_once()
+
+        # The full dataset is published under the key of the preview
+        meta = self.manager.get_meta(response["cleaned_data_key"])
+        self.assertEqual(self.manager.get_status(meta), 'ready')
+        self.assertEqual(self.manager.get_dtypes(meta), {'amount': 'float32'})
+        data = self.client.get(f'/data_cleanser/data/{response["cleaned_data_key"]}/').json()
+        self.assertEqual(data["status"], 'ready')
+        self.assertEqual(data["pagination"]["count"], 5)
+
+    def test_preview_types_inferred_from_sample(self):
+        # The sampled rows after the preview are part of the inference
+        response = self.upload(sample_rows=10)
+        self.assertEqual(response["dtypes"], {'amount': 'float32'})
+
+    def test_small_upload_cleaned_in_full(self):
+        self.data = b'amount\n1\n'
+        response = self.upload()
+        self.assertEqual(response["status"], 'ready')
+        self.executor.submit.assert_not_called()
+
+    def test_background_cleaning_failure(self):
+        with mock.patch.object(views.DataFileUploadAPIView, 'clean_dataframe', side_effect=RuntimeError('cleaning failed')):
+            response = self.upload()
+        self.assertEqual(response["status"], 'processing')
+        meta = self.manager.get_meta(response["cleaned_data_key"])
+        self.assertEqual(self.manager.get_status(meta), 'failed')
+        self.assertEqual(meta["error"], 'cleaning failed')
+        self.assertEqual(self.client.get(f'/data_cleanser/data/{response["cleaned_data_key"]}/').json()["status"], 'failed')
+
+        # A failed dataset is cleaned again when uploaded again
+        response = self.upload()
+        self.assertEqual(self.manager.get_status(self.manager.get_meta(response["cleaned_data_key"])), 'ready')
+
+
+@unittest.skipIf(fakeredis is None, 'fakeredis is not installed')
+class TestBatchDataFileUpload(SimpleTestCase):
+    """
+    Unit tests for the uploads of several files cleaned concurrently
+    """
+
+    def setUp(self):
+        self.manager = DatasetCacheManager(CacheClient(client=fakeredis.FakeRedis(server=fakeredis.FakeServer())))
+        patcher = mock.patch.object(views, 'dataset_cache', self.manager)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def upload(self, files, query=''):
+        response = self.client.post(f'/data_cleanser/upload-files/{query}', {"files": files})
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        lines = [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+        return {line["index"]: line for line in lines}
+
+    def test_files_processed_as_datasets(self):
+        lines = self.upload([
+            SimpleUploadedFile('first.csv', b'amount,name\n1,a\n2,b\n3,c\n'),
+            SimpleUploadedFile('notes.txt', b'text'),
+            SimpleUploadedFile('second.csv', b'when\n2020-01-01\n2020-01-02\n'),
+        ])
+        self.assertTrue(lines[0]["dtypes"]["amount"].startswith('int'))
+        self.assertEqual(lines[1]["status"], 'failed')
+        self.assertEqual(lines[2]["dtypes"], {'when': 'datetime64[ns]'})
+        self.assertEqual(self.manager.get_frame(lines[0]["cleaned_data_key"])['amount'].tolist(), [1, 2, 3])
+
+    def test_schema_of_first_file_reused(self):
+        files = [SimpleUploadedFile('first.csv', b'when\n2020-01-01\n2020-01-02\n'), SimpleUploadedFile('second.csv', b'when\n1\n2\n')]
+        lines = self.upload(files, '?reuse_schema=true')
+        self.assertEqual(lines[1]["dtypes"], {'when': 'datetime64[ns]'})
+
+        # Processed with different settings, the same file uploaded without reusing the schema is a different dataset
+        lines_without_reuse = self.upload([SimpleUploadedFile('second.csv', b'when\n1\n2\n')])
+        self.assertTrue(lines_without_reuse[0]["dtypes"]["when"].startswith('int'))
+        self.assertNotEqual(lines_without_reuse[0]["cleaned_data_key"], lines[1]["cleaned_data_key"])
+
+    def test_schema_of_cached_first_file_reused(self):
+        self.upload([SimpleUploadedFile('first.csv', b'when\n2020-01-01\n2020-01-02\n')])
+        files = [SimpleUploadedFile('first.csv', b'when\n2020-01-01\n2020-01-02\n'), SimpleUploadedFile('second.csv', b'when\n1\n2\n')]
+        with mock.patch.object(views.inference_engine, 'infer_data_types', side_effect=AssertionError('inferred in the request thread')):
+            lines = self.upload(files, '?reuse_schema=true')
+        self.assertEqual(lines[1]["dtypes"], {'when': 'datetime64[ns]'})
+
+    def test_cache_error_reported_as_failure(self):
+        with mock.patch.object(self.manager, 'set_frames', side_effect=ConnectionError('cache unavailable')):
+            lines = self.upload([SimpleUploadedFile('first.csv', b'amount\n1\n2\n')])
+        self.assertEqual(lines[0]["status"], 'failed')
+        self.assertEqual(lines[0]["error"], 'cache unavailable')
+
+    def test_too_many_files(self):
+        with self.settings(DATASET_BATCH_UPLOADS={**views.settings.DATASET_BATCH_UPLOADS, "MAX_FILES": 1}):
+            response = self.client.post('/data_cleanser/upload-files/', {"files": [SimpleUploadedFile('a.csv', b'a\n1\n'), SimpleUploadedFile('b.csv', b'a\n2\n')]})
+        self.assertEqual(response.status_code, 400)
+
+
+@unittest.skipIf(fakeredis is None, 'fakeredis is not installed')
+class TestSheetsUpload(SimpleTestCase):
+    """
+    Unit tests for the uploads of workbooks with each sheet processed as its own dataset
+    """
+
+    def setUp(self):
+        self.manager = DatasetCacheManager(CacheClient(client=fakeredis.FakeRedis(server=fakeredis.FakeServer())))
+        patcher = mock.patch.object(views, 'dataset_cache', self.manager)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def upload(self, data, name='workbook.xlsx'):
+        return self.client.post('/data_cleanser/upload-file/?sheets=all', {"file": SimpleUploadedFile(name, data), "uploaded_on": '2024-01-01T00:00:00'})
+
+    def test_corrupt_workbook(self):
+        response = self.upload(b'not a workbook')
+        self.assertIn(response.status_code, (400, 500))
+        self.assertIn("error", response.json())
+
+    def test_failing_sheet_reported(self):
+        workbook = io.BytesIO()
+        with pd.ExcelWriter(workbook, engine='openpyxl') as writer:
+            pd.DataFrame({'amount': [1, 2]}).to_excel(writer, sheet_name='good', index=False)
+            pd.DataFrame({'bad': [1, 2]}).to_excel(writer, sheet_name='bad', index=False)
+
+        clean_dataframe = views.DataFileUploadAPIView.clean_dataframe
+        def clean_or_fail(view, df):
+            if 'bad' in df:
+                raise RuntimeError('cleaning failed')
+            return clean_dataframe(view, df)
+
+        with mock.patch.object(views.DataFileUploadAPIView, 'clean_dataframe', clean_or_fail):
+            response = self.upload(workbook.getvalue())
+        self.assertEqual(response.status_code, 200)
+        good, bad = response.json()["datasets"]
+        self.assertEqual(bad["status"], 'failed')
+        self.assertEqual(bad["error"], 'cleaning failed')
+        self.assertEqual(self.manager.get_frame(good["cleaned_data_key"])['amount'].tolist(), [1, 2])
+
+
+class TestMetrics(SimpleTestCase):
+    """
+    Unit tests for the in-process metrics rendered in the Prometheus text format
+    """
+
+    def setUp(self):
+        self.registry = MetricsRegistry()
+
+    def test_counter(self):
+        counter = self.registry.counter('rows_total', 'Rows.', ('dtype',))
+        counter.inc(dtype='int8')
+        counter.inc(2, dtype='int8')
+        self.assertIn('# TYPE rows_total counter\nrows_total{dtype="int8"} 3.0\n', self.registry.render())
+
+    def test_histogram_buckets_are_cumulative(self):
+        histogram = self.registry.histogram('latency_seconds', 'Latency.', buckets=(0.1, 1.0))
+        for value in (0.05, 0.5, 0.5, 5.0):
+            histogram.observe(value)
+        rendered = self.registry.render()
+        self.assertIn('latency_seconds_bucket{le="0.1"} 1.0', rendered)
+        self.assertIn('latency_seconds_bucket{le="1.0"} 3.0', rendered)
+        self.assertIn('latency_seconds_bucket{le="+Inf"} 4.0', rendered)
+        self.assertIn('latency_seconds_sum 6.05', rendered)
+        self.assertIn('latency_seconds_count 4.0', rendered)
+
+    def test_label_values_escaped(self):
+        self.registry.counter('files_total', 'Files.', ('name',)).inc(name='a "b"\n')
+        self.assertIn('files_total{name="a \\"b\\"\\n"} 1.0', self.registry.render())
+
+    def test_unexpected_labels(self):
+        with self.assertRaises(ValueError):
+            self.registry.counter('rows_total', 'Rows.', ('dtype',)).inc(view='upload')
+
+    def test_failing_callback_left_out(self):
+        def fail():
+            raise ConnectionError('redis is down')
+        self.registry.register(CallbackMetric('hit_ratio', 'Hit ratio.', 'gauge', (), fail))
+        self.registry.counter('rows_total', 'Rows.').inc()
+        rendered = self.registry.render()
+        self.assertNotIn('hit_ratio', rendered)
+        self.assertIn('rows_total 1.0', rendered)
+
+    @unittest.skipIf(fakeredis is None, 'fakeredis is not installed')
+    def test_cache_hit_ratios(self):
+        client = CacheClient(client=fakeredis.FakeRedis(server=fakeredis.FakeServer()))
+        manager = DatasetCacheManager(client, chunk_rows=4)
+        key = get_dataset_keys('first')[1]
+        manager.set_frame(key, pd.DataFrame({'col': range(10)}))
+        manager.get_frame(key)
+
+        register_cache_metrics(client, manager, self.registry)
+        rendered = self.registry.render()
+        self.assertIn('data_cleanser_cache_hit_ratio{level="l1"} 1.0', rendered)
+        self.assertIn('data_cleanser_redis_values_total{operation="set"}', rendered)
+
+    def test_request_latency_recorded_by_view(self):
+        self.client.get('/data_cleanser/hello/')
+        samples = [sample for sample in REQUEST_LATENCY.samples() if sample[0].endswith('_count')]
+        self.assertIn({"view": "hello", "method": "GET", "status": "200"}, [labels for _, labels, _ in samples])
+
+
+@unittest.skipIf(fakeredis is None, 'fakeredis is not installed')
+@unittest.skipUnless(is_performance_testing_enabled(), f'performance tests only run with {PERFORMANCE_TESTS_ENV}=1')
+class TestPerformanceBudgets(SimpleTestCase):
+    """
+    Performance tests asserting the time budgets of page fetches from a large cached dataset, see benchmarks.budgets
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        rows = 5_000_000
+        rng = np.random.default_rng(0)
+        cls.server = fakeredis.FakeServer()
+        cls.key = get_dataset_keys('performance')[1]
+        cls.create_manager().set_frame(cls.key, pd.DataFrame({
+            'int': np.arange(rows),
+            'float': rng.random(rows),
+            'category': pd.Categorical(rng.choice(['a', 'b', 'c'], rows)),
+            'date': pd.Timestamp('2020-01-01') + pd.to_timedelta(rng.integers(0, 10**8, rows), unit='s'),
+            'text': pd.Series(rng.integers(0, 1000, rows)).astype(str),
+        }))
+
+    @classmethod
+    def create_manager(cls):
+        return DatasetCacheManager(CacheClient(client=fakeredis.FakeRedis(server=cls.server)))
+
+    def fetch_page(self, manager, start):
+        meta = manager.get_meta(self.key)
+        return dataframe_to_records(DatasetRows(manager, self.key, meta)[start:start + 100])
+
+    def test_page_fetch_from_redis(self):
+        # A worker process without the chunks of the page in its local cache fetches them from redis
+        check_budget('Fetching a page of a cached 5M-row dataset from redis', lambda: self.fetch_page(self.create_manager(), 2_500_000), seconds=0.2, repeat=3)
+
+    def test_page_fetch_from_local_cache(self):
+        manager = self.create_manager()
+        self.fetch_page(manager, 2_500_000)
+        check_budget('Fetching a page of a cached 5M-row dataset from the local cache', lambda: self.fetch_page(manager, 2_500_100), seconds=0.02, repeat=3)
@@ -1,9 +1,21 @@
 from django.urls import path
-from .views import hello_data_cleanser, DataFileUploadAPIView, PaginatedDataView, UpdateColumnsDataTypesAPIView
+from .async_views import AsyncDataFileUploadView, AsyncPaginatedDataView, AsyncUpdateColumnsDataTypesView
+from .views import hello_data_cleanser, cache_stats, prometheus_metrics, DataFileUploadAPIView, BatchDataFileUploadAPIView, PaginatedDataView, DatasetProfileView, DatasetExportView, UpdateColumnsDataTypesAPIView, UndoColumnsDataTypesView, RedoColumnsDataTypesView
 
 urlpatterns = [
     path('hello/', hello_data_cleanser, name='hello'),
     path('upload-file/', DataFileUploadAPIView.as_view(), name='upload-file'),
+    path('upload-files/', BatchDataFileUploadAPIView.as_view(), name='upload-files'),
     path('data/<str:cleaned_data_key>/', PaginatedDataView.as_view(), name='paginated_data'),
+    path('profile/<str:cleaned_data_key>/', DatasetProfileView.as_view(), name='dataset-profile'),
+    path('export/<str:cleaned_data_key>/', DatasetExportView.as_view(), name='dataset-export'),
     path('update-columns-dtypes/', UpdateColumnsDataTypesAPIView.as_view(), name='update-columns-dtypes'),
+    path('undo/<str:cleaned_data_key>/', UndoColumnsDataTypesView.as_view(), name='undo-columns-dtypes'),
+    path('redo/<str:cleaned_data_key>/', RedoColumnsDataTypesView.as_view(), name='redo-columns-dtypes'),
+    path('cache-stats/', cache_stats, name='cache-stats'),
+    path('metrics/', prometheus_metrics, name='metrics'),
+    # Async variants of the views for ASGI deployments (see backend/asgi.py)
+    path('async/upload-file/', AsyncDataFileUploadView.as_view(), name='async-upload-file'),
+    path('async/data/<str:cleaned_data_key>/', AsyncPaginatedDataView.as_view(), name='async-paginated-data'),
+    path('async/update-columns-dtypes/', AsyncUpdateColumnsDataTypesView.as_view(), name='async-update-columns-dtypes'),
 ]
\ No newline at end of file
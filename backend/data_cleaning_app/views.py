@@ -1,32 +1,150 @@
+import json
 import logging
+from django.conf import settings
+from django.http import HttpResponse, StreamingHttpResponse
 from django.shortcuts import render
 from django.views.generic import View
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.exceptions import ValidationError
 from rest_framework.parsers import MultiPartParser, FormParser
 from rest_framework import status
-from .serializers import DataFileSerializer, DataTypesChangeRequestSerializer
+from .serializers import BatchDataFileSerializer, DataFileSerializer, DataTypesChangeRequestSerializer
 import pandas as pd
 from pandas.errors import ParserError
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+import multiprocessing
 import os
-import pickle
-import redis
 
 import sys
+import time
 sys.path.append('../') 
+from data_cleanser import cleaning
 from data_cleanser.inference import Inference
 from data_cleanser.conversion import Convertor
+from data_cleanser.data_types import DataTypes
+from data_cleanser.instrumentation import instrument, span
+from data_cleanser.profiling import Profiler
+from data_cleanser.readers import create_default_registry
+from .cache import CacheClient, DatasetCacheManager, DatasetConflictError, compute_dataset_id, get_dataset_keys, get_sheet_dataset_id
+from .metrics import PROMETHEUS_CONTENT_TYPE, UPLOAD_SIZE, record_cleaning, register_cache_metrics, registry as metrics_registry
+from .export import EXPORT_FORMATS, DatasetEvictedError, ExportFormats, get_available_formats, iter_frame_chunks
+from .pagination import CustomPagination, DataFrameRows, DatasetRows
+from .queries import DatasetQuery, parse_filter, parse_sort
+from .renderers import dataframe_to_records
 
-# Initialising logger, cache, inference (for type inference) and convertor (for type/data conversion) instance
+# Initialising logger, cache, inference (for type inference), convertor (for type/data conversion) and profiler (for column statistics) instance
 logger = logging.getLogger("django")
-cache = redis.Redis()
+cache = CacheClient.from_settings(settings.DATASET_CACHE)
+dataset_cache = DatasetCacheManager.from_settings(cache, settings.DATASET_CACHE)
 inference_engine = Inference(0.5)
 conversion_engine = Convertor()
+profiler = Profiler()
+reader_registry = create_default_registry(settings.DATASET_READERS["CSV_ENGINE"], settings.DATASET_READERS["HINT_SAMPLE_ROWS"], inference_engine.INFERENCE_THRESHOLD_PERCENTAGE, settings.DATASET_READERS["EXCEL_ENGINE"])
+register_cache_metrics(cache, dataset_cache)
+cleaning_executor = ThreadPoolExecutor(max_workers=settings.DATASET_PREVIEW["MAX_WORKERS"], thread_name_prefix='dataset-cleaning')
 
-class CustomPagination(PageNumberPagination):
-    page_size = 10  # Default number of items per page
+
+def create_sheet_process_pool():
+    return ProcessPoolExecutor(
+        max_workers=settings.DATASET_READERS["SHEET_WORKERS"],
+        mp_context=multiprocessing.get_context(settings.DATASET_READERS["START_METHOD"]))
+
+sheet_processes = create_sheet_process_pool()
+
+
+def read_sheets(reader, uploaded_file, sheet_names):
+    """
+    Read sheets of an uploaded workbook in parallel in the pool of worker processes (see data_cleanser.readers.ExcelReader.read_sheets).
+    """
+
+    global sheet_processes
+    try:
+        return reader.read_sheets(uploaded_file, sheet_names, executor=sheet_processes)
+    except BrokenProcessPool:
+        # A worker process died (e.g. killed when out of memory), replacing the pool for the next requests
+        logger.error('read_sheets : Worker process terminated abruptly, replacing the process pool')
+        sheet_processes = create_sheet_process_pool()
+        raise
+
+def create_conversion_process_pool():
+    return ProcessPoolExecutor(
+        max_workers=settings.DATASET_UPDATES["PROCESS_WORKERS"],
+        mp_context=multiprocessing.get_context(settings.DATASET_UPDATES["START_METHOD"]))
+
+conversion_processes = create_conversion_process_pool()
+
+
+def submit_column_conversions(columns, col_updates, invalid_values_handling_option):
+    """
+    Convert columns concurrently in the pool of worker processes, one task per column (see data_cleanser.cleaning.convert_column).
+
+    Args:
+    - columns (pd.DataFrame): Columns to convert.
+    - col_updates (dict): Mapping of column names to their updates (see data_cleanser.cleaning.group_column_updates).
+    - invalid_values_handling_option (str): How to handle invalid values i.e. 'coerce' or 'raise'.
+
+    Returns:
+    - dict: Mapping of column names to the futures of their converted columns, collected with get_column_conversion.
+    """
+
+    return {col_name: conversion_processes.submit(cleaning.convert_column, columns[col_name], updates, invalid_values_handling_option)
+            for col_name, updates in col_updates.items()}
+
+def get_column_conversion(future):
+    """
+    Returns:
+    - pd.Series: Converted column of a future returned by submit_column_conversions, the error of the conversion is raised.
+    """
+
+    global conversion_processes
+    try:
+        return future.result()
+    except BrokenProcessPool:
+        # A worker process died (e.g. killed when out of memory), replacing the pool for the next requests
+        logger.error('get_column_conversion : Worker process terminated abruptly, replacing the process pool')
+        conversion_processes = create_conversion_process_pool()
+        raise
+
+def create_batch_process_pool():
+    return ProcessPoolExecutor(
+        max_workers=settings.DATASET_BATCH_UPLOADS["PROCESS_WORKERS"],
+        mp_context=multiprocessing.get_context(settings.DATASET_BATCH_UPLOADS["START_METHOD"]))
+
+batch_processes = create_batch_process_pool()
+
+
+def submit_file_cleaning(reader, data, data_types=None):
+    """
+    Parse and clean a data file in the pool of worker processes of batch uploads (see data_cleanser.cleaning.clean_data_file).
+
+    Returns:
+    - Future: Future of the cleaning result, collected with get_file_cleaning.
+    """
+
+    return batch_processes.submit(cleaning.clean_data_file, reader, data, inference_engine.INFERENCE_THRESHOLD_PERCENTAGE, data_types)
+
+def get_file_cleaning(future):
+    """
+    Returns:
+    - dict: Cleaning result of a future returned by submit_file_cleaning, the error of the cleaning is raised.
+    """
+
+    global batch_processes
+    try:
+        return future.result()
+    except BrokenProcessPool:
+        # A worker process died (e.g. killed when out of memory), replacing the pool for the next files
+        logger.error('get_file_cleaning : Worker process terminated abruptly, replacing the process pool')
+        batch_processes = create_batch_process_pool()
+        raise
+
+def record_upload_size(uploaded_file, file_extension):
+    reader = reader_registry.get_reader(file_extension)
+    UPLOAD_SIZE.observe(uploaded_file.size, file_type=reader.file_type if reader is not None else 'unsupported')
 
 class IndexView(View):
     def get(self, request):
@@ -37,19 +155,83 @@ class IndexView(View):
 def hello_data_cleanser(request):
     return Response({"message": "Hello! Welcome to data cleanser."})
 
-class DataFileUploadAPIView(APIView):
+@api_view(['GET'])
+def cache_stats(request):
+    return Response({"datasets": dataset_cache.get_stats(), "transfer": cache.get_stats()})
+
+def prometheus_metrics(request):
+    # Plain django view, the metrics are rendered in the Prometheus text format rather than by the DRF renderers
+    return HttpResponse(metrics_registry.render(), content_type=PROMETHEUS_CONTENT_TYPE)
+
+class InstrumentationMixin:
+    """
+    Mixin timing the stages of a view with data_cleanser.instrumentation (reading, inference and conversion per
+    column, caching, ...) and counting the fallback paths taken. The collected instrumentation is logged and, with
+    `?instrument=true`, included in the response under `instrumentation`. With `?instrument=memory` the peak of
+    memory allocated while handling the request is traced as well.
+    """
+
+    instrument_query_param = 'instrument'
+
+    def is_instrumentation_requested(self, request):
+        return request.query_params.get(self.instrument_query_param, '').lower() in ('1', 'true', 'yes', 'memory')
+
+    def is_memory_tracing_requested(self, request):
+        return settings.DATASET_INSTRUMENTATION["TRACE_MEMORY"] or request.query_params.get(self.instrument_query_param, '').lower() == 'memory'
+
+    def log_instrumentation(self, method, instrumentation):
+        if settings.DATASET_INSTRUMENTATION["LOG"]:
+            logger.info(f'{type(self).__name__} : {method} : Instrumentation: {json.dumps(instrumentation.as_dict())}')
+
+    def run_instrumented(self, handler, request):
+        """
+        Handle a request while collecting its instrumentation.
+
+        Args:
+        - handler (callable): Method handling the request, returning the response.
+        - request (Request): The request.
+
+        Returns:
+        - Response: The response of the handler, with the instrumentation if requested.
+        """
+
+        with instrument(trace_memory=self.is_memory_tracing_requested(request)) as instrumentation:
+            with instrumentation.span('total'):
+                response = handler(request)
+
+        self.log_instrumentation(handler.__name__, instrumentation)
+        if self.is_instrumentation_requested(request) and isinstance(response.data, dict):
+            response.data["instrumentation"] = instrumentation.as_dict()
+        return response
+
+class DataFileUploadAPIView(InstrumentationMixin, APIView):
     """
     API view for uploading data files.
 
     Handles the uploading of data files (e.g., CSV, Excel) and processes
     them for further analysis or manipulation. It uses the `MultiPartParser` and
     `FormParser` to parse the incoming request data and serializes the data using the `DataFileSerializer`.
+
+    In preview mode (`?preview=true`) and for uploads larger than the preview, types are inferred on the
+    leading rows plus a sample of the other rows and only the leading rows are converted and returned.
+    The full dataset is cleaned in background and published under the same cleaned key with the dtypes
+    inferred from all rows, the `status` of the response and of the data view turns from 'processing' to 'ready'.
+
+    Only the first sheet of Excel files is read by default. With `?sheets=all` all sheets are read in parallel
+    and each sheet is processed as its own dataset, the response lists the datasets (preview mode is not supported).
+
+    Stages are timed per request (see InstrumentationMixin), `?instrument=true` adds the timings to the response.
     """
     
     parser_classes = (MultiPartParser, FormParser) # for parsing request data
     serializer_class = DataFileSerializer
+    preview_query_param = 'preview'
+    sheets_query_param = 'sheets'
 
     def post(self, request):
+        return self.run_instrumented(self.upload, request)
+
+    def upload(self, request):
     
         logger.debug('DataFileUploadAPIView: Starting POST method')
         
@@ -62,31 +244,61 @@ class DataFileUploadAPIView(APIView):
             file_extension = os.path.splitext(file_name)[1]
 
             logger.debug(f'DataFileUploadAPIView: Processing file "{file_name}" with extension "{file_extension}"')
+            record_upload_size(uploaded_file, file_extension)
 
-            df = pd.DataFrame() # Define an empty dataframe to be replaced with parsed one
+            # Datasets are addressed by their content and processing settings, so identical uploads are only processed once
+            with span('hash'):
+                dataset_id = compute_dataset_id(uploaded_file, extension=file_extension.lower(), inference_threshold=inference_engine.INFERENCE_THRESHOLD_PERCENTAGE)
+            original_df_key, cleaned_df_key = get_dataset_keys(dataset_id)
 
-            if file_extension == '.csv':
-                try:
-                    df = pd.read_csv(uploaded_file)
-                    logger.debug('DataFileUploadAPIView: Successfully parsed CSV file')
-                except ParserError as e:
-                    logger.error(f"DataFileUploadAPIView: Error occurred while parsing CSV file: {file_name}, error: {str(e)}")
-                    return Response({"message": f"Error occurred while parsing file: {file_name}"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-            
-            elif file_extension in ['.xls', '.xlsx', '.xlsm', '.xlsb']:
-                try:
-                    df = pd.read_excel(uploaded_file)
-                    logger.debug('DataFileUploadAPIView: Successfully parsed Excel file')
-                except ParserError as e:
-                    logger.error(f"DataFileUploadAPIView: Error occurred while parsing Excel file: {file_name}, error: {str(e)}")
-                    return Response({"message": f"Error occurred while parsing file: {file_name}"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-            
-            else:
+            if self.is_all_sheets_requested(request):
+                return self.upload_sheets(request, uploaded_file, file_extension, dataset_id)
+
+            if dataset_cache.contains(dataset_id):
+                meta = dataset_cache.get_meta(cleaned_df_key)
+                if meta is not None and dataset_cache.get_status(meta) != dataset_cache.STATUS_FAILED:
+                    logger.debug(f'DataFileUploadAPIView: Dataset "{dataset_id}" already processed, returning cached result')
+                    cleaned_rows = DatasetRows(dataset_cache, cleaned_df_key, meta)
+                    return self.build_response("Data already processed, returning cached result", cleaned_rows, dataset_cache.get_dtypes(meta), original_df_key, cleaned_df_key, request, dataset_cache.get_status(meta))
+
+            # Parsing the file with the reader registered for its extension (see data_cleanser.readers)
+            reader = reader_registry.get_reader(file_extension)
+            if reader is None:
                 logger.error(f"DataFileUploadAPIView: Unsupported file type: {file_extension}")
                 return Response({"message": "Received unsupported data file type"}, status=status.HTTP_400_BAD_REQUEST )
+
+            try:
+                # The original frame keeps the uploaded values to convert from, the typed frame is cleaned
+                with span('read'):
+                    df, df_typed = reader.read_typed(uploaded_file)
+                logger.debug(f'DataFileUploadAPIView: Successfully parsed {reader.file_type} file')
+            except ParserError as e:
+                logger.error(f"DataFileUploadAPIView: Error occurred while parsing {reader.file_type} file: {file_name}, error: {str(e)}")
+                return Response({"message": f"Error occurred while parsing file: {file_name}"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
             
+            if self.is_preview_requested(request) and len(df) > settings.DATASET_PREVIEW["ROWS"]:
+                try:
+                    df_preview_result = self.preview_dataframe(df_typed)
+                    logger.debug('DataFileUploadAPIView: Dataframe preview cleaned successfully')
+                except ValueError as e:
+                    logger.error(f"DataFileUploadAPIView: Error cleaning dataframe preview: {str(e)}")
+                    return Response({ "message" : "Error cleaning dataframe", "error" : str(e) }, status=status.HTTP_400_BAD_REQUEST)
+                except Exception as e:
+                    logger.error(f"DataFileUploadAPIView: Unexpected error cleaning dataframe preview: {str(e)}")
+                    return Response({ "message" : "Error cleaning dataframe", "error" : str(e) }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+                # Publishing the preview, the full dataset replaces it under the same key once cleaned
+                df_preview = df_preview_result["data"]
+                with span('cache'):
+                    dataset_cache.set_frames({ original_df_key : df })
+                    dataset_cache.set_frames({ cleaned_df_key : df_preview }, status=dataset_cache.STATUS_PROCESSING)
+                cleaning_executor.submit(self.finish_cleaning, df_typed, cleaned_df_key)
+                logger.debug(f'DataFileUploadAPIView: Preview cached, cleaning {len(df)} rows in background')
+
+                return self.build_response("Data uploaded, returning a preview while the full dataset is processed", DataFrameRows(df_preview), df_preview_result["dtypes"], original_df_key, cleaned_df_key, request, dataset_cache.STATUS_PROCESSING)
+
             try:
-                df_cleaning_result = self.clean_dataframe(df)
+                df_cleaning_result = self.clean_dataframe(df_typed)
                 logger.debug('DataFileUploadAPIView: Dataframe cleaned successfully')
             except ValueError as e:
                 logger.error(f"DataFileUploadAPIView: Error cleaning dataframe: {str(e)}")
@@ -97,52 +309,141 @@ class DataFileUploadAPIView(APIView):
             
             
             df_cleaned = df_cleaning_result["data"]
-            
-            df_original_bytes = pickle.dumps(df)
-            df_cleaned_bytes = pickle.dumps(df_cleaned)
 
             # Setting original and cleaned dataframe in cache
-            original_df_key = 'df_' + os.path.splitext(file_name)[0] + '_original'
-            cleaned_df_key = 'df_' + os.path.splitext(file_name)[0] + '_cleaned'
-            cache.set(original_df_key, df_original_bytes)
-            cache.set(cleaned_df_key, df_cleaned_bytes)
-            logger.debug('DataFileUploadAPIView: Dataframes cached successfully')
-
-            for col_name in df_cleaned:
-                if df_cleaned[col_name].dtype == 'complex':
-                    df_cleaned[col_name] = df_cleaned[col_name].astype(str)
-            
-            # Instantiate paginator for supporting paginated data
-            paginator = CustomPagination()
-            paginated_data = paginator.paginate_queryset(df_cleaned.to_dict(orient='records'), request)
-            logger.debug('DataFileUploadAPIView: Data paginated successfully')
-            
-            return Response(
-                {
-                    "message": "Data uploaded and processed successfully", 
-                    "dtypes": df_cleaning_result["dtypes"], 
-                    "data": paginated_data, 
-                    "original_data_key" : original_df_key,
-                    "cleaned_data_key" : cleaned_df_key
-                },  status=status.HTTP_200_OK)
+            with span('cache'):
+                dataset_cache.set_frames({ original_df_key : df, cleaned_df_key : df_cleaned })
+            logger.debug(f'DataFileUploadAPIView: Dataframes cached successfully, cache stats: {cache.get_stats()}')
+
+            return self.build_response("Data uploaded and processed successfully", DataFrameRows(df_cleaned), df_cleaning_result["dtypes"], original_df_key, cleaned_df_key, request)
         else:
             logger.error(f"DataFileUploadAPIView: Invalid file data serializer: {file_data_serializer.errors}")
             return Response(file_data_serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    def is_preview_requested(self, request):
+        return request.query_params.get(self.preview_query_param, '').lower() in ('1', 'true', 'yes')
+
+    def is_all_sheets_requested(self, request):
+        return request.query_params.get(self.sheets_query_param, '').lower() == 'all'
+
+    def upload_sheets(self, request, uploaded_file, file_extension, dataset_id):
+        """
+        Process each sheet of an uploaded workbook as its own dataset, the sheets not processed yet are read in parallel.
+
+        Args:
+        - request (Request): The upload request.
+        - uploaded_file (UploadedFile): The uploaded workbook.
+        - file_extension (str): Extension of the uploaded file.
+        - dataset_id (str): Id of the uploaded workbook, the ids of the sheet datasets are derived from it.
+
+        Returns:
+        - Response: The datasets of the sheets in their order, with the sheet name and the same fields as single dataset uploads.
+          Sheets failing to be cleaned have a 'failed' status and the error instead.
+        """
+
+        reader = reader_registry.get_reader(file_extension)
+        if reader is None or not hasattr(reader, 'read_sheets'):
+            logger.error(f"DataFileUploadAPIView : upload_sheets : Sheets requested for file type: {file_extension}")
+            return Response({"message": "Sheets can only be read from Excel files"}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            sheet_names = reader.get_sheet_names(uploaded_file)
+        except (ParserError, ValueError) as e:
+            logger.error(f"DataFileUploadAPIView : upload_sheets : Error occurred while listing sheets of file: {uploaded_file.name}, error: {str(e)}")
+            return Response({"message": f"Error occurred while parsing file: {uploaded_file.name}", "error" : str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        except Exception as e:
+            logger.error(f"DataFileUploadAPIView : upload_sheets : Unexpected error listing sheets of file: {uploaded_file.name}, error: {str(e)}")
+            return Response({"message": f"Error occurred while parsing file: {uploaded_file.name}", "error" : str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        sheet_keys = {sheet_name: get_dataset_keys(get_sheet_dataset_id(dataset_id, sheet_name)) for sheet_name in sheet_names}
+
+        # Only the sheets not processed yet are read
+        sheet_metas = {}
+        for sheet_name in sheet_names:
+            if dataset_cache.contains(get_sheet_dataset_id(dataset_id, sheet_name)):
+                meta = dataset_cache.get_meta(sheet_keys[sheet_name][1])
+                if meta is not None and dataset_cache.get_status(meta) != dataset_cache.STATUS_FAILED:
+                    sheet_metas[sheet_name] = meta
+
+        try:
+            with span('read'):
+                sheets = read_sheets(reader, uploaded_file, [sheet_name for sheet_name in sheet_names if sheet_name not in sheet_metas])
+        except (ParserError, ValueError) as e:
+            logger.error(f"DataFileUploadAPIView : upload_sheets : Error occurred while reading sheets of file: {uploaded_file.name}, error: {str(e)}")
+            return Response({"message": f"Error occurred while parsing file: {uploaded_file.name}", "error" : str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        except Exception as e:
+            logger.error(f"DataFileUploadAPIView : upload_sheets : Unexpected error reading sheets of file: {uploaded_file.name}, error: {str(e)}")
+            return Response({"message": f"Error occurred while parsing file: {uploaded_file.name}", "error" : str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        logger.debug(f'DataFileUploadAPIView : upload_sheets : Read {len(sheets)} of {len(sheet_names)} sheets')
+
+        datasets = []
+        for sheet_name in sheet_names:
+            original_df_key, cleaned_df_key = sheet_keys[sheet_name]
+            if sheet_name in sheet_metas:
+                meta = sheet_metas[sheet_name]
+                dataset = self.build_dataset(DatasetRows(dataset_cache, cleaned_df_key, meta), dataset_cache.get_dtypes(meta), original_df_key, cleaned_df_key, request, dataset_cache.get_status(meta))
+            else:
+                # A sheet failing is reported in its entry, the other sheets are still processed and cached
+                try:
+                    df_cleaning_result = self.clean_dataframe(sheets[sheet_name])
+                    with span('cache'):
+                        dataset_cache.set_frames({ original_df_key : sheets[sheet_name], cleaned_df_key : df_cleaning_result["data"] })
+                except Exception as e:
+                    logger.error(f'DataFileUploadAPIView : upload_sheets : Error cleaning sheet "{sheet_name}": {str(e)}')
+                    datasets.append({"sheet": sheet_name, "message" : f'Error cleaning sheet "{sheet_name}"', "error" : str(e), "status" : dataset_cache.STATUS_FAILED})
+                    continue
+                dataset = self.build_dataset(DataFrameRows(df_cleaning_result["data"]), df_cleaning_result["dtypes"], original_df_key, cleaned_df_key, request)
+            datasets.append({"sheet": sheet_name, **dataset})
+
+        return Response({"message": "Workbook uploaded, each sheet processed as its own dataset", "datasets": datasets}, status=status.HTTP_200_OK)
+
+    def build_dataset(self, cleaned_rows, df_cleaned_dtypes, original_df_key, cleaned_df_key, request, cleaning_status=DatasetCacheManager.STATUS_READY):
+        """
+        Returns:
+        - dict: Dtypes, first requested page, keys and status of an uploaded dataset.
+        """
+
+        # Instantiate paginator for supporting paginated data
+        paginator = CustomPagination()
+        df_page = paginator.paginate_rows(cleaned_rows, request)
+
+        # Encoding only the rows of the requested page, column by column
+        with span('render'):
+            paginated_data = dataframe_to_records(df_page)
+        logger.debug('DataFileUploadAPIView: Data paginated successfully')
+
+        return {
+            "dtypes": df_cleaned_dtypes, 
+            "data": paginated_data, 
+            "original_data_key" : original_df_key,
+            "cleaned_data_key" : cleaned_df_key,
+            "status" : cleaning_status
+        }
+
+    def build_response(self, message, cleaned_rows, df_cleaned_dtypes, original_df_key, cleaned_df_key, request, cleaning_status=DatasetCacheManager.STATUS_READY):
+        return Response(
+            {
+                "message": message, 
+                **self.build_dataset(cleaned_rows, df_cleaned_dtypes, original_df_key, cleaned_df_key, request, cleaning_status)
+            },  status=status.HTTP_200_OK)
         
     def clean_dataframe(self, df):
         logger.debug("DataFileUploadAPIView : clean_dataframe : Data types received for cleaning")
         logger.debug(df.dtypes)
 
+        start = time.perf_counter()
+
         # Inferring data types of received data
         logger.debug("DataFileUploadAPIView : clean_dataframe : Inferring received data types")
-        df_inferred_types = inference_engine.infer_data_types(df)
+        with span('clean.inference'):
+            df_inferred_types = inference_engine.infer_data_types(df)
 
         logger.debug("DataFileUploadAPIView : clean_dataframe : Inferred types")
         logger.debug(df_inferred_types)
 
         # Converting data to inferrred data types
         logger.debug("DataFileUploadAPIView : clean_dataframe : Converting received data to inferred types")
-        df_cleaned = conversion_engine.convert_data_types(df, df_inferred_types)
+        with span('clean.conversion'):
+            df_cleaned = conversion_engine.convert_data_types(df, df_inferred_types)
         logger.debug("DataFileUploadAPIView : clean_dataframe : Converted received data to inferred types")
         logger.debug(df_cleaned)
 
@@ -152,64 +453,544 @@ class DataFileUploadAPIView(APIView):
             df_cleaned_dtypes[col_name] = str(df_cleaned[col_name].dtype)
         
         logger.debug(str([(df_cleaned[col_name].name, str(df_cleaned[col_name].dtype)) for col_name in df_cleaned]))
+        record_cleaning(len(df), time.perf_counter() - start, df_inferred_types)
 
         return {
             "dtypes" : df_cleaned_dtypes,
             "data" : df_cleaned
         }
+
+    def get_inference_sample(self, df):
+        """
+        Get the rows types are inferred from in preview mode, the leading rows plus a random sample of the other rows.
+
+        Args:
+        - df (pd.DataFrame): Uploaded dataframe.
+
+        Returns:
+        - pd.DataFrame: Rows of the sample.
+        """
+
+        preview_rows = settings.DATASET_PREVIEW["ROWS"]
+        df_rest = df.iloc[preview_rows:]
+        sample_rows = min(settings.DATASET_PREVIEW["SAMPLE_ROWS"], len(df_rest))
+        return pd.concat([df.iloc[:preview_rows], df_rest.sample(n=sample_rows, random_state=0)])
+
+    def preview_dataframe(self, df):
+        """
+        Clean the leading rows of a dataframe with types inferred from a sample of the dataframe (see get_inference_sample).
+
+        Returns:
+        - dict: Dtypes of the cleaned leading rows (`dtypes`) and the cleaned leading rows (`data`).
+        """
+
+        logger.debug("DataFileUploadAPIView : preview_dataframe : Inferring data types from a sample")
+        with span('clean.inference'):
+            df_inferred_types = inference_engine.infer_data_types(self.get_inference_sample(df))
+        logger.debug(df_inferred_types)
+
+        with span('clean.conversion'):
+            df_preview = conversion_engine.convert_data_types(df.iloc[:settings.DATASET_PREVIEW["ROWS"]], df_inferred_types)
+
+        df_preview_dtypes = {}
+        for col_name in df_preview:
+            df_preview_dtypes[col_name] = str(df_preview[col_name].dtype)
+
+        return {
+            "dtypes" : df_preview_dtypes,
+            "data" : df_preview
+        }
+
+    def finish_cleaning(self, df, cleaned_df_key):
+        """
+        Clean a full dataframe and publish it in place of its preview, run in background by the cleaning executor.
+        The dtypes of the published frame are inferred from all rows and may differ from the ones of the preview.
+
+        Args:
+        - df (pd.DataFrame): Uploaded dataframe, with the types hinted by the reader.
+        - cleaned_df_key (str): Key the preview was published under.
+        """
+
+        # Collected in the thread of the executor, the instrumentation is only logged
+        with instrument(trace_memory=settings.DATASET_INSTRUMENTATION["TRACE_MEMORY"]) as instrumentation:
+            try:
+                df_cleaning_result = self.clean_dataframe(df)
+                with span('cache'):
+                    dataset_cache.set_frame(cleaned_df_key, df_cleaning_result["data"], status=dataset_cache.STATUS_READY)
+                logger.debug(f'DataFileUploadAPIView : finish_cleaning : Published cleaned dataframe for key: {cleaned_df_key}')
+            except Exception as e:
+                logger.error(f'DataFileUploadAPIView : finish_cleaning : Error cleaning dataframe for key: {cleaned_df_key}: {str(e)}')
+                try:
+                    dataset_cache.set_status(cleaned_df_key, dataset_cache.STATUS_FAILED, error=str(e))
+                except KeyError:
+                    pass # Evicted in the meantime
+
+        self.log_instrumentation('finish_cleaning', instrumentation)
     
-class PaginatedDataView(APIView):
+class BatchDataFileUploadAPIView(APIView):
+    """
+    API view for uploading several data files in a single request, each file processed as its own dataset.
+
+    The files are sent as repeated `files` fields of a multipart request. They are read and cleaned concurrently in
+    a bounded pool of worker processes (see settings.DATASET_BATCH_UPLOADS), and files already processed are served
+    from the cache. The response is streamed as JSON lines (`application/x-ndjson`), one per file as soon as it is
+    processed: the position (`index`) and name (`file`) of the file, its `status` ('ready' or 'failed') and either its
+    keys and dtypes or the `error`.
+
+    With `?reuse_schema=true` the first file is cleaned before the others, and the data types inferred from it are
+    applied to the columns of the other files with the same names. Only their other columns are inferred.
+    """
+
+    parser_classes = (MultiPartParser, FormParser)
+    serializer_class = BatchDataFileSerializer
+    reuse_schema_query_param = 'reuse_schema'
+
+    def post(self, request):
+        logger.debug('BatchDataFileUploadAPIView : post : Beginning of method')
+
+        serializer = self.serializer_class(data=request.data)
+        if not serializer.is_valid():
+            logger.error(f'BatchDataFileUploadAPIView : post : Invalid file data serializer: {serializer.errors}')
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        uploaded_files = serializer.validated_data["files"]
+        if len(uploaded_files) > settings.DATASET_BATCH_UPLOADS["MAX_FILES"]:
+            logger.error(f'BatchDataFileUploadAPIView : post : Received {len(uploaded_files)} files')
+            return Response({"message": f'At most {settings.DATASET_BATCH_UPLOADS["MAX_FILES"]} files can be uploaded at once'}, status=status.HTTP_400_BAD_REQUEST)
+
+        lines = self.process_files(uploaded_files, self.is_schema_reuse_requested(request))
+        return StreamingHttpResponse((json.dumps(line) + '\n' for line in lines), content_type='application/x-ndjson')
+
+    def is_schema_reuse_requested(self, request):
+        return request.query_params.get(self.reuse_schema_query_param, '').lower() in ('1', 'true', 'yes')
+
+    def process_files(self, uploaded_files, reuse_schema):
+        """
+        Process uploaded files, yielding the line of each file as soon as it is processed.
+
+        Args:
+        - uploaded_files (list): The uploaded files.
+        - reuse_schema (bool): If True, the data types inferred from the first file are applied to the other files.
+
+        Returns:
+        - generator: Lines of the files (dicts), in the order the files are processed.
+        """
+
+        files = list(enumerate(uploaded_files))
+        if not reuse_schema:
+            for line, _ in self.process_concurrently(files):
+                yield line
+            return
+
+        data_types = None
+        for line, data_types in self.process_concurrently(files[:1]):
+            # The types of a file served from the cache are the dtypes of its cached dataset
+            if data_types is None and line["status"] != DatasetCacheManager.STATUS_FAILED:
+                data_types = self.get_cached_data_types(line["dtypes"])
+            yield line
+        logger.debug(f'BatchDataFileUploadAPIView : process_files : Reusing the data types of the first file: {data_types}')
+        for line, _ in self.process_concurrently(files[1:], data_types):
+            yield line
+
+    def process_concurrently(self, files, data_types=None):
+        """
+        Clean files in the pool of worker processes, with at most as many files in flight as there are workers.
+
+        Args:
+        - files (list): Positions in the request and uploaded files.
+        - data_types (dict): Data types of columns known beforehand (see data_cleanser.cleaning.clean_dataframe).
+
+        Returns:
+        - generator: Tuples of the line of each file as soon as it is processed and the data types inferred for it
+          (None if the file failed or was served from the cache).
+        """
+
+        queued_files = deque()
+        for index, uploaded_file in files:
+            file_extension = os.path.splitext(uploaded_file.name)[1]
+            record_upload_size(uploaded_file, file_extension)
+            reader = reader_registry.get_reader(file_extension)
+            if reader is None:
+                logger.error(f'BatchDataFileUploadAPIView : process_concurrently : Unsupported file type: {file_extension}')
+                yield self.build_failure_line(index, uploaded_file.name, 'Received unsupported data file type'), None
+                continue
+
+            # Data types reused from another file are a processing setting, the result differs from the one of a single upload
+            processing_settings = {"extension": file_extension.lower(), "inference_threshold": inference_engine.INFERENCE_THRESHOLD_PERCENTAGE}
+            if data_types is not None:
+                processing_settings["data_types"] = data_types
+            dataset_id = compute_dataset_id(uploaded_file, **processing_settings)
+            original_df_key, cleaned_df_key = get_dataset_keys(dataset_id)
+
+            if dataset_cache.contains(dataset_id):
+                meta = dataset_cache.get_meta(cleaned_df_key)
+                if meta is not None and dataset_cache.get_status(meta) != dataset_cache.STATUS_FAILED:
+                    logger.debug(f'BatchDataFileUploadAPIView : process_concurrently : Dataset "{dataset_id}" already processed')
+                    yield self.build_line(index, uploaded_file.name, dataset_cache.get_dtypes(meta), original_df_key, cleaned_df_key, dataset_cache.get_status(meta)), None
+                    continue
+            queued_files.append((index, uploaded_file, reader, original_df_key, cleaned_df_key))
+
+        pending_files = {}
+        try:
+            while queued_files or pending_files:
+                # Reading the content of the next files only once a worker is free, bounding the memory held
+                while queued_files and len(pending_files) < settings.DATASET_BATCH_UPLOADS["PROCESS_WORKERS"]:
+                    index, uploaded_file, reader, original_df_key, cleaned_df_key = queued_files.popleft()
+                    uploaded_file.seek(0)
+                    future = submit_file_cleaning(reader, uploaded_file.read(), data_types)
+                    pending_files[future] = (index, uploaded_file.name, original_df_key, cleaned_df_key)
+
+                done_futures, _ = wait(pending_files, return_when=FIRST_COMPLETED)
+                for future in done_futures:
+                    index, file_name, original_df_key, cleaned_df_key = pending_files.pop(future)
+                    try:
+                        result = get_file_cleaning(future)
+                        dataset_cache.set_frames({ original_df_key : result["original"], cleaned_df_key : result["data"] })
+                        record_cleaning(len(result["original"]), result["seconds"], result["inferred_dtypes"])
+                    except Exception as e:
+                        logger.error(f'BatchDataFileUploadAPIView : process_concurrently : Error processing file "{file_name}": {str(e)}')
+                        yield self.build_failure_line(index, file_name, str(e)), None
+                        continue
+
+                    logger.debug(f'BatchDataFileUploadAPIView : process_concurrently : File "{file_name}" processed and cached')
+                    yield self.build_line(index, file_name, result["dtypes"], original_df_key, cleaned_df_key), result["inferred_dtypes"]
+        finally:
+            # The stream was closed early (e.g. the client disconnected), the files not started yet are dropped
+            for future in pending_files:
+                future.cancel()
+
+    def get_cached_data_types(self, df_cleaned_dtypes):
+        """
+        Get the data types to reuse from the dtypes of a cached dataset, without inferring them again.
+
+        Args:
+        - df_cleaned_dtypes (dict): Mapping of column names to dtypes of the cached dataset.
+
+        Returns:
+        - dict: Data types of the columns, columns with dtypes that are not conversion types (e.g. timezone aware
+          datetimes) are left out and inferred.
+        """
+
+        conversion_types = {value for name, value in vars(DataTypes).items() if name.isupper()}
+        data_types = {}
+        for col_name, dtype in df_cleaned_dtypes.items():
+            dtype = DataTypes.COMPLEX if dtype.startswith(DataTypes.COMPLEX) else dtype
+            if dtype in conversion_types:
+                data_types[col_name] = dtype
+        return data_types
+
+    def build_line(self, index, file_name, df_cleaned_dtypes, original_df_key, cleaned_df_key, cleaning_status=DatasetCacheManager.STATUS_READY):
+        return {
+            "index": index,
+            "file": file_name,
+            "status": cleaning_status,
+            "dtypes": df_cleaned_dtypes,
+            "original_data_key": original_df_key,
+            "cleaned_data_key": cleaned_df_key,
+        }
+
+    def build_failure_line(self, index, file_name, error):
+        return {"index": index, "file": file_name, "status": DatasetCacheManager.STATUS_FAILED, "error": error}
+
+class ColumnsQueryMixin:
+    """
+    Mixin for views over a cached dataset taking the names of the columns to return from the `columns` query parameter.
+    """
+
+    columns_query_param = 'columns'
+
+    def get_requested_columns(self, request, meta):
+        """
+        Returns:
+        - list or None: Names of the requested columns in the requested order without duplicates, None if all columns are requested.
+
+        Raises:
+        - ValidationError: If one of the requested columns does not exist.
+        """
+
+        requested = [col_name.strip() for value in request.query_params.getlist(self.columns_query_param) for col_name in value.split(',') if col_name.strip()]
+        if not requested:
+            return None
+
+        columns_by_name = {str(col_name): col_name for col_name in meta["columns"]}
+        unknown = [col_name for col_name in requested if col_name not in columns_by_name]
+        if unknown:
+            raise ValidationError({self.columns_query_param: f'Unknown columns: {unknown}'})
+
+        return [columns_by_name[col_name] for col_name in dict.fromkeys(requested)]
+
+
+class SortFilterQueryMixin:
+    """
+    Mixin for views over a cached dataset taking a sort column from the `sort` query parameter and
+    row filters from the `filter` query parameters (see PaginatedDataView).
+    """
+
+    sort_query_param = 'sort'
+    filter_query_param = 'filter'
+
+    def get_requested_query(self, request, meta):
+        """
+        Returns:
+        - tuple: Sort (column name, ascending) or None, and the list of filters (column name, operator, operand).
+
+        Raises:
+        - ValidationError: If the sort or one of the filters is malformed or refers to a column that does not exist.
+        """
+
+        columns_by_name = {str(col_name): col_name for col_name in meta["columns"]}
+
+        sort = None
+        sort_value = request.query_params.get(self.sort_query_param)
+        if sort_value:
+            try:
+                col_name, ascending = parse_sort(sort_value)
+            except ValueError as e:
+                raise ValidationError({self.sort_query_param: str(e)})
+            if col_name not in columns_by_name:
+                raise ValidationError({self.sort_query_param: f'Unknown column: {col_name}'})
+            sort = (columns_by_name[col_name], ascending)
+
+        filters = []
+        for filter_value in request.query_params.getlist(self.filter_query_param):
+            try:
+                col_name, filter_operator, operand = parse_filter(filter_value)
+            except ValueError as e:
+                raise ValidationError({self.filter_query_param: str(e)})
+            if col_name not in columns_by_name:
+                raise ValidationError({self.filter_query_param: f'Unknown column: {col_name}'})
+            filters.append((columns_by_name[col_name], filter_operator, operand))
+
+        return sort, filters
+
+
+class PaginatedDataView(ColumnsQueryMixin, SortFilterQueryMixin, APIView):
     """
     This view returns a page of data from the cleaned dataset.
 
     The view takes a key for the cleaned data stored in the cache and a page number
     from the request. It then returns the corresponding page of data from the dataset.
+
+    Query parameters:
+    - page: Page number (default 1), ignored when an offset is passed.
+    - offset: First row of the page, the response includes the offset of the next page (`next_offset`).
+    - page_size: Number of rows per page (default 10, at most 1000).
+    - columns: Comma separated names of the columns to return (default all columns).
+    - sort: Name of the column to sort by, prefixed with '-' for a descending order e.g. `sort=-age`.
+    - filter: Predicate rows must match, of the form `<column>:<operator>:<value>` e.g. `filter=age:gte:18`,
+      can be repeated. Operators are eq, ne, gt, gte, lt, lte, contains (case insensitive), isnull and notnull.
+
+    Only the requested columns of the requested rows are loaded from the cache. Sort permutations and
+    filter masks are cached per column, so repeated queries only fetch the rows of the page.
     """
 
     def get(self, request, cleaned_data_key):
         
         logger.debug(f'PaginatedDataView : get : Requesting paginated data for key: {cleaned_data_key}')
         
-        # Retrieve the cleaned data from the cache
-        df_cleaned_bytes = cache.get(cleaned_data_key)
-        if df_cleaned_bytes is None:
+        # Retrieve the stored layout of the cleaned data from the cache
+        meta = dataset_cache.get_meta(cleaned_data_key)
+        if meta is None:
             logger.error(f'PaginatedDataView : get : Data not found for key: {cleaned_data_key}')
             return Response({"message": "Data not found. Please check your data key"}, status=status.HTTP_404_NOT_FOUND)
 
-        df_cleaned = pickle.loads(df_cleaned_bytes)
-        logger.debug(f'PaginatedDataView : get : Successfully retrieved cleaned data from cache for key: {cleaned_data_key}')
-
-        # Create updated dtypes dict to be sent to the client
-        df_cleaned_dtypes = {} 
-        for col_name in df_cleaned:
-            df_cleaned_dtypes[col_name] = str(df_cleaned[col_name].dtype)
+        columns = self.get_requested_columns(request, meta)
+        sort, filters = self.get_requested_query(request, meta)
 
-        # Converting complex dtypes columns to strings to allow json serialization
-        for col_name in df_cleaned:
-            if df_cleaned[col_name].dtype == 'complex':
-                df_cleaned[col_name] = df_cleaned[col_name].astype(str)
+        # Rows of the sorted and filtered view, from the cached sort permutations and filter masks
+        row_order = None
+        if sort is not None or filters:
+            try:
+                row_order = DatasetQuery(dataset_cache, cleaned_data_key, meta).get_row_order(sort, filters)
+            except ValueError as e:
+                raise ValidationError({self.filter_query_param: str(e)})
+            if row_order is None:
+                logger.error(f'PaginatedDataView : get : Data evicted while being queried for key: {cleaned_data_key}')
+                return Response({"message": "Data not found. Please check your data key"}, status=status.HTTP_404_NOT_FOUND)
 
+        # Only the projected columns of the requested rows are fetched
         paginator = CustomPagination()
-        paginated_data = paginator.paginate_queryset(df_cleaned.to_dict(orient='records'), request)
+        df_page = paginator.paginate_rows(DatasetRows(dataset_cache, cleaned_data_key, meta, columns, row_order), request)
+        if df_page is None:
+            logger.error(f'PaginatedDataView : get : Data evicted while being read for key: {cleaned_data_key}')
+            return Response({"message": "Data not found. Please check your data key"}, status=status.HTTP_404_NOT_FOUND)
+
+        logger.debug(f'PaginatedDataView : get : Successfully retrieved cleaned data from cache for key: {cleaned_data_key}')
+
+        # Encoding only the rows of the requested page, column by column (complex, datetime, timedelta and categorical values included)
+        paginated_data = dataframe_to_records(df_page)
         logger.debug(f'PaginatedDataView : get : Returning paginated cleaned data for key: {cleaned_data_key}')
 
         return Response({
             "message": "Successfully retrieved paginated data.", 
             "data": paginated_data, 
-            "cleaned_data_key" : cleaned_data_key}, 
+            "pagination": paginator.get_pagination_info(),
+            "cleaned_data_key" : cleaned_data_key,
+            "status" : dataset_cache.get_status(meta)}, 
+            status=status.HTTP_200_OK)
+
+class DatasetProfileView(ColumnsQueryMixin, APIView):
+    """
+    This view returns per-column statistics of the cleaned dataset (see data_cleanser.profiling.Profiler)
+    i.e. null counts, min/max, distinct counts, top values and histograms.
+
+    Query parameters:
+    - columns: Comma separated names of the columns to profile (default all columns).
+
+    Profiles are cached next to the dataset per column and dropped when a column is replaced, so only
+    the columns changed since the last request (e.g. by a data type update) are loaded and profiled again.
+    """
+
+    profile_name = 'profile'
+
+    def get(self, request, cleaned_data_key):
+
+        logger.debug(f'DatasetProfileView : get : Requesting profile for key: {cleaned_data_key}')
+
+        meta = dataset_cache.get_meta(cleaned_data_key)
+        if meta is None:
+            logger.error(f'DatasetProfileView : get : Data not found for key: {cleaned_data_key}')
+            return Response({"message": "Data not found. Please check your data key"}, status=status.HTTP_404_NOT_FOUND)
+
+        col_names = self.get_requested_columns(request, meta) or meta["columns"]
+
+        # Serving cached profiles, versions are read before the columns so profiles of replaced columns are never stored as current
+        versions = {col_name: dataset_cache.get_column_version(cleaned_data_key, col_name, meta) for col_name in col_names}
+        profiles = {col_name: dataset_cache.get_column_data(cleaned_data_key, col_name, self.profile_name, versions[col_name], meta) for col_name in col_names}
+
+        # Profiling the other columns, loading them in a single read
+        missing_col_names = [col_name for col_name, profile in profiles.items() if profile is None]
+        if missing_col_names:
+            df_missing = dataset_cache.get_columns(cleaned_data_key, missing_col_names, meta=meta)
+            if df_missing is None:
+                logger.error(f'DatasetProfileView : get : Data evicted while being read for key: {cleaned_data_key}')
+                return Response({"message": "Data not found. Please check your data key"}, status=status.HTTP_404_NOT_FOUND)
+
+            for position, col_name in enumerate(missing_col_names):
+                profiles[col_name] = profiler.profile_column(df_missing.iloc[:, position])
+                dataset_cache.set_column_data(cleaned_data_key, col_name, self.profile_name, versions[col_name], profiles[col_name], meta)
+
+        logger.debug(f'DatasetProfileView : get : Profiled {len(missing_col_names)} of {len(col_names)} columns for key: {cleaned_data_key}')
+
+        return Response({
+            "message": "Successfully profiled data.",
+            "rows": meta["rows"],
+            "profile": {str(col_name): profiles[col_name] for col_name in col_names},
+            "cleaned_data_key" : cleaned_data_key},
             status=status.HTTP_200_OK)
 
-class UpdateColumnsDataTypesAPIView(APIView):
+class DatasetExportView(ColumnsQueryMixin, APIView):
+    """
+    This view streams the cleaned dataset as a file download, chunk by chunk from the cache.
+
+    Query parameters:
+    - file_format: Format of the exported file i.e. csv (default), parquet or arrow (Arrow IPC stream).
+      Parquet and Arrow require pyarrow and keep the data types of the cleaned columns.
+    - columns: Comma separated names of the columns to export (default all columns).
+
+    Only one chunk of rows is loaded at a time and exported chunks are not kept in the local frame cache,
+    so memory use does not grow with the size of the dataset.
+    """
+
+    format_query_param = 'file_format' # 'format' is reserved by DRF for content negotiation
+
+    def get(self, request, cleaned_data_key):
+
+        logger.debug(f'DatasetExportView : get : Requesting export for key: {cleaned_data_key}')
+
+        export_format = request.query_params.get(self.format_query_param, ExportFormats.CSV).lower()
+        if export_format not in get_available_formats():
+            raise ValidationError({self.format_query_param: f'Unsupported export format "{export_format}". Available formats: {", ".join(get_available_formats())}'})
+
+        meta = dataset_cache.get_meta(cleaned_data_key)
+        if meta is None:
+            logger.error(f'DatasetExportView : get : Data not found for key: {cleaned_data_key}')
+            return Response({"message": "Data not found. Please check your data key"}, status=status.HTTP_404_NOT_FOUND)
+
+        if dataset_cache.get_status(meta) == dataset_cache.STATUS_PROCESSING:
+            logger.info(f'DatasetExportView : get : Rejecting export of data still being processed for key: {cleaned_data_key}')
+            return Response({"message": "Data is still being processed. Please retry once it is ready"}, status=status.HTTP_409_CONFLICT)
+
+        columns = self.get_requested_columns(request, meta)
+        content_type, extension, stream_writer, _ = EXPORT_FORMATS[export_format]
+
+        response = StreamingHttpResponse(self.stream(cleaned_data_key, stream_writer(iter_frame_chunks(dataset_cache, cleaned_data_key, meta, columns))), content_type=content_type)
+        response["Content-Disposition"] = f'attachment; filename="{cleaned_data_key}{extension}"'
+        return response
+
+    def stream(self, cleaned_data_key, chunks):
+        """
+        Yield the encoded chunks of an export, logging its outcome.
+
+        Args:
+        - cleaned_data_key (str): Key of the exported dataset.
+        - chunks (generator): Encoded chunks of the exported file.
+
+        Raises:
+        - DatasetEvictedError: If the dataset is evicted during the export, the download is then left incomplete.
+        """
+
+        try:
+            yield from chunks
+        except DatasetEvictedError:
+            logger.error(f'DatasetExportView : stream : Data evicted while being exported for key: {cleaned_data_key}')
+            raise
+        logger.debug(f'DatasetExportView : stream : Successfully exported data for key: {cleaned_data_key}')
+
+class ColumnUpdatesMixin:
+    """
+    Mixin for views updating the data types of columns of a cached dataset, column by column.
+
+    Only the updated columns of the original dataset are fetched and only the updated columns of the
+    cleaned dataset are written back. With `?changed_only=true` the response only includes the updated columns.
+
+    Concurrent updates of different columns of a dataset are merged, an update of columns updated by
+    another request since it started fails with a 409 and can be retried on the new columns.
+    """
+
+    changed_only_query_param = 'changed_only'
+
+    def is_changed_only_requested(self, request):
+        return request.query_params.get(self.changed_only_query_param, '').lower() in ('1', 'true', 'yes')
+
+    def get_updated_col_names(self, col_dtypes_updates):
+        return list(dict.fromkeys(col_dtype_update["col_name"] for col_dtype_update in col_dtypes_updates))
+
+    def get_unknown_columns(self, col_names, original_meta, cleaned_meta):
+        return [col_name for col_name in col_names if col_name not in original_meta["columns"] or col_name not in cleaned_meta["columns"]]
+
+    def get_conflict_response_data(self, error):
+        return {"message": "Columns were updated concurrently. Please retry", "error": str(error)}
+
+
+class UpdateColumnsDataTypesAPIView(ColumnUpdatesMixin, InstrumentationMixin, APIView):
     """
     This view updates the data types of specified columns along with the data formats in the dataset.
 
     It receives a request containing the changes to be made to the data types
     of certain columns and applies these changes to the cleaned dataset.
+    Only the updated columns are fetched, converted and cached (see ColumnUpdatesMixin), so updating a column
+    of a wide dataset costs the size of the column. The columns of updates of several columns are converted
+    concurrently in a pool of worker processes (see settings.DATASET_UPDATES) and cached in a single write.
+    Stages are timed per request (see InstrumentationMixin), `?instrument=true` adds the timings to the response.
     """
 
     serializer_class = DataTypesChangeRequestSerializer
 
     def post(self, request):
+        return self.run_instrumented(self.update_columns, request)
+
+    def build_conversion_error_response(self, col_name, type_to_cast, error):
+        if isinstance(error, ValueError):
+            logger.error(f'UpdateColumnsDataTypesAPIView : post : Error converting column "{col_name}" to type "{type_to_cast}": {str(error)}')
+            return Response({ "message" : "Error cleaning dataframe", "error" : str(error) }, status=status.HTTP_400_BAD_REQUEST)
+        if isinstance(error, TypeError):
+            logger.error(f'UpdateColumnsDataTypesAPIView : post : Invalid data passed for column "{col_name}": {str(error)}')
+            return Response({ "message" : "Invalid data passed", "error" : str(error) }, status=status.HTTP_400_BAD_REQUEST)
+        logger.error(f'UpdateColumnsDataTypesAPIView : post : Error cleaning dataframe for column "{col_name}": {str(error)}')
+        return Response({ "message" : "Error cleaning dataframe", "error" : str(error) }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    def update_columns(self, request):
         logger.debug('UpdateColumnsDataTypesAPIView : post : Beginning of method')
 
         serializer = self.serializer_class(data=request.data)
@@ -221,56 +1002,84 @@ class UpdateColumnsDataTypesAPIView(APIView):
             original_df_key = data["original_data_key"]
             cleaned_df_key = data["cleaned_data_key"]
 
-            # Loading original and cleaned dataframes from cache
-            original_df_bytes = cache.get(original_df_key)
-            original_df = pickle.loads(original_df_bytes)
+            # Columns can't be updated while the full dataset is cleaned in background, it would overwrite them
+            cleaned_meta = dataset_cache.get_meta(cleaned_df_key)
+            if cleaned_meta is not None and dataset_cache.get_status(cleaned_meta) == dataset_cache.STATUS_PROCESSING:
+                logger.error(f'UpdateColumnsDataTypesAPIView : post : Data is still being processed for key: {cleaned_df_key}')
+                return Response({"message": "Data is still being processed. Please retry once it is ready"}, status=status.HTTP_409_CONFLICT)
 
-            cleaned_df_bytes = cache.get(cleaned_df_key)
-            df_cleaned = pickle.loads(cleaned_df_bytes)
+            original_meta = dataset_cache.get_meta(original_df_key)
+            if original_meta is None or cleaned_meta is None:
+                logger.error(f'UpdateColumnsDataTypesAPIView : post : Data not found for keys: {original_df_key}, {cleaned_df_key}')
+                return Response({"message": "Data not found. Please check your data keys"}, status=status.HTTP_404_NOT_FOUND)
 
             col_dtypes_updates = data["dtypes"] # Fetch dtypes to update for the columns
+            updated_col_names = self.get_updated_col_names(col_dtypes_updates)
+            unknown_col_names = self.get_unknown_columns(updated_col_names, original_meta, cleaned_meta)
+            if unknown_col_names:
+                logger.error(f'UpdateColumnsDataTypesAPIView : post : Unknown columns: {unknown_col_names}')
+                return Response({"message": "Invalid data passed", "error": f'Unknown columns: {unknown_col_names}'}, status=status.HTTP_400_BAD_REQUEST)
 
-            for col_dtype_update in col_dtypes_updates:
-                col_name = col_dtype_update["col_name"]
-                type_to_cast = col_dtype_update["dtype"]
-                missing_values_handling_option = col_dtype_update["missing_values"]
-                default_value = col_dtype_update["default"]
-                invalid_values_handling_option = data["invalid_values"]
+            # Loading only the updated columns of the original dataframe from cache
+            with span('cache.read'):
+                original_columns = dataset_cache.get_columns(original_df_key, updated_col_names, meta=original_meta)
+            if original_columns is None:
+                logger.error(f'UpdateColumnsDataTypesAPIView : post : Data not found for key: {original_df_key}')
+                return Response({"message": "Data not found. Please check your data keys"}, status=status.HTTP_404_NOT_FOUND)
 
-                # Cast original dataframe column data to received type
-                try:
-                    original_df = conversion_engine.convert_col_date_type(original_df, col_name, type_to_cast, invalid_values_handling_option, missing_values_handling_option, default_value)
-                    logger.debug(f'UpdateColumnsDataTypesAPIView : post : Converted column "{col_name}" to type "{type_to_cast}"')
-                except ValueError as e:
-                    logger.error(f'UpdateColumnsDataTypesAPIView : post : Error converting column "{col_name}" to type "{type_to_cast}": {str(e)}')
-                    return Response({ "message" : "Error cleaning dataframe", "error" : str(e) }, status=status.HTTP_400_BAD_REQUEST)
-                except TypeError as e:
-                    logger.error(f'UpdateColumnsDataTypesAPIView : post : Invalid data passed for column "{col_name}": {str(e)}')
-                    return Response({ "message" : "Invalid data passed", "error" : str(e) }, status=status.HTTP_400_BAD_REQUEST)
-                except Exception as e:
-                    logger.error(f'UpdateColumnsDataTypesAPIView : post : Error cleaning dataframe for column "{col_name}": {str(e)}')
-                    return Response({ "message" : "Error cleaning dataframe", "error" : str(e) }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+            # Converting the columns concurrently in worker processes, each column through its updates in the requested order
+            col_updates = cleaning.group_column_updates([dict(col_dtype_update) for col_dtype_update in col_dtypes_updates])
+            invalid_values_handling_option = data["invalid_values"]
+            pending_conversions = {}
+            if len(col_updates) >= settings.DATASET_UPDATES["MIN_PARALLEL_COLUMNS"]:
+                pending_conversions = submit_column_conversions(original_columns, col_updates, invalid_values_handling_option)
 
-                # Replace updated column in the cleaned dataframe
-                df_cleaned[col_name] = original_df[col_name]
+            converted_columns = {}
+            with span('update.conversion'):
+                for col_name, updates in col_updates.items():
+                    types_to_cast = ' -> '.join(col_dtype_update["dtype"] for col_dtype_update in updates)
+                    try:
+                        if col_name in pending_conversions:
+                            converted_columns[col_name] = get_column_conversion(pending_conversions[col_name])
+                        else:
+                            converted_columns[col_name] = cleaning.convert_column(original_columns[col_name], updates, invalid_values_handling_option)
+                        logger.debug(f'UpdateColumnsDataTypesAPIView : post : Converted column "{col_name}" to type "{types_to_cast}"')
+                    except Exception as e:
+                        # Reporting the first failing column in the requested order, the conversions not started are dropped
+                        for future in pending_conversions.values():
+                            future.cancel()
+                        return self.build_conversion_error_response(col_name, types_to_cast, e)
 
-            # Caching the updated cleaned dataframe
-            df_cleaned_bytes = pickle.dumps(df_cleaned)
-            cache.set(cleaned_df_key, df_cleaned_bytes)
+            # Caching the updated columns only, which drops their cached sort permutations and filter masks and
+            # bumps their versions to invalidate the chunks held by other processes. The update fails if the columns
+            # were updated by another request since their meta was read
+            try:
+                with span('cache'):
+                    cleaned_meta = dataset_cache.set_columns(cleaned_df_key, converted_columns, base_meta=cleaned_meta)
+            except DatasetConflictError as e:
+                logger.error(f'UpdateColumnsDataTypesAPIView : post : Conflicting update for key: {cleaned_df_key}: {str(e)}')
+                return Response(self.get_conflict_response_data(e), status=status.HTTP_409_CONFLICT)
+            except KeyError:
+                logger.error(f'UpdateColumnsDataTypesAPIView : post : Data evicted while being updated for key: {cleaned_df_key}')
+                return Response({"message": "Data not found. Please check your data keys"}, status=status.HTTP_404_NOT_FOUND)
             logger.debug('UpdateColumnsDataTypesAPIView : post : Updated cleaned dataframe cached')
 
-            # Create updated dtypes dict to be sent to the client
-            df_cleaned_dtypes = {} 
-            for col_name in df_cleaned:
-                df_cleaned_dtypes[col_name] = str(df_cleaned[col_name].dtype)
-
-            # Converting complex dtypes columns to strings to allow json serialization
-            for col_name in df_cleaned:
-                if df_cleaned[col_name].dtype == 'complex':
-                    df_cleaned[col_name] = df_cleaned[col_name].astype(str)
+            # Dtypes sent to the client, of the updated columns only if requested
+            changed_only = self.is_changed_only_requested(request)
+            df_cleaned_dtypes = dataset_cache.get_dtypes(cleaned_meta)
+            if changed_only:
+                df_cleaned_dtypes = {col_name: df_cleaned_dtypes[col_name] for col_name in updated_col_names}
 
+            # Fetching the rows of the requested page only, the updated columns are held by the local cache
             paginator = CustomPagination()
-            paginated_data = paginator.paginate_queryset(df_cleaned.to_dict(orient='records'), request)
+            df_page = paginator.paginate_rows(DatasetRows(dataset_cache, cleaned_df_key, cleaned_meta, updated_col_names if changed_only else None), request)
+            if df_page is None:
+                logger.error(f'UpdateColumnsDataTypesAPIView : post : Data evicted while being read for key: {cleaned_df_key}')
+                return Response({"message": "Data not found. Please check your data keys"}, status=status.HTTP_404_NOT_FOUND)
+
+            # Encoding only the rows of the requested page, column by column (complex, datetime, timedelta and categorical values included)
+            with span('render'):
+                paginated_data = dataframe_to_records(df_page)
             logger.debug('UpdateColumnsDataTypesAPIView : post : Paginated the cleaned data')
 
             return Response({
@@ -283,3 +1092,66 @@ class UpdateColumnsDataTypesAPIView(APIView):
         
         logger.error(f'UpdateColumnsDataTypesAPIView : post : Validation failed for request data: {serializer.errors}')
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+class DatasetHistoryView(APIView):
+    """
+    Base view undoing or redoing the latest update of the data types of columns of the cleaned dataset.
+
+    Every update of columns keeps the columns it replaced in the cache (see DatasetCacheManager.set_columns), so
+    undoing or redoing it only swaps the columns referenced by the dataset, nothing is converted again. The number
+    of updates that can be undone is bounded by settings.DATASET_CACHE["HISTORY_LENGTH"].
+    The response holds the first page of the dataset, its data types and the number of updates left to undo and redo.
+    """
+
+    action = None # 'undo' or 'redo', the name of the DatasetCacheManager method restoring the columns
+
+    def post(self, request, cleaned_data_key):
+        view_name = type(self).__name__
+        logger.debug(f'{view_name} : post : Requesting {self.action} for key: {cleaned_data_key}')
+
+        # The history is dropped when the full dataset is cached after being cleaned in background
+        meta = dataset_cache.get_meta(cleaned_data_key)
+        if meta is not None and dataset_cache.get_status(meta) == dataset_cache.STATUS_PROCESSING:
+            logger.error(f'{view_name} : post : Data is still being processed for key: {cleaned_data_key}')
+            return Response({"message": "Data is still being processed. Please retry once it is ready"}, status=status.HTTP_409_CONFLICT)
+
+        try:
+            meta = getattr(dataset_cache, self.action)(cleaned_data_key)
+        except KeyError:
+            logger.error(f'{view_name} : post : Data not found for key: {cleaned_data_key}')
+            return Response({"message": "Data not found. Please check your data key"}, status=status.HTTP_404_NOT_FOUND)
+        except DatasetConflictError as e:
+            logger.error(f'{view_name} : post : Conflicting update for key: {cleaned_data_key}: {str(e)}')
+            return Response({"message": "Columns were updated concurrently. Please retry", "error": str(e)}, status=status.HTTP_409_CONFLICT)
+        if meta is None:
+            logger.error(f'{view_name} : post : Nothing to {self.action} for key: {cleaned_data_key}')
+            return Response({"message": f'Nothing to {self.action}'}, status=status.HTTP_409_CONFLICT)
+        logger.debug(f'{view_name} : post : Restored the columns of the cleaned dataframe for key: {cleaned_data_key}')
+
+        paginator = CustomPagination()
+        df_page = paginator.paginate_rows(DatasetRows(dataset_cache, cleaned_data_key, meta), request)
+        if df_page is None:
+            logger.error(f'{view_name} : post : Data evicted while being read for key: {cleaned_data_key}')
+            return Response({"message": "Data not found. Please check your data key"}, status=status.HTTP_404_NOT_FOUND)
+
+        return Response({
+            "message": "Request is successful.",
+            "data": dataframe_to_records(df_page),
+            "dtypes": dataset_cache.get_dtypes(meta),
+            "history": dataset_cache.get_history(cleaned_data_key),
+            "cleaned_data_key": cleaned_data_key},
+            status=status.HTTP_200_OK)
+
+class UndoColumnsDataTypesView(DatasetHistoryView):
+    """
+    This view undoes the latest update of the data types of columns of the cleaned dataset (see DatasetHistoryView).
+    """
+
+    action = 'undo'
+
+class RedoColumnsDataTypesView(DatasetHistoryView):
+    """
+    This view redoes the latest undone update of the data types of columns of the cleaned dataset (see DatasetHistoryView).
+    """
+
+    action = 'redo'
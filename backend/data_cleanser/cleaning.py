@@ -0,0 +1,133 @@
+import io
+import time
+from .inference import Inference
+from .conversion import Convertor
+
+# Functions cleaning whole dataframes in a single call, importable by worker processes (e.g. of a ProcessPoolExecutor)
+
+def clean_dataframe(df, inference_threshold_perc=Inference.INFERENCE_THRESHOLD_PERCENTAGE, data_types=None):
+    """
+    Infer the data types of all columns of a dataframe and convert them to the inferred types.
+
+    Args:
+    - df (pd.DataFrame): The input dataframe, left unmodified.
+    - inference_threshold_perc (float): Percentage of valid values in a column to infer its type (see Inference).
+    - data_types (dict): Data types of columns known beforehand (e.g. inferred from another file with the same schema),
+      only the other columns are inferred. Names of columns missing from the dataframe are ignored.
+
+    Returns:
+    - dict: Dtypes of the cleaned dataframe (`dtypes`), the cleaned dataframe (`data`) and the inferred data types (`inferred_dtypes`).
+
+    Raises:
+    - ValueError: If an error occurs during conversion.
+    """
+
+    known_data_types = {col_name: data_type for col_name, data_type in (data_types or {}).items() if col_name in df.columns}
+    # Selecting the columns to infer copies them, only done when some types are known
+    df_to_infer = df[[col_name for col_name in df.columns if col_name not in known_data_types]] if known_data_types else df
+    inferred_data_types = Inference(inference_threshold_perc).infer_data_types(df_to_infer)
+    inferred_data_types = {col_name: known_data_types.get(col_name, inferred_data_types.get(col_name)) for col_name in df.columns}
+    df_cleaned = Convertor().convert_data_types(df, inferred_data_types)
+
+    df_cleaned_dtypes = {}
+    for col_name in df_cleaned:
+        df_cleaned_dtypes[col_name] = str(df_cleaned[col_name].dtype)
+
+    return {
+        "dtypes" : df_cleaned_dtypes,
+        "data" : df_cleaned,
+        "inferred_dtypes" : inferred_data_types
+    }
+
+
+def clean_data_file(reader, data, inference_threshold_perc=Inference.INFERENCE_THRESHOLD_PERCENTAGE, data_types=None):
+    """
+    Parse a data file and clean its dataframe (see clean_dataframe).
+
+    Args:
+    - reader (data_cleanser.readers.DataReader): Reader parsing the file.
+    - data (bytes): Content of the file.
+    - inference_threshold_perc (float): Percentage of valid values in a column to infer its type (see Inference).
+    - data_types (dict): Data types of columns known beforehand, only the other columns are inferred.
+
+    Returns:
+    - dict: Result of clean_dataframe with the parsed dataframe with the uploaded values (`original`, see DataReader.read_typed)
+      and the seconds spent cleaning it (`seconds`).
+
+    Raises:
+    - ParserError: If the file can't be parsed.
+    - ValueError: If an error occurs during conversion.
+    """
+
+    df, df_typed = reader.read_typed(io.BytesIO(data))
+    start = time.perf_counter()
+    result = clean_dataframe(df_typed, inference_threshold_perc, data_types)
+    return {"original": df, "seconds": time.perf_counter() - start, **result}
+
+
+def group_column_updates(col_dtypes_updates):
+    """
+    Group the updates of a data types change request by column, columns being independent of each other.
+
+    Args:
+    - col_dtypes_updates (list): Dicts with the column name (`col_name`), the type to cast to (`dtype`), the missing
+      values handling option (`missing_values`) and the default value (`default`) of each column.
+
+    Returns:
+    - dict: Mapping of column names, in the order they were first requested, to the list of their updates in the requested order.
+    """
+
+    col_updates = {}
+    for col_dtype_update in col_dtypes_updates:
+        col_updates.setdefault(col_dtype_update["col_name"], []).append(col_dtype_update)
+    return col_updates
+
+
+def convert_column(column, col_updates, invalid_values_handling_option):
+    """
+    Convert a column through its updates one after the other, each update converting the result of the previous one.
+
+    The column is converted on its own (see Convertor.convert_series), so the cost does not depend on the other columns
+    of its dataframe. Rows deleted from the column (missing_values is 'delete') are left missing, the converted column
+    keeps the rows of the input column.
+
+    Args:
+    - column (pd.Series): The input column, left unmodified.
+    - col_updates (list): Updates of the column (see group_column_updates).
+    - invalid_values_handling_option (str): How to handle invalid values i.e. 'coerce' or 'raise'.
+
+    Returns:
+    - pd.Series: The converted column.
+
+    Raises:
+    - ValueError: If an error occurs during conversion.
+    - TypeError: If invalid data is passed for the column.
+    """
+
+    conversion_engine = Convertor()
+    converted_column = column
+    for col_dtype_update in col_updates:
+        converted_column = conversion_engine.convert_series(converted_column, col_dtype_update["dtype"], invalid_values_handling_option, col_dtype_update["missing_values"], col_dtype_update["default"])
+        converted_column = converted_column.reindex(column.index)
+    return converted_column
+
+
+def convert_columns(df, col_dtypes_updates, invalid_values_handling_option):
+    """
+    Convert columns of a dataframe one after the other, as requested by a data types change request (see convert_column).
+
+    Args:
+    - df (pd.DataFrame): The input dataframe, left unmodified. It may only hold the requested columns.
+    - col_dtypes_updates (list): Updates of the columns (see group_column_updates).
+    - invalid_values_handling_option (str): How to handle invalid values i.e. 'coerce' or 'raise'.
+
+    Returns:
+    - dict: Mapping of column names to the converted columns (pd.Series).
+
+    Raises:
+    - ValueError: If an error occurs during conversion.
+    - TypeError: If invalid data is passed for a column.
+    """
+
+    return {col_name: convert_column(df[col_name], col_updates, invalid_values_handling_option)
+            for col_name, col_updates in group_column_updates(col_dtypes_updates).items()}
@@ -2,6 +2,7 @@ import pandas as pd
 import numpy as np
 import re
 from .data_types import DataTypes, get_numeric_types
+from .instrumentation import count, span, timed
 
 class _ERROR_HANDLING_OPTIONS:
     IGNORE = 'ignore'
@@ -162,6 +163,7 @@ class Convertor:
         except ValueError:
             return np.nan
 
+    @timed('conversion.numeric')
     def convert_column_to_numeric(self, df, column, numeric_type='float64', errors='raise', missing_values='ignore', default_value=None):
         """
         Convert a column in the DataFrame to a numeric data type.
@@ -219,6 +221,7 @@ class Convertor:
             return df_copy
         except ValueError as e:
             # Check for formatted numeric type
+            count('conversion.numeric.formatted_fallback')
             try:
                 df_copy[column] = df_copy[column].map(str).map(self._parse_formatted_numeric_string)
                 has_nan = df_copy[column].isna().any()
@@ -238,6 +241,7 @@ class Convertor:
                 raise ValueError(f'Error converting column "{column}" to {numeric_type}: {str(e)}')
 
 
+    @timed('conversion.datetime')
     def convert_column_to_datetime(self, df, column, errors='raise', missing_values='ignore', default_value=pd.Timestamp.now()):
         """
         Convert a column in the DataFrame to a datetime data type.
@@ -286,6 +290,7 @@ class Convertor:
             raise ValueError(f'Error converting column "{column}" to {DataTypes.DATETIME64}: {str(e)}')
     
 
+    @timed('conversion.category')
     def convert_column_to_category(self, df, column, missing_values='ignore', default_value='other'):
         """
         Convert a column in the DataFrame to a categorical data type.
@@ -325,6 +330,7 @@ class Convertor:
             raise ValueError(f'Error converting column "{column}" to {DataTypes.CATEGORY}: {str(e)}')
 
 
+    @timed('conversion.boolean')
     def convert_column_to_boolean(self, df, column, errors='raise', missing_values='ignore', default_value=False):
         """
         Convert a column in the DataFrame to a boolean data type.
@@ -434,6 +440,7 @@ class Convertor:
             return np.nan # Return a nan if value can't be parsed
     
 
+    @timed('conversion.timedelta')
     def convert_column_to_timedelta(self, df, column, errors='raise', missing_values='ignore', default_value=pd.Timedelta(0)):
         """
         Convert a column in the DataFrame to a timedelta data type.
@@ -480,6 +487,7 @@ class Convertor:
             return df_copy
         except ValueError as e:
             # Check for pandas to_timedelta() unsupported timedelta formats
+            count('conversion.timedelta.unsupported_format_fallback')
             df_copy[column] = df_copy[column].map(str).map(self._parse_pandas_unsupported_timedelta_format)
             if df_copy[column].isna().all():
                 raise ValueError(f'Error converting column "{column}" to {DataTypes.TIMEDELTA64}: {str(e)}')
@@ -540,6 +548,7 @@ class Convertor:
             return None
         
     
+    @timed('conversion.complex')
     def convert_column_to_complex(self, df, column, errors='raise', missing_values='ignore', default_value=complex(0, 0)):
         """
         Convert a column in the DataFrame to a complex data type.
@@ -606,26 +615,47 @@ class Convertor:
         - ValueError: If an invalid value is provided for 'missing_values' or if an error occurs during conversion.
         """
         
-        if type_to_cast == DataTypes.OBJECT:
-            df[column] = df[column].astype(DataTypes.OBJECT)
-        if type_to_cast in get_numeric_types():
-            df = self.convert_column_to_numeric(df, column, type_to_cast, errors, missing_values, default_value)
-        elif type_to_cast == DataTypes.BOOLEAN:
-            df = self.convert_column_to_boolean(df, column, errors, missing_values, default_value)
-        elif type_to_cast == DataTypes.DATETIME64:
-            df = self.convert_column_to_datetime(df, column, errors, missing_values, default_value)
-        elif type_to_cast == DataTypes.TIMEDELTA64:
-            df = self.convert_column_to_timedelta(df, column, errors, missing_values, default_value)
-        elif type_to_cast == DataTypes.CATEGORY:
-            df = self.convert_column_to_category(df, column, missing_values, default_value)
-        elif type_to_cast == DataTypes.COMPLEX:
-            df = self.convert_column_to_complex(df, column, errors, missing_values, default_value)
-        else:
-            pass
+        with span('conversion', column=column):
+            if type_to_cast == DataTypes.OBJECT:
+                df[column] = df[column].astype(DataTypes.OBJECT)
+            if type_to_cast in get_numeric_types():
+                df = self.convert_column_to_numeric(df, column, type_to_cast, errors, missing_values, default_value)
+            elif type_to_cast == DataTypes.BOOLEAN:
+                df = self.convert_column_to_boolean(df, column, errors, missing_values, default_value)
+            elif type_to_cast == DataTypes.DATETIME64:
+                df = self.convert_column_to_datetime(df, column, errors, missing_values, default_value)
+            elif type_to_cast == DataTypes.TIMEDELTA64:
+                df = self.convert_column_to_timedelta(df, column, errors, missing_values, default_value)
+            elif type_to_cast == DataTypes.CATEGORY:
+                df = self.convert_column_to_category(df, column, missing_values, default_value)
+            elif type_to_cast == DataTypes.COMPLEX:
+                df = self.convert_column_to_complex(df, column, errors, missing_values, default_value)
+            else:
+                pass
 
         return df
 
 
+    def convert_series(self, series, type_to_cast, errors='coerce', missing_values='ignore', default_value=None):
+        """
+        Convert a single column to the specified data type, without copying the other columns of its DataFrame.
+
+        Args:
+        - series (pd.Series): Column to convert, named after the column.
+        - type_to_cast (str): Data type to cast the column to. Should be one of the values from DataTypes.
+        - errors, missing_values, default_value: See convert_col_date_type.
+
+        Returns:
+        - pd.Series: The converted column, without the rows deleted when missing_values is 'delete'.
+
+        Raises:
+        - KeyError: If an invalid argument is provided for 'type_to_cast', 'errors' and 'missing_values'.
+        - ValueError: If an invalid value is provided for 'missing_values' or if an error occurs during conversion.
+        """
+
+        return self.convert_col_date_type(series.to_frame(), series.name, type_to_cast, errors, missing_values, default_value)[series.name]
+
+
     def convert_data_types(self, df, dtype_mapping, errors='coerce', missing_values='ignore', default_value=None):
         """
         Convert specified columns in the DataFrame to the specified data types.
@@ -3,6 +3,7 @@ import numpy as np
 import re
 
 from .data_types import DataTypes, get_numeric_types
+from .instrumentation import count, span, timed
 
 class Inference:
 
@@ -29,6 +30,7 @@ class Inference:
         return non_na_values_count / total_values_count
 
     
+    @timed('inference.formatted_numeric')
     def infer_formatted_numeric_type(self, data_column):
         """
         Infer numeric type from strings.
@@ -53,6 +55,7 @@ class Inference:
         return DataTypes.OBJECT
     
 
+    @timed('inference.timedelta')
     def is_timedelta_type(self, data_column):
         """
         Check if the data column contains timedelta values.
@@ -81,6 +84,7 @@ class Inference:
         return False
     
 
+    @timed('inference.datetime')
     def is_datetime_type(self, data_column):
         """
         Check if the data column contains datetime values.
@@ -102,10 +106,92 @@ class Inference:
             return False
         
     
+    @timed('inference.category')
     def is_categorical_type(self, data_column):
         return len(data_column.astype(str).unique()) / len(data_column) < 0.5 # only returning true if unique values are less than 50%
 
 
+    def get_integer_type(self, col_min, col_max):
+        """
+        Get the smallest integer type (int8, int16, int32, int64) holding a range of values.
+
+        Args:
+        - col_min: Smallest value of the range.
+        - col_max: Largest value of the range.
+
+        Returns:
+        - str: The integer type, int64 for values out of the int64 range.
+
+        Raises:
+        - TypeError: If the bounds are not numeric values.
+        """
+
+        if col_min >= np.iinfo(np.int8).min and col_max <= np.iinfo(np.int8).max:
+            return DataTypes.INT8
+        elif col_min >= np.iinfo(np.int16).min and col_max <= np.iinfo(np.int16).max:
+            return DataTypes.INT16
+        elif col_min >= np.iinfo(np.int32).min and col_max <= np.iinfo(np.int32).max:
+            return DataTypes.INT32
+        return DataTypes.INT64
+
+
+    def get_float_type(self, col_max):
+        """
+        Get the smallest float type (float32, float64) holding values up to a maximum.
+
+        Raises:
+        - TypeError: If the maximum is not a numeric value.
+        """
+
+        if col_max <= np.finfo(np.float32).max:
+            return DataTypes.FLOAT32
+        return DataTypes.FLOAT64
+
+
+    @timed('inference.typed')
+    def infer_typed_data_type(self, data_column):
+        """
+        Infer the data type of a column already typed by its reader (e.g. columns of Parquet and Feather files, numbers,
+        booleans and datetimes of CSV files), with vectorized checks instead of the detectors parsing string forms of the values.
+
+        Args:
+        - data_column (pd.Series): Data column from a pandas DataFrame, with more than threshold percentage of non-na values.
+
+        Returns:
+        - str or None: The inferred data type, the smallest type holding the values of numeric columns.
+          None for columns of strings or mixed values (object dtype), inferred by the detectors.
+        """
+
+        dtype = data_column.dtype
+        if pd.api.types.is_datetime64_any_dtype(dtype):
+            return DataTypes.DATETIME64
+        if pd.api.types.is_timedelta64_dtype(dtype):
+            return DataTypes.TIMEDELTA64
+        if isinstance(dtype, pd.CategoricalDtype):
+            return DataTypes.CATEGORY
+        if pd.api.types.is_bool_dtype(dtype):
+            return DataTypes.BOOLEAN
+        if pd.api.types.is_complex_dtype(dtype):
+            return DataTypes.COMPLEX
+
+        if pd.api.types.is_integer_dtype(dtype):
+            values = data_column.dropna()
+            # Integer columns of 0 and 1 values are booleans, as with the detectors (see is_boolean_type)
+            if values.isin([0, 1]).sum() / len(data_column) > self.INFERENCE_THRESHOLD_PERCENTAGE:
+                return DataTypes.BOOLEAN
+            return self.get_integer_type(values.min(), values.max())
+
+        if pd.api.types.is_float_dtype(dtype):
+            values = data_column.dropna().to_numpy(dtype='float64')
+            # Floats holding integers only are inferred as integers, as with the detectors (see infer_numeric_type)
+            if np.all(np.isfinite(values) & (values <= self.MAX_INTEGER_CHECKABLE_FLOAT) & (values == np.trunc(values))):
+                return self.get_integer_type(values.min(), values.max())
+            return self.get_float_type(values.max())
+
+        return None
+
+
+    @timed('inference.numeric')
     def infer_numeric_type(self, data_column):
         """
         Infer the numeric type (int64, int32, int16, int8, float64, float32) of the data column. If not numeric, return 'object' as default
@@ -137,37 +223,21 @@ class Inference:
         if self.get_non_na_values_percentage(dc_converted) > self.INFERENCE_THRESHOLD_PERCENTAGE: # More than threshold percentage of the values are numeric
             if infered_data_type == DataTypes.INTEGER: # Check if converted dataframe is of integer type
                 try:
-                    col_min = dc_converted.min()
-                    col_max = dc_converted.max()
-
-                    if col_min >= np.iinfo(np.int8).min and col_max <= np.iinfo(np.int8).max:
-                        return DataTypes.INT8
-                    elif col_min >= np.iinfo(np.int16).min and col_max <= np.iinfo(np.int16).max:
-                        return DataTypes.INT16
-                    elif col_min >= np.iinfo(np.int32).min and col_max <= np.iinfo(np.int32).max:
-                        return DataTypes.INT32
-                    else:
-                        return DataTypes.INT64
+                    return self.get_integer_type(dc_converted.min(), dc_converted.max())
                 except (TypeError):
                         # Returning default 'int64' when the min, max are not numeric values
                         return DataTypes.INT64
 
             else: # Check if converted dataframe is of floating type
                 try:
-                    col_min = dc_converted.min()
-                    col_max = dc_converted.max()
-
-                    if col_max <= np.finfo(np.float32).max:
-                        return DataTypes.FLOAT32
-                    else:
-                        return DataTypes.FLOAT64
-
+                    return self.get_float_type(dc_converted.max())
                 except (TypeError):
                     # Returning default 'float64' when the min, max are not numeric values
                     return DataTypes.FLOAT64
         
         else:
             # Checking for formatted numeric strings
+            count('inference.numeric.formatted_fallback')
             inferred_formatted_numeric_type = self.infer_formatted_numeric_type(data_column)
             if inferred_formatted_numeric_type == DataTypes.FLOAT64 or inferred_formatted_numeric_type == DataTypes.INT64:
                 return inferred_formatted_numeric_type
@@ -175,6 +245,7 @@ class Inference:
         return DataTypes.OBJECT
     
     
+    @timed('inference.boolean')
     def is_boolean_type(self, data_column):
         """
         Infer if the data column contains boolean values.
@@ -194,6 +265,7 @@ class Inference:
         return boolean_count / len(data_column) > self.INFERENCE_THRESHOLD_PERCENTAGE
     
 
+    @timed('inference.complex')
     def is_complex_type(self, data_column):
         """
         Infer if the data column contains complex values.
@@ -249,6 +321,11 @@ class Inference:
         if len(data_column) == 0 or self.get_non_na_values_percentage(data_column) <= self.INFERENCE_THRESHOLD_PERCENTAGE:
             return DataTypes.OBJECT
 
+        # Columns already typed by the reader skip the detectors parsing string values, only numeric widths are checked
+        inferred_data_type = self.infer_typed_data_type(data_column)
+        if inferred_data_type is not None:
+            return inferred_data_type
+
         # Infer numeric data type
         inferred_data_type = self.infer_numeric_type(data_column)
         if inferred_data_type in get_numeric_types():
@@ -293,6 +370,7 @@ class Inference:
         
         inferred_data_types = dict()
         for col in list(dataframe.columns):
-            inferred_data_types[col] = self.infer_data_type(dataframe[col])
+            with span('inference', column=col):
+                inferred_data_types[col] = self.infer_data_type(dataframe[col])
 
         return inferred_data_types
\ No newline at end of file
@@ -0,0 +1,162 @@
+import contextvars
+import functools
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+
+# Instrumentation of the pipeline running in the current context (thread or task), None when nothing is collected
+_current_instrumentation = contextvars.ContextVar('instrumentation', default=None)
+
+# Number of collections tracing memory, tracemalloc is started by the first one and stopped by the last one
+_memory_tracing_users = 0
+_memory_tracing_lock = threading.Lock()
+
+
+class Instrumentation:
+    """
+    Collects timing spans, counters and the peak of traced memory of a pipeline run (e.g. an upload being read and cleaned).
+
+    Spans sharing a name are aggregated (total seconds and number of calls), stage spans nest so their times overlap
+    (e.g. `inference.numeric` is part of `inference`). Spans recorded for a column are also aggregated per column.
+    Counters record how often fallback paths are taken (e.g. `conversion.numeric.formatted_fallback`).
+    """
+
+    def __init__(self):
+        self.spans = {}
+        self.column_spans = {}
+        self.counters = {}
+        self.peak_memory_bytes = None
+
+    @staticmethod
+    def _add_span(spans, name, seconds):
+        span = spans.setdefault(name, {"seconds": 0.0, "calls": 0})
+        span["seconds"] += seconds
+        span["calls"] += 1
+
+    @contextmanager
+    def span(self, name, column=None):
+        """
+        Time the enclosed block.
+
+        Args:
+        - name (str): Name of the stage e.g. 'read' or 'inference.datetime'.
+        - column (str): Name of the column processed by the block, if any.
+        """
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            self._add_span(self.spans, name, seconds)
+            if column is not None:
+                self._add_span(self.column_spans.setdefault(str(column), {}), name, seconds)
+
+    def count(self, name, increment=1):
+        self.counters[name] = self.counters.get(name, 0) + increment
+
+    def as_dict(self):
+        """
+        Returns:
+        - dict: Spans (`spans`), spans per column (`columns`), counters (`counters`) and the peak of traced memory
+          in bytes (`peak_memory_bytes`, None if memory was not traced), seconds rounded to microseconds.
+        """
+
+        def round_spans(spans):
+            return {name: {"seconds": round(span["seconds"], 6), "calls": span["calls"]} for name, span in spans.items()}
+
+        return {
+            "spans": round_spans(self.spans),
+            "columns": {column: round_spans(spans) for column, spans in self.column_spans.items()},
+            "counters": dict(self.counters),
+            "peak_memory_bytes": self.peak_memory_bytes,
+        }
+
+
+def _start_memory_tracing():
+    global _memory_tracing_users
+    with _memory_tracing_lock:
+        if _memory_tracing_users == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        _memory_tracing_users += 1
+        tracemalloc.reset_peak()
+
+
+def _stop_memory_tracing():
+    global _memory_tracing_users
+    with _memory_tracing_lock:
+        peak_memory_bytes = tracemalloc.get_traced_memory()[1]
+        _memory_tracing_users -= 1
+        if _memory_tracing_users == 0 and tracemalloc.is_tracing():
+            tracemalloc.stop()
+    return peak_memory_bytes
+
+
+@contextmanager
+def instrument(trace_memory=False):
+    """
+    Collect the spans and counters recorded in the current context while the enclosed block runs.
+
+    Args:
+    - trace_memory (bool): If True, the peak of memory allocated by Python is traced with tracemalloc, which slows
+      allocations down. The peak is the one of the process, so it includes the allocations of concurrent requests.
+
+    Yields:
+    - Instrumentation: The collected spans and counters.
+    """
+
+    instrumentation = Instrumentation()
+    token = _current_instrumentation.set(instrumentation)
+    if trace_memory:
+        _start_memory_tracing()
+    try:
+        yield instrumentation
+    finally:
+        if trace_memory:
+            instrumentation.peak_memory_bytes = _stop_memory_tracing()
+        _current_instrumentation.reset(token)
+
+
+def get_instrumentation():
+    """
+    Returns:
+    - Instrumentation: Instrumentation collecting in the current context, None if nothing is collected.
+    """
+
+    return _current_instrumentation.get()
+
+
+def span(name, column=None):
+    """
+    Time the enclosed block if instrumentation is collected in the current context (see Instrumentation.span).
+    """
+
+    instrumentation = _current_instrumentation.get()
+    if instrumentation is None:
+        return nullcontext()
+    return instrumentation.span(name, column)
+
+
+def count(name, increment=1):
+    """
+    Increment a counter if instrumentation is collected in the current context.
+    """
+
+    instrumentation = _current_instrumentation.get()
+    if instrumentation is not None:
+        instrumentation.count(name, increment)
+
+
+def timed(name):
+    """
+    Decorator timing each call of a function as a span (see span).
+    """
+
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,159 @@
+import pandas as pd
+import numpy as np
+
+class Profiler:
+    """
+    Computes per-column statistics of typed (cleaned) data, vectorized per dtype.
+    """
+
+    DEFAULT_TOP_VALUES_COUNT = 10 # Default number of most frequent values reported per column
+    DEFAULT_HISTOGRAM_BINS = 20 # Default number of histogram bins for numeric, datetime and timedelta columns
+
+    def __init__(self, top_values_count=DEFAULT_TOP_VALUES_COUNT, histogram_bins=DEFAULT_HISTOGRAM_BINS):
+        self.top_values_count = top_values_count
+        self.histogram_bins = histogram_bins
+
+
+    def is_ordered_type(self, data_column):
+        """
+        Check if the values of a data column have a meaningful order and histogram i.e. real numbers, datetimes or timedeltas.
+
+        Args:
+        - data_column (pd.Series): Data column from a pandas DataFrame.
+
+        Returns:
+        - bool: True if min, max and a histogram can be computed for the column.
+        """
+
+        dtype = data_column.dtype
+        if isinstance(dtype, pd.CategoricalDtype) or pd.api.types.is_bool_dtype(dtype) or pd.api.types.is_complex_dtype(dtype):
+            return False
+        return pd.api.types.is_numeric_dtype(dtype) or pd.api.types.is_datetime64_any_dtype(dtype) or pd.api.types.is_timedelta64_dtype(dtype)
+
+
+    def get_top_values(self, data_column):
+        """
+        Get the most frequent values of a data column, missing values excluded.
+
+        Args:
+        - data_column (pd.Series): Data column from a pandas DataFrame.
+
+        Returns:
+        - list: Dicts with the value and its count, most frequent first.
+        """
+
+        try:
+            counts = data_column.value_counts(dropna=True)
+        except TypeError:
+            # Unhashable values (e.g. lists) are counted by their string form
+            counts = data_column[data_column.notna()].astype(str).value_counts()
+
+        counts = counts[counts > 0].head(self.top_values_count) # Unused categories have a count of 0
+        return [{"value": value.item() if isinstance(value, np.generic) else value, "count": int(count)} for value, count in counts.items()]
+
+
+    def get_histogram(self, data_column):
+        """
+        Compute the histogram of an ordered data column (see is_ordered_type), missing and infinite values excluded.
+
+        Args:
+        - data_column (pd.Series): Data column from a pandas DataFrame.
+
+        Returns:
+        - dict or None: Bin edges (one more than the counts) and counts, None if the column has no finite values.
+        """
+
+        values = data_column.dropna()
+        dtype = data_column.dtype
+
+        # Datetimes and timedeltas are binned on their nanoseconds (UTC for timezone aware datetimes) from the smallest value
+        is_datetime = pd.api.types.is_datetime64_any_dtype(dtype)
+        is_timedelta = pd.api.types.is_timedelta64_dtype(dtype)
+        origin = 0
+        if is_datetime or is_timedelta:
+            numbers = values.array.asi8
+            origin = numbers.min() if len(numbers) else 0
+            numbers = (numbers - origin).astype('float64')
+        else:
+            numbers = values.to_numpy(dtype='float64')
+            numbers = numbers[np.isfinite(numbers)]
+
+        if len(numbers) == 0:
+            return None
+
+        counts, edges = np.histogram(numbers, bins=self.histogram_bins)
+
+        if is_datetime:
+            tz = getattr(dtype, 'tz', None)
+            edges = pd.to_datetime(edges.astype('int64') + origin, utc=tz is not None)
+            edges = [edge.isoformat() for edge in (edges.tz_convert(tz) if tz is not None else edges)]
+        elif is_timedelta:
+            edges = [str(edge) for edge in pd.to_timedelta(edges.astype('int64') + origin)]
+        else:
+            edges = edges.tolist()
+
+        return {"edges": edges, "counts": counts.tolist()}
+
+
+    def profile_column(self, data_column):
+        """
+        Compute the statistics of a data column.
+
+        Args:
+        - data_column (pd.Series): Data column from a pandas DataFrame.
+
+        Returns:
+        - dict: Statistics of the column with the following keys:
+            - 'dtype': Data type of the column.
+            - 'count', 'nulls', 'null_percentage': Number of values, number and percentage (0.0 - 1.0) of missing values.
+            - 'distinct': Number of distinct values, missing values excluded.
+            - 'min', 'max': Smallest and largest values, None if the column is not ordered or has no values.
+            - 'top_values': Most frequent values with their counts.
+            - 'histogram': Bin edges and counts, None if the column is not ordered or has no values.
+        """
+
+        count = len(data_column)
+        nulls = int(data_column.isna().sum())
+
+        try:
+            distinct = int(data_column.nunique(dropna=True))
+        except TypeError:
+            distinct = int(data_column[data_column.notna()].astype(str).nunique())
+
+        profile = {
+            "dtype": str(data_column.dtype),
+            "count": count,
+            "nulls": nulls,
+            "null_percentage": nulls / count if count else 0.0,
+            "distinct": distinct,
+            "min": None,
+            "max": None,
+            "top_values": self.get_top_values(data_column),
+            "histogram": None,
+        }
+
+        if self.is_ordered_type(data_column) and nulls < count:
+            col_min, col_max = data_column.min(), data_column.max()
+            profile["min"] = col_min.item() if isinstance(col_min, np.generic) else col_min
+            profile["max"] = col_max.item() if isinstance(col_max, np.generic) else col_max
+            profile["histogram"] = self.get_histogram(data_column)
+
+        return profile
+
+
+    def profile_dataframe(self, dataframe):
+        """
+        Compute the statistics of all columns in the given dataframe.
+
+        Args:
+        - dataframe (pd.DataFrame): The input dataframe.
+
+        Returns:
+        - dict: A dictionary mapping column names to their statistics (see profile_column).
+        """
+
+        profiles = dict()
+        for col in list(dataframe.columns):
+            profiles[col] = self.profile_column(dataframe[col])
+
+        return profiles
@@ -0,0 +1,495 @@
+import codecs
+import io
+import numpy as np
+import pandas as pd
+from pandas.errors import ParserError
+
+from .data_types import DataTypes
+from .inference import Inference
+from .instrumentation import count, timed
+
+# pyarrow is optional, CSV files are read with the pandas C engine when it is not installed
+try:
+    import pyarrow
+    import pyarrow.csv
+except ImportError:
+    pyarrow = None
+
+# python-calamine is optional, Excel files are read with the default pandas engines when it is not installed
+try:
+    import python_calamine
+except ImportError:
+    python_calamine = None
+
+
+class CSVEngines:
+    """
+    Constants representing the engines CSV files can be read with.
+    """
+    C = 'c' # pandas C parser, single threaded
+    PYARROW = 'pyarrow' # pyarrow CSV reader, multi-threaded
+
+
+class ExcelEngines:
+    """
+    Constants representing the engines Excel files can be read with.
+    """
+    CALAMINE = 'calamine' # Rust based reader of all Excel formats, requires python-calamine
+    DEFAULT = None # Default pandas engine of the file format i.e. openpyxl (read-only mode) for xlsx and xlsm files
+
+
+def get_file_source(file):
+    """
+    Returns:
+    - str or file-like: Path of uploads spooled to disk, so that they are memory mapped or read in parallel, the file otherwise.
+    """
+
+    return file.temporary_file_path() if hasattr(file, 'temporary_file_path') else file
+
+
+class DataReader:
+    """
+    Base class of the readers parsing uploaded data files into dataframes.
+    """
+
+    file_type = None # Name of the file type used in messages e.g. 'CSV'
+
+    def read(self, file):
+        """
+        Parse a data file.
+
+        Args:
+        - file (file-like): The uploaded file, positioned at its start.
+
+        Returns:
+        - pd.DataFrame: The parsed data.
+
+        Raises:
+        - ParserError: If the file can't be parsed.
+        """
+
+        raise NotImplementedError
+
+    def read_typed(self, file):
+        """
+        Parse a data file, keeping the values as uploaded apart from the values typed by the reader.
+
+        Returns:
+        - tuple: The data with the uploaded values (pd.DataFrame), kept as the original data to convert from, and the
+          data with the types hinted by the reader (pd.DataFrame), to clean. The same dataframe if nothing is hinted.
+
+        Raises:
+        - ParserError: If the file can't be parsed.
+        """
+
+        df = self.read(file)
+        return df, df
+
+
+class CSVReader(DataReader):
+    """
+    Reads CSV files with the pyarrow or pandas C engine, with type hints inferred from the leading rows.
+
+    Types are inferred on a sample of the leading rows first. Columns whose sampled values are all datetimes of a
+    single format are parsed as datetimes with that format once read, instead of being parsed again by the convertor.
+    With the pyarrow engine the hinted text columns are read as strings, as pyarrow would otherwise read e.g. times as
+    datetime.time objects. Numbers and booleans are typed by both engines without hints.
+
+    Falls back to the C engine when pyarrow can't read the file with the hints (e.g. text after the first block of a
+    numeric column) or names columns differently (e.g. duplicated column names).
+    """
+
+    file_type = 'CSV'
+    DELIMITER = ','
+    DEFAULT_SAMPLE_ROWS = 1000 # Default number of leading rows types are inferred from
+    NA_VALUES = ['', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN', '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null'] # Strings read as missing values by pandas
+
+    def __init__(self, engine=None, sample_rows=DEFAULT_SAMPLE_ROWS, inference_threshold_perc=Inference.INFERENCE_THRESHOLD_PERCENTAGE):
+        if engine not in (None, CSVEngines.C, CSVEngines.PYARROW):
+            raise ValueError(f'Invalid CSV engine "{engine}". Please provide one of {[CSVEngines.C, CSVEngines.PYARROW]}')
+
+        # pyarrow is used by default when installed
+        self.engine = CSVEngines.PYARROW if engine in (None, CSVEngines.PYARROW) and pyarrow is not None else CSVEngines.C
+        self.sample_rows = sample_rows
+        self.inference_engine = Inference(inference_threshold_perc)
+
+
+    @timed('read.sample')
+    def read_sample(self, file):
+        """
+        Returns:
+        - pd.DataFrame: The leading rows of a CSV file, the file is rewound after reading them.
+        """
+
+        df_sample = pd.read_csv(file, sep=self.DELIMITER, nrows=self.sample_rows)
+        file.seek(0)
+        return df_sample
+
+
+    def get_datetime_format(self, data_column):
+        """
+        Get the format of a text column if all of its values are timezone naive datetimes of that format.
+
+        Args:
+        - data_column (pd.Series): Data column of the sample.
+
+        Returns:
+        - str or None: The strptime format of the values, None if it can't be guessed or some values don't match it.
+        """
+
+        values = data_column.dropna()
+        if len(values) == 0 or not isinstance(values.iloc[0], str):
+            return None
+
+        datetime_format = pd.tseries.api.guess_datetime_format(values.iloc[0])
+        if datetime_format is None:
+            return None
+
+        try:
+            parsed_values = pd.to_datetime(values, format=datetime_format, errors='coerce')
+        except (ValueError, TypeError):
+            return None
+        if parsed_values.isna().any() or getattr(parsed_values.dtype, 'tz', None) is not None:
+            return None
+        return datetime_format
+
+
+    @timed('read.type_hints')
+    def get_type_hints(self, df_sample):
+        """
+        Infer the type hints of the columns of a CSV file from its leading rows.
+
+        Args:
+        - df_sample (pd.DataFrame): Leading rows of the file (see read_sample).
+
+        Returns:
+        - dict: Mapping of the text column names to the type they are read as i.e. 'datetime64[ns]' or 'object',
+          columns typed by the engines (numbers, booleans, missing values only) are not included.
+        - dict: Mapping of the datetime column names to the format of their values.
+        """
+
+        type_hints = {}
+        datetime_formats = {}
+        for col_name, inferred_type in self.inference_engine.infer_data_types(df_sample).items():
+            # Numbers and booleans are typed by the engines, only text columns are hinted
+            if not pd.api.types.is_object_dtype(df_sample[col_name].dtype):
+                continue
+
+            datetime_format = self.get_datetime_format(df_sample[col_name]) if inferred_type == DataTypes.DATETIME64 else None
+            if datetime_format is not None:
+                type_hints[col_name] = DataTypes.DATETIME64
+                datetime_formats[col_name] = datetime_format
+            else:
+                type_hints[col_name] = DataTypes.OBJECT
+
+        return type_hints, datetime_formats
+
+
+    @timed('read.c_engine')
+    def read_with_c_engine(self, file):
+        """
+        Returns:
+        - pd.DataFrame: The CSV file read by pandas, text columns read as text.
+        """
+
+        return pd.read_csv(file, sep=self.DELIMITER)
+
+
+    @timed('read.datetimes')
+    def parse_datetime_columns(self, df, datetime_formats):
+        """
+        Parse the datetime columns of a dataframe read as text, each column with its own format.
+
+        Args:
+        - df (pd.DataFrame): The dataframe, left unmodified.
+        - datetime_formats (dict): Mapping of the datetime column names to the format of their values.
+
+        Returns:
+        - pd.DataFrame: A copy of the dataframe sharing the other columns, columns with values that don't match their format left as text.
+        """
+
+        if not datetime_formats:
+            return df
+
+        df = df.copy(deep=False)
+        for col_name, datetime_format in datetime_formats.items():
+            try:
+                df[col_name] = pd.to_datetime(df[col_name], format=datetime_format)
+            except (ValueError, TypeError):
+                pass
+        return df
+
+
+    @timed('read.pyarrow')
+    def read_with_pyarrow(self, file, type_hints, col_names):
+        """
+        Returns:
+        - pd.DataFrame or None: The CSV file read by pyarrow with multiple threads, the hinted columns read as strings.
+          None if pyarrow names the columns differently from pandas (e.g. duplicated names, unnamed columns).
+
+        Raises:
+        - pyarrow.ArrowInvalid: If a value can't be read as the type of its column or the file is malformed.
+        """
+
+        # Datetime columns are parsed afterwards, pyarrow would try the formats of all columns on each of them
+        column_types = {col_name: pyarrow.string() for col_name in type_hints}
+        convert_options = pyarrow.csv.ConvertOptions(
+            column_types=column_types,
+            null_values=self.NA_VALUES,
+            strings_can_be_null=True, # Missing values in text columns too, as with pandas
+        )
+
+        read_options = pyarrow.csv.ReadOptions(use_threads=True)
+        parse_options = pyarrow.csv.ParseOptions(delimiter=self.DELIMITER)
+        table = pyarrow.csv.read_csv(get_file_source(file), read_options=read_options, parse_options=parse_options, convert_options=convert_options)
+        if table.column_names != list(col_names):
+            return None
+
+        # Missing values are NaN as with pandas, in columns without values (read as floats by pandas) and text columns
+        df = table.to_pandas()
+        for position, field in enumerate(table.schema):
+            if pyarrow.types.is_null(field.type):
+                df[field.name] = df[field.name].astype('float64')
+            elif pyarrow.types.is_string(field.type) and table.column(position).null_count:
+                df[field.name] = df[field.name].fillna(np.nan)
+        return df
+
+
+    def read(self, file):
+        """
+        Parse a CSV file (see DataReader.read), with the type hints inferred from its leading rows.
+        """
+
+        return self.read_typed(file)[1]
+
+    def read_typed(self, file):
+        """
+        Parse a CSV file (see DataReader.read_typed), the datetime columns are only parsed in the typed dataframe.
+        """
+
+        df_sample = self.read_sample(file)
+        type_hints, datetime_formats = self.get_type_hints(df_sample)
+
+        df = None
+        if self.engine == CSVEngines.PYARROW:
+            try:
+                df = self.read_with_pyarrow(file, type_hints, df_sample.columns)
+            except pyarrow.ArrowInvalid:
+                pass
+            if df is None:
+                count('read.csv.c_engine_fallback')
+                file.seek(0)
+
+        if df is None:
+            df = self.read_with_c_engine(file)
+        return df, self.parse_datetime_columns(df, datetime_formats)
+
+
+class TSVReader(CSVReader):
+    """
+    Reads tab separated files, as CSV files (see CSVReader).
+    """
+
+    file_type = 'TSV'
+    DELIMITER = '\t'
+
+
+class ParquetReader(DataReader):
+    """
+    Reads Parquet files with pyarrow. Columns keep the types they were written with, so they skip the string
+    detectors of the inference (see Inference.infer_typed_data_type).
+    """
+
+    file_type = 'Parquet'
+
+    def read(self, file):
+        try:
+            return pd.read_parquet(get_file_source(file), engine='pyarrow')
+        except (ValueError, OSError) as e:
+            raise ParserError(str(e)) from e
+
+
+class FeatherReader(DataReader):
+    """
+    Reads Feather (Arrow IPC) files with pyarrow, keeping the types of the columns as Parquet files.
+    """
+
+    file_type = 'Feather'
+
+    def read(self, file):
+        try:
+            return pd.read_feather(get_file_source(file))
+        except (ValueError, OSError) as e:
+            raise ParserError(str(e)) from e
+
+
+class JSONLinesReader(DataReader):
+    """
+    Reads JSON Lines files (one JSON object per line) in chunks of lines, so that only a chunk of parsed objects is held at a time.
+    Strings are not parsed as datetimes, datetime columns are inferred from the string values as in CSV files.
+    """
+
+    file_type = 'JSON Lines'
+    DEFAULT_CHUNK_LINES = 100000 # Default number of lines parsed at a time
+
+    def __init__(self, chunk_lines=DEFAULT_CHUNK_LINES):
+        self.chunk_lines = chunk_lines
+
+
+    def read(self, file):
+        try:
+            # Lines are decoded as they are read, pandas only decodes the lines of a few file types itself
+            lines = codecs.getreader('utf-8')(file)
+            with pd.read_json(lines, lines=True, chunksize=self.chunk_lines, convert_dates=False, keep_default_dates=False) as json_reader:
+                chunks = list(json_reader)
+        except ValueError as e:
+            raise ParserError(str(e)) from e
+
+        if not chunks:
+            return pd.DataFrame()
+        return pd.concat(chunks, ignore_index=True) if len(chunks) > 1 else chunks[0]
+
+
+def read_excel_sheet(data, sheet_name, engine=ExcelEngines.DEFAULT):
+    """
+    Read a sheet of an Excel file, importable by worker processes (e.g. of a ProcessPoolExecutor).
+
+    Args:
+    - data (bytes): Content of the Excel file.
+    - sheet_name (str): Name of the sheet.
+    - engine (str): Engine reading the file (see ExcelEngines).
+
+    Returns:
+    - pd.DataFrame: The data of the sheet.
+    """
+
+    return pd.read_excel(io.BytesIO(data), sheet_name=sheet_name, engine=engine)
+
+
+class ExcelReader(DataReader):
+    """
+    Reads Excel files with calamine if installed, several times faster than openpyxl, or the default pandas engines.
+    Reads the first sheet as a dataframe or all sheets, in parallel when given an executor.
+    """
+
+    file_type = 'Excel'
+
+    def __init__(self, engine=ExcelEngines.CALAMINE):
+        # Falling back to the default engines when calamine is not installed
+        self.engine = engine if engine != ExcelEngines.CALAMINE or python_calamine is not None else ExcelEngines.DEFAULT
+
+
+    def read(self, file):
+        """
+        Parse the first sheet of an Excel file (see DataReader.read).
+        """
+
+        return pd.read_excel(file, engine=self.engine)
+
+
+    def get_sheet_names(self, file):
+        """
+        Returns:
+        - list: Names of the sheets of an Excel file in their order, the file is rewound after reading them.
+        """
+
+        with pd.ExcelFile(file, engine=self.engine) as excel_file:
+            sheet_names = excel_file.sheet_names
+        file.seek(0)
+        return sheet_names
+
+
+    def read_sheets(self, file, sheet_names=None, executor=None):
+        """
+        Parse sheets of an Excel file, each sheet read by a task of the executor.
+
+        Sheets are read by separate tasks since parsing them holds the GIL, a process pool reads them in parallel.
+
+        Args:
+        - file (file-like): The uploaded file, positioned at its start.
+        - sheet_names (list): Names of the sheets to read, all sheets if None.
+        - executor (concurrent.futures.Executor): Executor reading the sheets, sheets are read one after the other if None.
+
+        Returns:
+        - dict: Mapping of the sheet names to their data (pd.DataFrame), in the order of the sheet names.
+
+        Raises:
+        - ValueError: If a sheet does not exist.
+        """
+
+        if sheet_names is None:
+            sheet_names = self.get_sheet_names(file)
+        data = file.read()
+        file.seek(0)
+
+        if executor is None:
+            return {sheet_name: read_excel_sheet(data, sheet_name, self.engine) for sheet_name in sheet_names}
+
+        futures = [executor.submit(read_excel_sheet, data, sheet_name, self.engine) for sheet_name in sheet_names]
+        return {sheet_name: future.result() for sheet_name, future in zip(sheet_names, futures)}
+
+
+class ReaderRegistry:
+    """
+    Maps file extensions to the readers parsing them, formats are supported by registering a reader for their extensions.
+    """
+
+    def __init__(self):
+        self._readers = {}
+
+
+    def register(self, reader, extensions):
+        """
+        Register a reader for file extensions, replacing the readers previously registered for them.
+
+        Args:
+        - reader (DataReader): The reader.
+        - extensions (list): File extensions including the leading dot e.g. '.csv', case insensitive.
+        """
+
+        for extension in extensions:
+            self._readers[extension.lower()] = reader
+
+
+    def get_reader(self, extension):
+        """
+        Returns:
+        - DataReader or None: The reader registered for a file extension, None if the extension is not supported.
+        """
+
+        return self._readers.get(extension.lower())
+
+
+    def get_extensions(self):
+        """
+        Returns:
+        - list: The supported file extensions.
+        """
+
+        return list(self._readers)
+
+
+def create_default_registry(csv_engine=None, sample_rows=CSVReader.DEFAULT_SAMPLE_ROWS, inference_threshold_perc=Inference.INFERENCE_THRESHOLD_PERCENTAGE, excel_engine=ExcelEngines.CALAMINE):
+    """
+    Create a registry with the readers of the supported file formats i.e. CSV, TSV, Excel, JSON Lines and,
+    when pyarrow is installed, Parquet and Feather.
+
+    Args:
+    - csv_engine (str): Engine reading CSV and TSV files (see CSVEngines), pyarrow if installed by default.
+    - sample_rows (int): Number of leading rows of CSV and TSV files type hints are inferred from.
+    - inference_threshold_perc (float): Percentage of valid values in a column to infer its type (see Inference).
+    - excel_engine (str): Engine reading Excel files (see ExcelEngines), calamine if installed by default.
+
+    Returns:
+    - ReaderRegistry: The registry.
+    """
+
+    registry = ReaderRegistry()
+    registry.register(CSVReader(csv_engine, sample_rows, inference_threshold_perc), ['.csv'])
+    registry.register(TSVReader(csv_engine, sample_rows, inference_threshold_perc), ['.tsv', '.tab'])
+    registry.register(ExcelReader(excel_engine), ['.xls', '.xlsx', '.xlsm', '.xlsb'])
+    registry.register(JSONLinesReader(), ['.jsonl', '.ndjson'])
+    if pyarrow is not None:
+        registry.register(ParquetReader(), ['.parquet', '.pq'])
+        registry.register(FeatherReader(), ['.feather', '.arrow'])
+    return registry
@@ -608,6 +608,25 @@ class TestConvertColumnToComplex(unittest.TestCase):
         self.assertTrue(result_df['column'].dtype == expected_dtype)
         self.assertTrue(len(result_df['column']) == expected_length)
         
+class TestConvertSeries(unittest.TestCase):
+    """
+    Unit tests to test conversion of single columns
+    """
+    def test_convert_series(self):
+        # Test a column is converted on its own, keeping its name and index
+        series = pd.Series(['1', '2', 'x'], name='column', index=[3, 4, 5])
+        result = conversion_engine.convert_series(series, DataTypes.FLOAT64)
+        assert result.name == 'column'
+        assert list(result.index) == [3, 4, 5]
+        assert str(result.dtype) == DataTypes.FLOAT64
+        assert np.isnan(result[5])
+
+    def test_convert_series_missing_values_delete(self):
+        # Test rows with missing values are deleted from the converted column
+        series = pd.Series(['2022-01-01', None, '2022-01-03'], name='column')
+        result = conversion_engine.convert_series(series, DataTypes.DATETIME64, missing_values='delete')
+        assert list(result.index) == [0, 2]
+
 class TestConvertDataTypes(unittest.TestCase):
     """
     Unit tests to test conversion of complete dataframe
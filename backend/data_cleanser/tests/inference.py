@@ -268,6 +268,11 @@ class TestDateTimeDataTypeInference(unittest.TestCase):
         df = pd.DataFrame({'col': ['Dec 2023']})
         self.assertEqual(inference_engine.infer_data_type(df['col']), DataTypes.DATETIME64)
 
+    def test_parsed_datetime_column(self):
+        # Column already parsed as datetimes by the reader
+        df = pd.DataFrame({'col': pd.to_datetime(['2023-12-25', '2023-12-26', None])})
+        self.assertEqual(inference_engine.infer_data_type(df['col']), DataTypes.DATETIME64)
+
 class TestTimeDeltaDataTypeInference(unittest.TestCase):
     """
     Unit tests for timedelta data type inference.
@@ -435,6 +440,37 @@ class TestComplexDataTypeInference(unittest.TestCase):
         df = pd.DataFrame({'col': ['1+2', '3+j', '5*6j']})
         self.assertNotEqual(inference_engine.infer_data_type(df['col']), DataTypes.COMPLEX)
 
+class TestTypedDataTypeInference(unittest.TestCase):
+    """
+    Unit tests for inference of columns already typed by their reader e.g. read from Parquet files.
+    """
+
+    def test_typed_integer_width(self):
+        # Integers are only checked for the smallest type holding them
+        df = pd.DataFrame({'col': np.array([-200, 300, 5], dtype='int64')})
+        self.assertEqual(inference_engine.infer_data_type(df['col']), DataTypes.INT16)
+
+    def test_typed_integer_booleans(self):
+        # Integer columns of 0 and 1 values are booleans, as strings '0' and '1'
+        df = pd.DataFrame({'col': np.array([0, 1, 1, 5], dtype='int32')})
+        self.assertEqual(inference_engine.infer_data_type(df['col']), DataTypes.BOOLEAN)
+
+    def test_typed_float_integers(self):
+        # Floats holding integers are integers, other floats the smallest float type holding them
+        self.assertEqual(inference_engine.infer_data_type(pd.Series([1.0, np.nan, 3.0])), DataTypes.INT8)
+        self.assertEqual(inference_engine.infer_data_type(pd.Series([1.5, np.inf])), DataTypes.FLOAT64)
+        self.assertEqual(inference_engine.infer_data_type(pd.Series([1.5, 2.0])), DataTypes.FLOAT32)
+
+    def test_typed_non_numeric_columns(self):
+        # Categorical, timedelta and complex columns keep their type
+        self.assertEqual(inference_engine.infer_data_type(pd.Series(pd.Categorical(['1', '2', '3']))), DataTypes.CATEGORY)
+        self.assertEqual(inference_engine.infer_data_type(pd.Series(pd.to_timedelta(['1h', '2h']))), DataTypes.TIMEDELTA64)
+        self.assertEqual(inference_engine.infer_data_type(pd.Series([1 + 2j, 3j])), DataTypes.COMPLEX)
+
+    def test_object_column_not_typed(self):
+        # Columns of strings are left to the detectors
+        self.assertIsNone(inference_engine.infer_typed_data_type(pd.Series(['1', '2'])))
+
 class TestDataFrameInference(unittest.TestCase):
     """
     Unit tests for complete dataframes
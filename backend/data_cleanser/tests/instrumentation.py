@@ -0,0 +1,64 @@
+import unittest
+import pandas as pd
+from data_cleanser.instrumentation import count, get_instrumentation, instrument, span
+from data_cleanser.inference import Inference
+from data_cleanser.conversion import Convertor
+
+class TestInstrumentation(unittest.TestCase):
+    """
+    Unit tests to test collection of spans and counters
+    """
+    def test_spans_aggregated_by_name(self):
+        # Test spans sharing a name are summed, spans of a column are also reported per column
+        with instrument() as instrumentation:
+            with span('inference', column='a'):
+                pass
+            with span('inference', column='b'):
+                pass
+        result = instrumentation.as_dict()
+        assert result["spans"]["inference"]["calls"] == 2
+        assert result["columns"]["a"]["inference"]["calls"] == 1
+        assert result["peak_memory_bytes"] is None
+
+    def test_nothing_collected_outside_instrument(self):
+        # Test spans and counters are no-ops when no instrumentation is collected
+        with span('read'):
+            count('fallback')
+        assert get_instrumentation() is None
+
+    def test_counters(self):
+        # Test counters are incremented by the given increments
+        with instrument() as instrumentation:
+            count('fallback')
+            count('fallback', 2)
+        assert instrumentation.as_dict()["counters"] == {"fallback": 3}
+
+    def test_memory_peak_traced(self):
+        # Test the peak of memory allocated in the block is reported when memory is traced
+        with instrument(trace_memory=True) as instrumentation:
+            values = [0] * 100000
+        assert instrumentation.peak_memory_bytes >= 800000
+        del values
+
+class TestPipelineInstrumentation(unittest.TestCase):
+    """
+    Unit tests to test spans and counters recorded by inference and conversion
+    """
+    def test_inference_spans_per_column_and_detector(self):
+        # Test inference is timed per column and per detector
+        df = pd.DataFrame({"a": ['1', '2', '3'], "b": ['2024-01-01', '2024-01-02', '2024-01-03']})
+        with instrument() as instrumentation:
+            Inference(0.5).infer_data_types(df)
+        result = instrumentation.as_dict()
+        assert result["columns"]["a"]["inference"]["calls"] == 1
+        assert result["spans"]["inference.numeric"]["calls"] == 2
+        assert result["spans"]["inference.datetime"]["calls"] == 1
+
+    def test_formatted_numeric_fallback_counted(self):
+        # Test converting formatted numeric strings counts the fallback path
+        df = pd.DataFrame({"a": ['$1,000', '$2,000', '$3,000']})
+        with instrument() as instrumentation:
+            Convertor().convert_col_date_type(df, 'a', 'float64', errors='raise')
+        result = instrumentation.as_dict()
+        assert result["counters"]["conversion.numeric.formatted_fallback"] == 1
+        assert result["columns"]["a"]["conversion"]["calls"] == 1
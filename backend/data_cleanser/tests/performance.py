@@ -0,0 +1,45 @@
+import unittest
+import numpy as np
+import pandas as pd
+from data_cleanser.inference import Inference
+from data_cleanser.conversion import Convertor
+from data_cleanser.data_types import DataTypes
+from benchmarks.budgets import check_budget, is_performance_testing_enabled, PERFORMANCE_TESTS_ENV
+from benchmarks.generator import generate_dataframe
+
+def create_currency_frame(rows):
+    values = np.random.default_rng(0).uniform(0, 1e6, rows).round(2)
+    return pd.DataFrame({'price': [f'${value:,.2f}' for value in values]})
+
+@unittest.skipUnless(is_performance_testing_enabled(), f'performance tests only run with {PERFORMANCE_TESTS_ENV}=1')
+class TestPerformanceBudgets(unittest.TestCase):
+    """
+    Performance tests asserting time budgets (seconds on the reference machine, scaled to the machine running
+    the tests) and memory budgets of key operations, see benchmarks.budgets
+    """
+    def setUp(self):
+        self.inference_engine = Inference(0.5)
+        self.conversion_engine = Convertor()
+
+    def test_infer_mixed_frame_time(self):
+        # Test inferring the types of a 1M-row frame with a column of each type stays within its time budget
+        df = generate_dataframe(1_000_000, 12)
+        check_budget('Inferring a 1M-row mixed frame', lambda: self.inference_engine.infer_data_types(df), seconds=60)
+
+    def test_infer_mixed_frame_memory(self):
+        # Test the peak of memory of inferring the types of a 50k-row mixed frame stays within its budget
+        df = generate_dataframe(50_000, 12)
+        check_budget('Inferring a 50k-row mixed frame', lambda: self.inference_engine.infer_data_types(df), peak_memory_bytes=16 * 2**20)
+
+    def test_convert_currency_column_time(self):
+        # Test converting a 1M-row currency column to float64 stays within its time budget
+        df = create_currency_frame(1_000_000)
+        check_budget('Converting a 1M-row currency column', lambda: self.conversion_engine.convert_column_to_numeric(df, 'price', DataTypes.FLOAT64, errors='raise'), seconds=30)
+
+    def test_convert_currency_column_memory(self):
+        # Test the peak of memory of converting a 50k-row currency column stays within its budget
+        df = create_currency_frame(50_000)
+        check_budget('Converting a 50k-row currency column', lambda: self.conversion_engine.convert_column_to_numeric(df, 'price', DataTypes.FLOAT64, errors='raise'), peak_memory_bytes=16 * 2**20)
+
+if __name__ == "__main__":
+    unittest.main()
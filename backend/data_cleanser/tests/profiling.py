@@ -0,0 +1,82 @@
+import unittest
+import pandas as pd
+import numpy as np
+from data_cleanser.profiling import Profiler
+
+profiler = Profiler(top_values_count=2, histogram_bins=4)
+
+class TestProfileNumericColumns(unittest.TestCase):
+    """
+    Unit tests to test profiling of numeric columns
+    """
+    def test_profile_integer_column(self):
+        # Test null count, min/max and distinct count of an integer column with missing values
+        profile = profiler.profile_column(pd.Series([1, 5, None, 5, 9], dtype='Int64'))
+        assert profile["dtype"] == 'Int64'
+        assert profile["count"] == 5
+        assert profile["nulls"] == 1
+        assert profile["null_percentage"] == 0.2
+        assert profile["distinct"] == 3
+        assert profile["min"] == 1 and profile["max"] == 9
+
+    def test_profile_top_values(self):
+        # Test most frequent values are reported first and limited in number
+        profile = profiler.profile_column(pd.Series([3, 1, 3, 2, 3, 1]))
+        assert profile["top_values"] == [{"value": 3, "count": 3}, {"value": 1, "count": 2}]
+
+    def test_profile_histogram(self):
+        # Test histogram counts all finite values, infinite values excluded
+        profile = profiler.profile_column(pd.Series([0.0, 1.0, 2.0, 3.0, 4.0, np.inf]))
+        assert profile["histogram"]["edges"] == [0.0, 1.0, 2.0, 3.0, 4.0]
+        assert profile["histogram"]["counts"] == [1, 1, 1, 2]
+
+    def test_profile_empty_column(self):
+        # Test a column without values has no min/max or histogram
+        profile = profiler.profile_column(pd.Series([None, None], dtype='float64'))
+        assert profile["nulls"] == 2
+        assert profile["min"] is None and profile["histogram"] is None
+        assert profile["top_values"] == []
+
+class TestProfileNonNumericColumns(unittest.TestCase):
+    """
+    Unit tests to test profiling of datetime, timedelta, categorical, boolean and complex columns
+    """
+    def test_profile_datetime_column(self):
+        # Test datetime min/max and histogram edges as ISO 8601 strings
+        profile = profiler.profile_column(pd.Series(pd.to_datetime(['2022-01-01', '2022-01-05', None])))
+        assert profile["min"] == pd.Timestamp('2022-01-01')
+        assert profile["max"] == pd.Timestamp('2022-01-05')
+        assert profile["histogram"]["edges"][0] == '2022-01-01T00:00:00'
+        assert sum(profile["histogram"]["counts"]) == 2
+
+    def test_profile_constant_datetime_column(self):
+        # Test histogram of a column with a single distinct datetime
+        profile = profiler.profile_column(pd.Series(pd.to_datetime(['2022-01-01'] * 3)).dt.tz_localize('UTC'))
+        assert sum(profile["histogram"]["counts"]) == 3
+
+    def test_profile_timedelta_column(self):
+        # Test timedelta histogram edges in the pandas string form
+        profile = profiler.profile_column(pd.Series(pd.to_timedelta(['1h', '3h'])))
+        assert profile["histogram"]["edges"][0] == '0 days 01:00:00'
+        assert profile["max"] == pd.Timedelta('3h')
+
+    def test_profile_categorical_column(self):
+        # Test unused categories are not reported as top values and categorical columns have no histogram
+        column = pd.Series(pd.Categorical(['a', 'b', 'a'], categories=['a', 'b', 'c']))
+        profile = profiler.profile_column(column)
+        assert profile["distinct"] == 2
+        assert profile["top_values"] == [{"value": 'a', "count": 2}, {"value": 'b', "count": 1}]
+        assert profile["min"] is None and profile["histogram"] is None
+
+    def test_profile_boolean_and_complex_columns(self):
+        # Test boolean and complex columns are not ordered
+        for column in (pd.Series([True, False, True]), pd.Series([1 + 2j, 3j])):
+            profile = profiler.profile_column(column)
+            assert profile["min"] is None and profile["histogram"] is None
+
+    def test_profile_dataframe(self):
+        # Test all columns of a dataframe are profiled
+        df = pd.DataFrame({'numbers': [1, 2], 'names': ['x', 'y']})
+        profiles = profiler.profile_dataframe(df)
+        assert list(profiles) == ['numbers', 'names']
+        assert profiles['names']["distinct"] == 2
@@ -0,0 +1,209 @@
+import io
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+from pandas.errors import ParserError
+from data_cleanser.readers import CSVEngines, CSVReader, ExcelEngines, ExcelReader, FeatherReader, JSONLinesReader, ParquetReader, ReaderRegistry, TSVReader, create_default_registry, pyarrow, python_calamine
+
+CSV_DATA = b'''id,name,joined,duration,flag,score
+1,Alice,2023-01-05,01:30:00,true,1.5
+2,Bob,2023-02-10,02:00:00,false,
+3,,2023-03-15,00:45:00,true,3.25
+'''
+
+class TestCSVTypeHints(unittest.TestCase):
+    """
+    Unit tests to test type hints inferred from the leading rows of CSV files
+    """
+    def test_type_hints(self):
+        # Test datetimes of a single format are hinted, numbers and booleans left to the engine and other columns read as text
+        reader = CSVReader(engine=CSVEngines.C)
+        type_hints, datetime_formats = reader.get_type_hints(reader.read_sample(io.BytesIO(CSV_DATA)))
+        assert type_hints == {'name': 'object', 'joined': 'datetime64[ns]', 'duration': 'object'}
+        assert datetime_formats == {'joined': '%Y-%m-%d'}
+
+    def test_mixed_datetime_formats_not_hinted(self):
+        # Test datetimes of different formats are read as text and left to the convertor
+        reader = CSVReader(engine=CSVEngines.C)
+        assert reader.get_datetime_format(pd.Series(['2023-01-05', '05/01/2023 10:00'])) is None
+        assert reader.get_datetime_format(pd.Series(['2023-01-05T10:00:00+02:00'])) is None
+
+    def test_invalid_engine(self):
+        # Test an unknown engine is rejected
+        with self.assertRaises(ValueError):
+            CSVReader(engine='python')
+
+class TestCSVReader(unittest.TestCase):
+    """
+    Unit tests to test reading CSV files with the C and pyarrow engines
+    """
+    def read(self, engine, data=CSV_DATA):
+        return CSVReader(engine=engine, sample_rows=2).read(io.BytesIO(data))
+
+    def test_c_engine(self):
+        # Test hinted datetimes are parsed by the C engine
+        df = self.read(CSVEngines.C)
+        assert str(df['joined'].dtype) == 'datetime64[ns]'
+        assert df['duration'].tolist() == ['01:30:00', '02:00:00', '00:45:00']
+
+    def test_uploaded_values_kept(self):
+        # Test the datetimes are only parsed in the typed dataframe, the other dataframe keeps the uploaded values
+        for engine in [CSVEngines.C] + ([CSVEngines.PYARROW] if pyarrow is not None else []):
+            df, df_typed = CSVReader(engine=engine, sample_rows=2).read_typed(io.BytesIO(CSV_DATA))
+            assert df['joined'].tolist() == ['2023-01-05', '2023-02-10', '2023-03-15']
+            assert str(df_typed['joined'].dtype) == 'datetime64[ns]'
+            assert np.shares_memory(df_typed['duration'].to_numpy(), df['duration'].to_numpy())
+
+    @unittest.skipIf(pyarrow is None, 'pyarrow is not installed')
+    def test_pyarrow_engine_matches_c_engine(self):
+        # Test both engines read the same dataframe, times read as text and missing values as None/NaN
+        pd.testing.assert_frame_equal(self.read(CSVEngines.PYARROW), self.read(CSVEngines.C))
+
+    @unittest.skipIf(pyarrow is None, 'pyarrow is not installed')
+    def test_pyarrow_fallback(self):
+        # Test datetimes in another format after the sample fall back to the C engine, leaving the column as text
+        data = CSV_DATA + b'4,Dan,15/04/2023,00:10:00,false,4.0\n'
+        df = self.read(CSVEngines.PYARROW, data)
+        assert df['joined'].tolist()[-1] == '15/04/2023'
+
+    @unittest.skipIf(pyarrow is None, 'pyarrow is not installed')
+    def test_pyarrow_datetime_formats_per_column(self):
+        # Test each datetime column is parsed with its own format, a value of one column is not parsed with the format of another
+        data = b'dmy,mdy\n25/12/2020,12/25/2020\n13/01/2020,01/13/2020\n01/02/2020,01/05/2020\n'
+        df = self.read(CSVEngines.PYARROW, data)
+        assert df['dmy'].tolist() == list(pd.to_datetime(['2020-12-25', '2020-01-13', '2020-02-01']))
+        assert df['mdy'].tolist() == list(pd.to_datetime(['2020-12-25', '2020-01-13', '2020-01-05']))
+        pd.testing.assert_frame_equal(df, self.read(CSVEngines.C, data))
+
+    @unittest.skipIf(pyarrow is None, 'pyarrow is not installed')
+    def test_pyarrow_duplicated_columns(self):
+        # Test duplicated column names are deduplicated as by pandas
+        df = self.read(CSVEngines.PYARROW, b'a,a\n1,2\n')
+        assert list(df.columns) == ['a', 'a.1']
+
+class UploadedFile:
+    """
+    Binary file proxy not detected as binary by pandas, as Django uploaded files
+    """
+    def __init__(self, data):
+        self.file = io.BytesIO(data)
+
+    def read(self, *args):
+        return self.file.read(*args)
+
+    def __iter__(self):
+        return iter(self.file)
+
+def create_workbook():
+    df = pd.DataFrame({'id': [1, 2, None], 'joined': pd.to_datetime(['2023-01-05', '2023-02-10', None]), 'name': ['Alice', 'Bob', 'Carl']})
+    workbook = io.BytesIO()
+    with pd.ExcelWriter(workbook) as writer:
+        df.to_excel(writer, sheet_name='people', index=False)
+        df[['name']].to_excel(writer, sheet_name='names', index=False)
+    return io.BytesIO(workbook.getvalue())
+
+class TestExcelReader(unittest.TestCase):
+    """
+    Unit tests to test reading the sheets of Excel files
+    """
+    def test_first_sheet(self):
+        # Test the first sheet is read by default
+        df = ExcelReader(ExcelEngines.DEFAULT).read(create_workbook())
+        assert list(df.columns) == ['id', 'joined', 'name']
+        assert str(df['joined'].dtype) == 'datetime64[ns]'
+
+    def test_read_sheets(self):
+        # Test all sheets are read in their order, by the tasks of an executor
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            sheets = ExcelReader(ExcelEngines.DEFAULT).read_sheets(create_workbook(), executor=executor)
+        assert list(sheets) == ['people', 'names']
+        assert sheets['names']['name'].tolist() == ['Alice', 'Bob', 'Carl']
+
+    def test_read_selected_sheets(self):
+        # Test only the requested sheets are read
+        reader = ExcelReader(ExcelEngines.DEFAULT)
+        workbook = create_workbook()
+        assert reader.get_sheet_names(workbook) == ['people', 'names']
+        assert list(reader.read_sheets(workbook, ['names'])) == ['names']
+
+    @unittest.skipIf(python_calamine is None, 'python-calamine is not installed')
+    def test_calamine_matches_default_engine(self):
+        # Test calamine reads the same dataframes as the default engine
+        pd.testing.assert_frame_equal(ExcelReader(ExcelEngines.CALAMINE).read(create_workbook()), ExcelReader(ExcelEngines.DEFAULT).read(create_workbook()))
+
+class TestTypedFormatReaders(unittest.TestCase):
+    """
+    Unit tests to test reading Parquet, Feather, JSON Lines and TSV files
+    """
+    df = pd.DataFrame({
+        'id': pd.array([1, 2, 3], dtype='int16'),
+        'joined': pd.to_datetime(['2023-01-05', '2023-02-10', None]),
+        'grade': pd.Categorical(['A', 'B', 'A']),
+        'name': ['Alice', None, 'Carl'],
+    })
+
+    @unittest.skipIf(pyarrow is None, 'pyarrow is not installed')
+    def test_parquet_keeps_types(self):
+        # Test columns keep the types they were written with
+        data = io.BytesIO()
+        self.df.to_parquet(data)
+        pd.testing.assert_frame_equal(ParquetReader().read(io.BytesIO(data.getvalue())), self.df)
+
+    @unittest.skipIf(pyarrow is None, 'pyarrow is not installed')
+    def test_feather_keeps_types(self):
+        # Test columns keep the types they were written with
+        data = io.BytesIO()
+        self.df.to_feather(data)
+        pd.testing.assert_frame_equal(FeatherReader().read(io.BytesIO(data.getvalue())), self.df)
+
+    @unittest.skipIf(pyarrow is None, 'pyarrow is not installed')
+    def test_invalid_parquet_file(self):
+        # Test invalid files raise parser errors
+        with self.assertRaises(ParserError):
+            ParquetReader().read(io.BytesIO(b'a,b\n1,2\n'))
+
+    def test_json_lines_chunks(self):
+        # Test lines read in chunks are concatenated, keys missing from some lines are missing values and dates left as strings
+        data = b'{"id": 1, "joined": "2023-01-05"}\n{"id": 2, "joined": "2023-02-10"}\n{"id": 3, "name": "Carl"}\n'
+        df = JSONLinesReader(chunk_lines=2).read(UploadedFile(data))
+        assert df['id'].tolist() == [1, 2, 3]
+        assert df['joined'].tolist()[:2] == ['2023-01-05', '2023-02-10']
+        assert df['name'].isna().tolist() == [True, True, False]
+
+    def test_invalid_json_lines(self):
+        # Test invalid lines raise parser errors
+        with self.assertRaises(ParserError):
+            JSONLinesReader().read(io.BytesIO(b'{"id": 1}\n{id\n'))
+
+    def test_tsv(self):
+        # Test tab separated files are read as CSV files, with the same type hints
+        df = TSVReader(engine=CSVEngines.C).read(io.BytesIO(CSV_DATA.replace(b',', b'\t')))
+        pd.testing.assert_frame_equal(df, CSVReader(engine=CSVEngines.C).read(io.BytesIO(CSV_DATA)))
+
+    @unittest.skipIf(pyarrow is None, 'pyarrow is not installed')
+    def test_tsv_pyarrow(self):
+        # Test tab separated files are read by pyarrow
+        df = TSVReader(engine=CSVEngines.PYARROW).read(io.BytesIO(CSV_DATA.replace(b',', b'\t')))
+        assert list(df.columns) == ['id', 'name', 'joined', 'duration', 'flag', 'score']
+
+class TestReaderRegistry(unittest.TestCase):
+    """
+    Unit tests to test looking up readers by file extension
+    """
+    def test_default_registry(self):
+        # Test extensions are matched case insensitively
+        registry = create_default_registry()
+        assert isinstance(registry.get_reader('.CSV'), CSVReader)
+        assert isinstance(registry.get_reader('.xlsx'), ExcelReader)
+        assert isinstance(registry.get_reader('.tsv'), TSVReader)
+        assert isinstance(registry.get_reader('.jsonl'), JSONLinesReader)
+        assert registry.get_reader('.txt') is None
+
+    def test_register_reader(self):
+        # Test registering a reader replaces the previous reader of an extension
+        registry = ReaderRegistry()
+        reader = ExcelReader()
+        registry.register(reader, ['.xls'])
+        assert registry.get_reader('.xls') is reader
+        assert registry.get_extensions() == ['.xls']
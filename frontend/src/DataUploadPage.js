@@ -102,13 +102,13 @@ export default function DataUploadPage() {
           Upload Your Data File
         </Typography>
         <Typography variant="body2" sx={{ mb: 3 }}>
-          Please select a CSV or Excel file to upload. The file should contain
+          Please select a CSV, TSV, Excel, Parquet, Feather or JSON Lines file to upload. The file should contain
           your dataset for processing.
         </Typography>
         {/* File input for selecting a file */}
         <label htmlFor="contained-button-file">
           <Input
-            accept=".csv, application/vnd.openxmlformats-officedocument.spreadsheetml.sheet, application/vnd.ms-excel"
+            accept=".csv, .tsv, .parquet, .feather, .jsonl, application/vnd.openxmlformats-officedocument.spreadsheetml.sheet, application/vnd.ms-excel"
             id="contained-button-file"
             multiple
             type="file"